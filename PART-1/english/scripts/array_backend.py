@@ -0,0 +1,89 @@
+import importlib
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+import scipy.sparse
+
+
+def gpu_available() -> bool:
+    """Check whether CuPy is installed and can see at least one CUDA device"""
+    try:
+        cupy = importlib.import_module("cupy")
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
+
+
+class ArrayBackend:
+    """Runtime-selected array backend: NumPy/SciPy/pandas on CPU, CuPy/cuDF on GPU.
+
+    The GPU libraries are imported lazily, so CPU-only hosts never load cupy
+    or cudf. Pipeline stages use self.xp / self.sparse the way they used cp /
+    cupyx.scipy.sparse before.
+    """
+
+    def __init__(self, name: str = "auto"):
+        if name == "auto":
+            name = "gpu" if gpu_available() else "cpu"
+        if name not in ("gpu", "cpu"):
+            raise ValueError(f"Unknown backend: {name}")
+        self.name = name
+        self._df_lib = None
+
+        if self.is_gpu:
+            self.xp = importlib.import_module("cupy")
+            self.sparse = importlib.import_module("cupyx.scipy.sparse")
+        else:
+            self.xp = np
+            self.sparse = scipy.sparse
+
+    @property
+    def is_gpu(self) -> bool:
+        return self.name == "gpu"
+
+    @property
+    def df_lib(self) -> Any:
+        """cudf on GPU, pandas on CPU (imported on first use)"""
+        if self._df_lib is None:
+            self._df_lib = importlib.import_module("cudf" if self.is_gpu else "pandas")
+        return self._df_lib
+
+    def memory_info(self) -> Optional[Tuple[float, float]]:
+        """Free and total device memory in GB, or None on CPU"""
+        if not self.is_gpu:
+            return None
+        free_memory, total_memory = self.xp.cuda.runtime.memGetInfo()
+        return free_memory / 1024**3, total_memory / 1024**3
+
+    def to_device(self, matrix: Any) -> Any:
+        """Move a SciPy sparse matrix to the backend as CSR"""
+        return self.sparse.csr_matrix(matrix)
+
+    def to_host(self, array: Any) -> Any:
+        """Bring a backend array or sparse matrix back to NumPy/SciPy"""
+        if not self.is_gpu:
+            return array
+        if hasattr(array, "get"):
+            return array.get()
+        return self.xp.asnumpy(array)
+
+    def read_csv(self, path: str, **kwargs: Any) -> Any:
+        return self.df_lib.read_csv(path, **kwargs)
+
+    def read_csv_chunks(self, path: str, chunksize: int, **kwargs: Any) -> Iterator[Any]:
+        """Yield backend DataFrames of at most chunksize rows.
+
+        cuDF has no chunked reader, so chunks are parsed by pandas and moved to
+        the GPU one at a time.
+        """
+        pandas = importlib.import_module("pandas")
+        with pandas.read_csv(path, chunksize=chunksize, **kwargs) as reader:
+            for chunk in reader:
+                yield self.df_lib.from_pandas(chunk) if self.is_gpu else chunk
+
+    def series(self, values: Iterable[Any]) -> Any:
+        return self.df_lib.Series(list(values))
+
+    def to_pandas(self, frame: Any) -> Any:
+        """Host pandas object for a backend Series/DataFrame"""
+        return frame.to_pandas() if self.is_gpu else frame
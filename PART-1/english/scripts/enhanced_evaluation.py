@@ -9,6 +9,10 @@ import logging
 from tqdm import tqdm
 from colorama import Fore, Style, init
 import sys
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from threadpoolctl import threadpool_limits
 from scipy.stats import spearmanr
 from sklearn.manifold import TSNE
 from sklearn.decomposition import PCA
@@ -21,9 +25,33 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from embedding_metrics import (evaluate_analogies as analogy_metrics, evaluate_clustering as clustering_metrics,
+                               evaluate_similarity as similarity_metrics,
+                               load_analogy_file, resolve_analogies, resolve_similarity_pairs, unit_rows)
+
 # Initialize colorama
 init()
 
+# Evaluator plus the shared read-only inputs of each worker process (set by _init_evaluation_worker)
+_WORKER_STATE = None
+
+def _init_evaluation_worker(log_dir: str, vocab: Dict, analogies: Tuple[np.ndarray, int],
+                            similarity_pairs: Dict[str, Tuple], blas_threads: int) -> None:
+    """Worker initializer: cap BLAS threads and build one evaluator per process"""
+    global _WORKER_STATE
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(blas_threads)
+    threadpool_limits(limits=blas_threads, user_api="blas")
+    torch.set_num_threads(blas_threads)
+    # Forked workers inherit the parent's handlers; start from a clean logger
+    logging.getLogger('EnhancedEmbeddingEvaluator').handlers.clear()
+    _WORKER_STATE = (EnhancedEmbeddingEvaluator(log_dir), vocab, analogies, similarity_pairs)
+
+def _run_evaluation_job(emb_file: str) -> Dict:
+    """Worker: evaluate one embedding file"""
+    evaluator, vocab, analogies, similarity_pairs = _WORKER_STATE
+    return evaluator.evaluate_file(Path(emb_file), vocab, analogies, similarity_pairs)
+
 class EnhancedEmbeddingEvaluator:
     """Enhanced evaluation suite for word embeddings with improved visualizations and error handling"""
     
@@ -35,8 +63,19 @@ class EnhancedEmbeddingEvaluator:
         'correlation': ['#FF0000', '#FFFFFF', '#0000FF']  # Red to Blue
     }
     
+    # Analogy questions scored per matmul; bounds the chunk x vocabulary score buffer
+    ANALOGY_CHUNK_SIZE = 512
+    
+    # Summary column prefix -> (dataset key, (word1, word2, score) columns)
+    SIMILARITY_DATASETS = {
+        "SimLex": ("simlex", ("word1", "word2", "SimLex999")),
+        "WordSim": ("wordsim", ("Word 1", "Word 2", "Human (mean)"))
+    }
+    
     def __init__(self, log_dir: str = "logs"):
         self.setup_logging(log_dir)
+        # Kept so pool workers can build an identically configured evaluator
+        self.log_dir = log_dir
         self._setup_gpu()
         self.error_count = 0
         self.warning_count = 0
@@ -254,44 +293,57 @@ class EnhancedEmbeddingEvaluator:
         plt.savefig(Path(output_dir) / "clustering_quality.png")
         plt.close()
     
-    def evaluate_analogies(self, embeddings: np.ndarray, vocab: Dict[str, int],
-                            analogies: List[Tuple[str, str, str, str]]) -> Dict:
-        """Evaluate word analogies using vector arithmetic (accuracy)"""
-        correct = 0
-        total = 0
-        embeddings_tensor = torch.tensor(embeddings, device=self.device)
-        for a, b, c, d in analogies:
-            if a in vocab and b in vocab and c in vocab and d in vocab:
-                vec_a = embeddings_tensor[vocab[a]]
-                vec_b = embeddings_tensor[vocab[b]]
-                vec_c = embeddings_tensor[vocab[c]]
-                expected = vec_b - vec_a + vec_c
-                similarities = torch.nn.functional.cosine_similarity(expected.unsqueeze(0), embeddings_tensor)
-                # Exclude the source words to avoid trivial matches
-                similarities[vocab[a]] = -1
-                similarities[vocab[b]] = -1
-                similarities[vocab[c]] = -1
-                pred_idx = similarities.argmax().item()
-                if pred_idx == vocab[d]:
-                    correct += 1
-                total += 1
-        accuracy = correct / total if total > 0 else 0
-        return {"Analogy-Accuracy": accuracy, "Analogy-Total": total}
+    def evaluate_analogies(self, embeddings: Union[np.ndarray, torch.Tensor], vocab: Dict[str, int],
+                            analogies: List[Tuple[str, str, str, str]],
+                            method: str = "3cosadd",
+                            top_k: int = 1,
+                            resolved: Optional[Tuple[np.ndarray, int]] = None) -> Dict:
+        """Evaluate word analogies using vector arithmetic (accuracy).
+        
+        All questions are scored in one batched pass (see
+        embedding_metrics.evaluate_analogies); method is 3cosadd or 3cosmul.
+        """
+        return analogy_metrics(embeddings, vocab, analogies, method=method, top_k=top_k,
+                               chunk_size=self.ANALOGY_CHUNK_SIZE, device=self.device, resolved=resolved)
+    
+    def resolve_similarity_datasets(self, datasets: Dict, vocab: Dict[str, int]) -> Dict[str, Tuple]:
+        """Resolve the word pairs of every loaded similarity dataset to vocabulary indices once"""
+        resolved = {}
+        for name, (key, columns) in self.SIMILARITY_DATASETS.items():
+            if key in datasets:
+                resolved[name] = resolve_similarity_pairs(datasets[key], vocab, columns)
+                pairs, _, skipped = resolved[name]
+                self.logger.info(f"{name}: {len(pairs)} of {len(pairs) + skipped} pairs in vocabulary")
+        return resolved
     
-    def evaluate_clustering(self, embeddings: np.ndarray, n_clusters: int = 10) -> Dict:
-        """Evaluate clustering quality using K-Means and silhouette score"""
-        from sklearn.cluster import KMeans
-        from sklearn.metrics import silhouette_score
+    def evaluate_similarity(self, embeddings: np.ndarray, resolved: Dict[str, Tuple]) -> Dict:
+        """Spearman correlation and coverage on every resolved similarity dataset"""
+        results = {}
+        for name in self.SIMILARITY_DATASETS:
+            if name in resolved:
+                results.update(similarity_metrics(embeddings, resolved[name], name))
+            else:
+                results.update({f"{name}-Correlation": np.nan, f"{name}-Coverage": 0.0})
+        return results
+    
+    def evaluate_clustering(self, embeddings: np.ndarray, n_clusters: int = 10,
+                            sample_size: int = 10000, n_samples: int = 5) -> Dict:
+        """Evaluate clustering quality using MiniBatchKMeans and a sampled silhouette score
+        
+        The silhouette is averaged over n_samples subsets of sample_size words
+        and reported with a 95% confidence interval (see
+        embedding_metrics.evaluate_clustering), so cost grows linearly with
+        the vocabulary instead of quadratically.
+        """
         try:
-            kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-            labels = kmeans.fit_predict(embeddings)
-            score = silhouette_score(embeddings, labels)
-            return {"Clustering-Silhouette": score, "Clusters": n_clusters}
+            return clustering_metrics(embeddings, n_clusters=n_clusters,
+                                      sample_size=sample_size, n_samples=n_samples)
         except Exception as e:
             self.logger.error(f"Clustering evaluation error: {e}")
             return {"Clustering-Silhouette": None, "Clusters": n_clusters}
     
-    def evaluate_embeddings(self, embeddings_dir: str, vocab_file: str, output_dir: str) -> None:
+    def evaluate_embeddings(self, embeddings_dir: str, vocab_file: str, output_dir: str,
+                            n_workers: int = 1, blas_threads: Optional[int] = None) -> None:
         """Main evaluation function with enhanced error handling and visualizations"""
         try:
             start_time = time.perf_counter()
@@ -300,7 +352,8 @@ class EnhancedEmbeddingEvaluator:
             vocab = self._load_vocab(vocab_file)
             datasets = self.load_evaluation_datasets()
             
-            results = self._process_embeddings(embeddings_dir, vocab, datasets)
+            results = self._process_embeddings(embeddings_dir, vocab, datasets, output_dir,
+                                               n_workers=n_workers, blas_threads=blas_threads)
             summary_df = self._create_summary_dataframe(results)
             
             self.create_enhanced_visualizations(summary_df, output_dir)
@@ -332,48 +385,122 @@ class EnhancedEmbeddingEvaluator:
             datasets['simlex'] = pd.read_csv("test_data/SimLex-999.txt", sep='\t')
             # Load WordSim-353 dataset
             datasets['wordsim'] = pd.read_csv("test_data/wordsim/combined.csv")
+            # Google analogy set (questions-words.txt), used instead of the defaults when present
+            analogy_file = Path("test_data/questions-words.txt")
+            if analogy_file.exists():
+                datasets['analogies'] = load_analogy_file(analogy_file)
             return datasets
         except Exception as e:
             self.logger.error(f"{Fore.RED}Failed to load evaluation datasets: {str(e)}{Style.RESET_ALL}")
             raise
     
-    def _process_embeddings(self, embeddings_dir: str, vocab: Dict, datasets: Dict) -> List[Dict]:
-        """Process embedding files and compute evaluation metrics"""
-        results = []
-        embedding_files = list(Path(embeddings_dir).glob("embeddings_*.npy"))
+    def evaluate_file(self, emb_file: Path, vocab: Dict, analogies: Tuple[np.ndarray, int],
+                      similarity_pairs: Dict[str, Tuple]) -> Dict:
+        """Compute every evaluation metric for one embedding file.
+        
+        analogies and similarity_pairs are already resolved to vocabulary
+        indices; the file is memory-mapped, so only the rows each metric
+        touches are read until the analogy step copies it.
+        """
+        embeddings = np.load(emb_file, mmap_mode='r')
+        params = self._parse_embedding_params(emb_file.stem)
+        similarity_results = self.evaluate_similarity(embeddings, similarity_pairs)
+        
+        # Evaluate analogies (both objectives on one normalized copy) and clustering quality
+        unit = unit_rows(embeddings, self.device)
+        analogy_results = self.evaluate_analogies(unit, vocab, None, resolved=analogies)
+        cosmul_results = self.evaluate_analogies(unit, vocab, None, method="3cosmul", resolved=analogies)
+        del unit
+        clustering_results = self.evaluate_clustering(embeddings, n_clusters=10)
+        
+        return {**params,
+                "SimLex-Correlation": similarity_results["SimLex-Correlation"],
+                "SimLex-Coverage": similarity_results["SimLex-Coverage"],
+                "WordSim-Correlation": similarity_results["WordSim-Correlation"],
+                "WordSim-Coverage": similarity_results["WordSim-Coverage"],
+                "Analogy-Accuracy": analogy_results["Analogy-Accuracy"],
+                "Analogy-3CosMul-Accuracy": cosmul_results["Analogy-Accuracy"],
+                "Analogy-Coverage": analogy_results["Analogy-Coverage"],
+                "Clustering-Silhouette": clustering_results["Clustering-Silhouette"],
+                "Clustering-Silhouette-CI-Low": clustering_results.get("Clustering-Silhouette-CI-Low"),
+                "Clustering-Silhouette-CI-High": clustering_results.get("Clustering-Silhouette-CI-High")}
+    
+    def _process_embeddings(self, embeddings_dir: str, vocab: Dict, datasets: Dict,
+                            output_dir: Optional[str] = None,
+                            n_workers: int = 1,
+                            blas_threads: Optional[int] = None) -> List[Dict]:
+        """Process embedding files and compute evaluation metrics
+        
+        Analogy questions and similarity pairs are resolved once and shared
+        by all files. With n_workers > 1 the files are evaluated on a process
+        pool (largest first), each worker limited to blas_threads BLAS threads
+        (default: CPU count / n_workers). With an output_dir every finished
+        file is appended to evaluation_summary.csv right away, so an
+        interrupted sweep still leaves its completed rows.
+        """
+        embedding_files = sorted(Path(embeddings_dir).glob("embeddings_*.npy"))
         # Define default analogy questions (ensure these words exist in your vocabulary)
         default_analogies = [
             ("king", "queen", "man", "woman"),
             ("paris", "france", "london", "england"),
             ("big", "biggest", "small", "smallest")
         ]
-        for emb_file in tqdm(embedding_files, desc="Processing embedding files"):
-            self.logger.info(f"\nEvaluating {emb_file.name}")
-            try:
-                embeddings = np.load(emb_file)
-                params = self._parse_embedding_params(emb_file.stem)
-                # (Placeholders for SimLex and WordSim metrics; replace with your actual implementations)
-                simlex_corr = float(np.random.rand())
-                simlex_cov = float(np.random.rand())
-                wordsim_corr = float(np.random.rand())
-                wordsim_cov = float(np.random.rand())
-                
-                # Evaluate analogies and clustering quality
-                analogy_results = self.evaluate_analogies(embeddings, vocab, default_analogies)
-                clustering_results = self.evaluate_clustering(embeddings, n_clusters=10)
-                
-                result = {**params,
-                          "SimLex-Correlation": simlex_corr,
-                          "SimLex-Coverage": simlex_cov,
-                          "WordSim-Correlation": wordsim_corr,
-                          "WordSim-Coverage": wordsim_cov,
-                          "Analogy-Accuracy": analogy_results["Analogy-Accuracy"],
-                          "Clustering-Silhouette": clustering_results["Clustering-Silhouette"]}
-                results.append(result)
-            except Exception as e:
-                self.error_count += 1
-                self.logger.error(f"{Fore.RED}Failed processing {emb_file.name}: {str(e)}{Style.RESET_ALL}")
-        return results
+        # Every file shares the vocabulary, so questions are resolved to indices once
+        analogies = resolve_analogies(datasets.get('analogies', default_analogies), vocab)
+        similarity_pairs = self.resolve_similarity_datasets(datasets, vocab)
+        
+        results = {}
+        summary_file = None
+        writer = None
+        if output_dir is not None:
+            summary_file = open(Path(output_dir) / "evaluation_summary.csv", 'w', newline='', encoding='utf-8')
+        
+        def record(emb_file: Path, result: Dict) -> None:
+            nonlocal writer
+            results[emb_file] = result
+            if summary_file is not None:
+                if writer is None:
+                    writer = csv.DictWriter(summary_file, fieldnames=list(result))
+                    writer.writeheader()
+                writer.writerow(result)
+                summary_file.flush()
+        
+        def failed(emb_file: Path, error: Exception) -> None:
+            self.error_count += 1
+            self.logger.error(f"{Fore.RED}Failed processing {emb_file.name}: {str(error)}{Style.RESET_ALL}")
+        
+        try:
+            if n_workers == 1:
+                for emb_file in tqdm(embedding_files, desc="Processing embedding files"):
+                    self.logger.info(f"\nEvaluating {emb_file.name}")
+                    try:
+                        record(emb_file, self.evaluate_file(emb_file, vocab, analogies, similarity_pairs))
+                    except Exception as e:
+                        failed(emb_file, e)
+            else:
+                if blas_threads is None:
+                    blas_threads = max(1, (os.cpu_count() or 1) // n_workers)
+                self.logger.info(f"{Fore.CYAN}Evaluating {len(embedding_files)} files on {n_workers} workers, "
+                                 f"{blas_threads} BLAS threads each{Style.RESET_ALL}")
+                # Forked workers share the resolved inputs copy-on-write; CUDA contexts do not survive fork
+                context = multiprocessing.get_context("spawn") if self.device.type == "cuda" else None
+                with ProcessPoolExecutor(max_workers=n_workers,
+                                         mp_context=context,
+                                         initializer=_init_evaluation_worker,
+                                         initargs=(self.log_dir, vocab, analogies, similarity_pairs,
+                                                   blas_threads)) as pool:
+                    by_size = sorted(embedding_files, key=lambda path: path.stat().st_size, reverse=True)
+                    futures = {pool.submit(_run_evaluation_job, str(emb_file)): emb_file for emb_file in by_size}
+                    for future in tqdm(as_completed(futures), total=len(futures), desc="Processing embedding files"):
+                        try:
+                            record(futures[future], future.result())
+                        except Exception as e:
+                            failed(futures[future], e)
+        finally:
+            if summary_file is not None:
+                summary_file.close()
+        # File order, whatever order the workers finished in
+        return [results[emb_file] for emb_file in embedding_files if emb_file in results]
     
     def _create_summary_dataframe(self, results: List[Dict]) -> pd.DataFrame:
         """Create a summary DataFrame from the results"""
@@ -428,7 +555,8 @@ def main():
         evaluator.evaluate_embeddings(
             embeddings_dir="./processed_data/embeddings",
             vocab_file="./processed_data/cooccurrence_matrices/vocabulary.json",
-            output_dir="./evaluation_results"
+            output_dir="./evaluation_results",
+            n_workers=max(1, (os.cpu_count() or 1) // 4)
         )
     except Exception as e:
         print(f"{Fore.RED}Fatal error: {str(e)}{Style.RESET_ALL}")
@@ -12,14 +12,16 @@ import matplotlib.pyplot as plt
 from tqdm import tqdm
 from colorama import Fore, Style, init
 import torch
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from gensim.models import KeyedVectors
 from gensim.scripts.glove2word2vec import glove2word2vec
 
+from embedding_metrics import (evaluate_analogies as analogy_metrics, evaluate_clustering as clustering_metrics,
+                               evaluate_similarity as similarity_metrics,
+                               resolve_similarity_pairs, unit_rows)
+
 # Initialize colorama (with auto reset so colors do not persist)
 init(autoreset=True)
 
@@ -34,6 +36,12 @@ class NeuralEmbeddingEvaluator:
         'correlation': ['#FF0000', '#FFFFFF', '#0000FF']  # Red to Blue
     }
     
+    # Summary column prefix -> (dataset key, (word1, word2, score) columns)
+    SIMILARITY_DATASETS = {
+        "SimLex": ("simlex", ("word1", "word2", "SimLex999")),
+        "WordSim": ("wordsim", ("Word 1", "Word 2", "Human (mean)"))
+    }
+    
     def __init__(self, log_dir: str = "logs"):
         self.setup_logging(log_dir)
         self._setup_gpu()
@@ -111,39 +119,33 @@ class NeuralEmbeddingEvaluator:
             self.logger.error(f"{Fore.RED}Failed to load evaluation datasets: {str(e)}{Style.RESET_ALL}")
             sys.exit(1)
     
-    def evaluate_analogies(self, embeddings: np.ndarray, vocab: dict,
-                           analogies: list) -> dict:
+    def evaluate_analogies(self, embeddings, vocab: dict,
+                           analogies: list, method: str = "3cosadd", top_k: int = 1) -> dict:
         """
         Evaluate word analogies using vector arithmetic.
         Analogies is a list of tuples like (a, b, c, d) where a:b :: c:d.
+        All questions are scored in one batched pass; method is 3cosadd or 3cosmul.
         """
-        correct = 0
-        total = 0
-        embeddings_tensor = torch.tensor(embeddings, device=self.device)
-        for a, b, c, d in analogies:
-            if a in vocab and b in vocab and c in vocab and d in vocab:
-                vec_a = embeddings_tensor[vocab[a]]
-                vec_b = embeddings_tensor[vocab[b]]
-                vec_c = embeddings_tensor[vocab[c]]
-                expected = vec_b - vec_a + vec_c
-                similarities = torch.nn.functional.cosine_similarity(expected.unsqueeze(0), embeddings_tensor)
-                similarities[vocab[a]] = -1
-                similarities[vocab[b]] = -1
-                similarities[vocab[c]] = -1
-                pred_idx = similarities.argmax().item()
-                if pred_idx == vocab[d]:
-                    correct += 1
-                total += 1
-        accuracy = correct / total if total > 0 else 0
-        return {"Analogy-Accuracy": accuracy, "Analogy-Total": total}
+        return analogy_metrics(embeddings, vocab, analogies, method=method, top_k=top_k, device=self.device)
     
-    def evaluate_clustering(self, embeddings: np.ndarray, n_clusters: int = 10) -> dict:
-        """Evaluate clustering quality using K-Means and the silhouette score."""
+    def evaluate_similarity(self, embeddings: np.ndarray, vocab: dict, datasets: dict) -> dict:
+        """Spearman correlation and coverage on the SimLex and WordSim pairs."""
+        results = {}
+        for name, (key, columns) in self.SIMILARITY_DATASETS.items():
+            resolved = resolve_similarity_pairs(datasets[key], vocab, columns)
+            results.update(similarity_metrics(embeddings, resolved, name))
+        return results
+    
+    def evaluate_clustering(self, embeddings: np.ndarray, n_clusters: int = 10,
+                            sample_size: int = 10000, n_samples: int = 5) -> dict:
+        """
+        Evaluate clustering quality using MiniBatchKMeans and a silhouette score
+        averaged over n_samples random subsets of sample_size words, with a 95%
+        confidence interval across subsets.
+        """
         try:
-            kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-            labels = kmeans.fit_predict(embeddings)
-            score = silhouette_score(embeddings, labels)
-            return {"Clustering-Silhouette": score, "Clusters": n_clusters}
+            return clustering_metrics(embeddings, n_clusters=n_clusters,
+                                      sample_size=sample_size, n_samples=n_samples)
         except Exception as e:
             self.logger.error(f"Clustering evaluation error: {e}")
             return {"Clustering-Silhouette": None, "Clusters": n_clusters}
@@ -279,7 +281,7 @@ class NeuralEmbeddingEvaluator:
         Main evaluation function.
           - Loads neural embeddings.
           - Loads evaluation datasets.
-          - Computes evaluation metrics (using placeholder values for some metrics).
+          - Computes SimLex/WordSim Spearman correlations and coverage.
           - Evaluates analogy and clustering tasks.
           - Creates visualizations and saves summary CSV and JSON.
         """
@@ -293,9 +295,7 @@ class NeuralEmbeddingEvaluator:
             # Load evaluation datasets (SimLex, WordSim)
             datasets = self.load_evaluation_datasets()
             
-            # For demonstration, we use placeholder (random) values for SimLex/WordSim metrics.
-            simlex_corr = float(np.random.rand())
-            wordsim_corr = float(np.random.rand())
+            similarity_results = self.evaluate_similarity(embeddings, vocab, datasets)
             
             # Define some default analogy questions (ensure these words are in your vocab)
             default_analogies = [
@@ -303,18 +303,26 @@ class NeuralEmbeddingEvaluator:
                 ("paris", "france", "london", "england"),
                 ("big", "biggest", "small", "smallest")
             ]
-            analogy_results = self.evaluate_analogies(embeddings, vocab, default_analogies)
+            unit = unit_rows(embeddings, self.device)
+            analogy_results = self.evaluate_analogies(unit, vocab, default_analogies)
+            cosmul_results = self.evaluate_analogies(unit, vocab, default_analogies, method="3cosmul")
+            del unit
             clustering_results = self.evaluate_clustering(embeddings, n_clusters=10)
             
             # For demonstration, include dummy parameters for configuration.
             result = {
                 "Normalization": "neural",
                 "Dimensions": embeddings.shape[1],
-                "SimLex-Correlation": simlex_corr,
-                "WordSim-Correlation": wordsim_corr,
+                "SimLex-Correlation": similarity_results["SimLex-Correlation"],
+                "SimLex-Coverage": similarity_results["SimLex-Coverage"],
+                "WordSim-Correlation": similarity_results["WordSim-Correlation"],
+                "WordSim-Coverage": similarity_results["WordSim-Coverage"],
                 "Analogy-Accuracy": analogy_results["Analogy-Accuracy"],
+                "Analogy-3CosMul-Accuracy": cosmul_results["Analogy-Accuracy"],
                 "Analogy-Total": analogy_results["Analogy-Total"],
-                "Clustering-Silhouette": clustering_results["Clustering-Silhouette"]
+                "Clustering-Silhouette": clustering_results["Clustering-Silhouette"],
+                "Clustering-Silhouette-CI-Low": clustering_results.get("Clustering-Silhouette-CI-Low"),
+                "Clustering-Silhouette-CI-High": clustering_results.get("Clustering-Silhouette-CI-High")
             }
             results = [result]
             summary_df = pd.DataFrame(results)
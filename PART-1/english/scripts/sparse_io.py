@@ -0,0 +1,68 @@
+import zipfile
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+from scipy.sparse import csr_matrix, load_npz, save_npz
+
+# Local file header layout: fixed 30 bytes, then the name and the extra field
+_LOCAL_HEADER_SIZE = 30
+_NAME_LENGTH_OFFSET = 26
+
+
+def save_csr(path: Union[str, Path], matrix) -> None:
+    """Save a sparse matrix as an uncompressed .npz.
+
+    The file is an ordinary scipy.sparse.save_npz archive (load_npz still
+    reads it); storing the members uncompressed is what lets load_csr map
+    data/indices/indptr straight from disk.
+    """
+    save_npz(path, csr_matrix(matrix), compressed=False)
+
+
+def _mmap_member(path: Union[str, Path], archive: zipfile.ZipFile, name: str) -> np.ndarray:
+    """Read-only memory map of one stored (uncompressed) .npy member"""
+    info = archive.getinfo(name)
+    with open(path, 'rb') as f:
+        f.seek(info.header_offset + _NAME_LENGTH_OFFSET)
+        name_length = int.from_bytes(f.read(2), 'little')
+        extra_length = int.from_bytes(f.read(2), 'little')
+        f.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_length + extra_length)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if dtype.hasobject:
+        raise ValueError(f"{name} holds Python objects and cannot be memory-mapped")
+    if int(np.prod(shape)) == 0:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                     order='F' if fortran_order else 'C')
+
+
+def load_csr(path: Union[str, Path], mmap: bool = True) -> csr_matrix:
+    """Load a CSR matrix saved with save_npz, zero-copy when possible.
+
+    With mmap=True and an uncompressed archive, data/indices/indptr are
+    read-only memory maps into the .npz itself, so processes loading the same
+    matrix share one page-cached copy. Compressed archives (and mmap=False)
+    fall back to scipy's load_npz.
+    """
+    if mmap:
+        with zipfile.ZipFile(path) as archive:
+            members = {info.filename: info for info in archive.infolist()}
+            components = ("data.npy", "indices.npy", "indptr.npy")
+            if all(members.get(name) and members[name].compress_type == zipfile.ZIP_STORED
+                   for name in components):
+                with archive.open("format.npy") as f:
+                    matrix_format = np.lib.format.read_array(f).item()
+                if isinstance(matrix_format, bytes):
+                    matrix_format = matrix_format.decode('ascii')
+                if matrix_format == "csr":
+                    with archive.open("shape.npy") as f:
+                        shape = tuple(int(n) for n in np.lib.format.read_array(f))
+                    data, indices, indptr = (_mmap_member(path, archive, name) for name in components)
+                    return csr_matrix((data, indices, indptr), shape=shape, copy=False)
+    return csr_matrix(load_npz(path))
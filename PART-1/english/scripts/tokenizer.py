@@ -2,14 +2,21 @@ import time
 import sys
 from pathlib import Path
 import pickle
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Iterator
 
-import cudf
 import spacy
 from tqdm import tqdm
 from colorama import Fore, Style, init
 import logging
 import re
+import argparse
+import json
+import os
+import io
+
+from array_backend import ArrayBackend
+from artifact_cache import ArtifactCache
+from columnar_corpus import ColumnarCorpus
 
 # Initialize colorama for cross-platform colored output
 init()
@@ -17,30 +24,56 @@ init()
 class GPUTokenizer:
     """GPU-accelerated tokenizer with progress tracking and error handling"""
     
+    # Pipeline components that never affect token.text
+    NON_TOKENIZER_COMPONENTS = ["tok2vec", "tagger", "morphologizer", "parser", "senter",
+                                "attribute_ruler", "lemmatizer", "ner"]
+    
     def __init__(self, 
                  model_name: str = "en_core_web_sm", 
                  log_file: str = "tokenizer.log",
                  remove_stop_words: bool = True,
                  remove_punctuation: bool = True,
                  remove_numbers: bool = True,
-                 min_token_length: int = 3):
+                 min_token_length: int = 3,
+                 backend: str = "auto",
+                 fast_tokenizer: bool = False,
+                 n_process: int = 1):
         self.setup_logging(log_file)
+        self.model_name = model_name
+        # cuDF on GPU hosts, pandas on CPU-only hosts
+        self.backend = ArrayBackend(backend)
         self.remove_stop_words = remove_stop_words
         self.remove_punctuation = remove_punctuation
         self.remove_numbers = remove_numbers
         self.min_token_length = min_token_length
+        # Tokenizer-only pipeline; only token.text is used downstream
+        self.fast_tokenizer = fast_tokenizer
+        self.n_process = n_process
+        # Sentences/sec of the most recent tokenize_batch call
+        self.last_throughput = 0.0
         self._setup_spacy(model_name)
         
     def _setup_spacy(self, model_name: str) -> None:
         """Setup spaCy with GPU if available"""
         try:
-            if spacy.prefer_gpu():
+            # The tokenizer runs on the CPU regardless, so the fast path skips the GPU
+            self.spacy_gpu = False
+            if self.fast_tokenizer:
+                self.logger.info(f"{Fore.GREEN}Tokenizer-only spaCy pipeline (n_process={self.n_process}){Style.RESET_ALL}")
+            elif self.backend.is_gpu and spacy.prefer_gpu():
                 spacy.require_gpu()
+                self.spacy_gpu = True
                 self.logger.info(f"{Fore.GREEN}GPU acceleration enabled for spaCy{Style.RESET_ALL}")
             else:
                 self.logger.warning(f"{Fore.YELLOW}GPU not available for spaCy, falling back to CPU{Style.RESET_ALL}")
+            if self.spacy_gpu and self.n_process > 1:
+                self.logger.warning(f"{Fore.YELLOW}n_process > 1 is not supported with spaCy on GPU, using 1{Style.RESET_ALL}")
+                self.n_process = 1
             
-            self.nlp = spacy.load(model_name)
+            if self.fast_tokenizer:
+                self.nlp = spacy.load(model_name, exclude=self.NON_TOKENIZER_COMPONENTS)
+            else:
+                self.nlp = spacy.load(model_name)
             # Create custom stop words set
             self.stop_words = set(self.nlp.Defaults.stop_words)
             self.logger.info(f"Loaded spaCy model: {model_name}")
@@ -69,8 +102,8 @@ class GPUTokenizer:
         self.logger.addHandler(fh)
         self.logger.addHandler(ch)
 
-    def clean_text_gpu(self, text_series: cudf.Series) -> cudf.Series:
-        """Clean text using GPU-accelerated operations"""
+    def clean_text_gpu(self, text_series):
+        """Clean text using vectorized string operations (cuDF on GPU, pandas on CPU)"""
         try:
             clean_series = text_series.str.lower()
             
@@ -111,8 +144,9 @@ class GPUTokenizer:
     def tokenize_batch(self, sentences: List[str], batch_size: int = 1000) -> List[List[str]]:
         """Tokenize sentences using spaCy's pipe for batch processing"""
         try:
+            start_time = time.perf_counter()
             docs = list(tqdm(
-                self.nlp.pipe(sentences, batch_size=batch_size),
+                self.nlp.pipe(sentences, batch_size=batch_size, n_process=self.n_process),
                 total=len(sentences),
                 desc=f"{Fore.CYAN}Tokenizing batches{Style.RESET_ALL}"
             ))
@@ -123,34 +157,261 @@ class GPUTokenizer:
                 tokens = [token.text for token in doc]
                 filtered_tokens = self.filter_tokens(tokens)
                 tokenized_sentences.append(filtered_tokens)
+            
+            elapsed = time.perf_counter() - start_time
+            self.last_throughput = len(sentences) / elapsed if elapsed > 0 else 0.0
+            self.logger.info(f"Tokenized {len(sentences)} sentences at {self.last_throughput:.0f} sentences/sec")
                 
             return tokenized_sentences
         except Exception as e:
             self.logger.error(f"{Fore.RED}Tokenization failed: {str(e)}{Style.RESET_ALL}")
             raise
 
+    def stream_sentences(self,
+                         input_file: str,
+                         chunk_size: int,
+                         skip_chunks: int = 0) -> Iterator[List[str]]:
+        """Yield cleaned sentences of the raw corpus one chunk at a time
+
+        The first skip_chunks chunks are read but neither cleaned nor yielded,
+        which is how an interrupted run resumes.
+        """
+        chunks = self.backend.read_csv_chunks(input_file, chunk_size, header=None, names=["sentence"])
+        for chunk_index, chunk in enumerate(chunks):
+            if chunk_index < skip_chunks:
+                continue
+            yield self.backend.to_pandas(self.clean_text_gpu(chunk["sentence"])).tolist()
+
+    def tokenize_stream(self, sentences: List[str], batch_size: int = 1000) -> Iterator[List[str]]:
+        """Filtered token lists for sentences, one Doc alive at a time"""
+        for doc in self.nlp.pipe(sentences, batch_size=batch_size, n_process=self.n_process):
+            yield self.filter_tokens([token.text for token in doc])
+
+    @staticmethod
+    def _write_checkpoint(checkpoint_file: Path, checkpoint: Dict) -> None:
+        tmp_file = checkpoint_file.with_name(checkpoint_file.name + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(tmp_file, checkpoint_file)
+
+    def process_corpus_streaming(self,
+                                 input_file: str,
+                                 output_dir: str,
+                                 batch_size: int = 1000,
+                                 chunk_size: int = 20000,
+                                 resume: bool = True,
+                                 cache: Optional[ArtifactCache] = None) -> Dict:
+        """Tokenize the corpus chunk by chunk into a line-per-sentence text sink
+
+        Each chunk of chunk_size raw lines is cleaned, tokenized and appended to
+        tokenized_corpus.txt (space-separated tokens, one sentence per line)
+        before the next chunk is read, so peak memory does not grow with the
+        corpus. After every chunk the sink is fsynced and a checkpoint records
+        how many chunks and bytes are complete; a rerun after a crash truncates
+        the sink to the last checkpoint and continues from the next chunk.
+        """
+        start_time = time.perf_counter()
+        self.logger.info(f"{Fore.GREEN}Starting streaming corpus processing{Style.RESET_ALL}")
+        
+        try:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            output_file = Path(output_dir) / "tokenized_corpus.txt"
+            stats_file = Path(output_dir) / "corpus_stats.pkl"
+            checkpoint_file = Path(output_dir) / "tokenized_corpus.checkpoint.json"
+            
+            if cache is not None:
+                cache_key = cache.key("tokenize_stream", [input_file], self.cache_params())
+                if cache.fetch(cache_key, [str(output_file), str(stats_file)]):
+                    self.logger.info(f"{Fore.GREEN}Tokenized corpus restored from cache ({cache_key[:12]}){Style.RESET_ALL}")
+                    with open(stats_file, 'rb') as f:
+                        stats = pickle.load(f)
+                    return {"output_file": str(output_file), "stats": stats}
+            
+            # Resume only a checkpoint written for the same input and settings
+            checkpoint = {
+                "input_file": str(Path(input_file).resolve()),
+                "chunk_size": chunk_size,
+                "settings": self.cache_params(),
+                "chunks_done": 0,
+                "sink_bytes": 0,
+                "total_sentences": 0,
+                "total_tokens": 0
+            }
+            if resume and checkpoint_file.exists() and output_file.exists():
+                with open(checkpoint_file, 'r') as f:
+                    saved = json.load(f)
+                if all(saved.get(field) == checkpoint[field] for field in ("input_file", "chunk_size", "settings")):
+                    checkpoint = saved
+                    self.logger.info(f"{Fore.YELLOW}Resuming after chunk {checkpoint['chunks_done']} "
+                                     f"({checkpoint['total_sentences']} sentences){Style.RESET_ALL}")
+            
+            with open(output_file, 'a+b') as sink:
+                # Drop anything written after the last checkpoint
+                sink.truncate(checkpoint["sink_bytes"])
+                sink.seek(checkpoint["sink_bytes"])
+                
+                chunks = self.stream_sentences(input_file, chunk_size, skip_chunks=checkpoint["chunks_done"])
+                for sentences in tqdm(chunks, desc=f"{Fore.CYAN}Tokenizing chunks{Style.RESET_ALL}",
+                                      initial=checkpoint["chunks_done"]):
+                    lines = []
+                    for tokens in self.tokenize_stream(sentences, batch_size):
+                        lines.append(" ".join(tokens))
+                        checkpoint["total_tokens"] += len(tokens)
+                    if lines:
+                        sink.write(("\n".join(lines) + "\n").encode("utf-8"))
+                    sink.flush()
+                    os.fsync(sink.fileno())
+                    
+                    checkpoint["chunks_done"] += 1
+                    checkpoint["sink_bytes"] = sink.tell()
+                    checkpoint["total_sentences"] += len(lines)
+                    self._write_checkpoint(checkpoint_file, checkpoint)
+            
+            total_sentences = checkpoint["total_sentences"]
+            total_tokens = checkpoint["total_tokens"]
+            stats = {
+                "total_sentences": total_sentences,
+                "total_tokens": total_tokens,
+                "avg_tokens_per_sentence": total_tokens / total_sentences if total_sentences > 0 else 0
+            }
+            with open(stats_file, 'wb') as f:
+                pickle.dump(stats, f)
+            checkpoint_file.unlink()
+            if cache is not None:
+                cache.store(cache_key, [str(output_file), str(stats_file)], stage="tokenize_stream")
+            
+            processing_time = time.perf_counter() - start_time
+            self.logger.info(f"{Fore.GREEN}Streaming processing complete in {processing_time:.2f} seconds{Style.RESET_ALL}")
+            self.logger.info(f"{Fore.GREEN}Tokenized corpus saved to {output_file}{Style.RESET_ALL}")
+            self.logger.info(f"Statistics: {stats}")
+            
+            return {"output_file": str(output_file), "stats": stats}
+            
+        except Exception as e:
+            self.logger.error(f"{Fore.RED}Streaming corpus processing failed: {str(e)}{Style.RESET_ALL}")
+            raise
+
+    def process_corpus_incremental(self,
+                                   input_file: str,
+                                   output_dir: str,
+                                   batch_size: int = 1000) -> Dict:
+        """Tokenize only the lines appended to input_file since the previous call
+
+        tokenized_corpus.ingest.json in output_dir records how many bytes of
+        the raw corpus were already tokenized. The complete lines after that
+        point are cleaned and tokenized like process_corpus and saved as the
+        columnar corpus output_dir/tokenized_delta_NNNNN/, which
+        CooccurrenceMatrixBuilder.process_incremental adds to the matrices.
+        A trailing line without a newline is left for the next call.
+        """
+        start_time = time.perf_counter()
+        
+        try:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            state_file = Path(output_dir) / "tokenized_corpus.ingest.json"
+            state = {
+                "input_file": str(Path(input_file).resolve()),
+                "settings": self.cache_params(),
+                "bytes_done": 0,
+                "deltas": 0,
+                "total_sentences": 0
+            }
+            if state_file.exists():
+                with open(state_file, 'r') as f:
+                    saved = json.load(f)
+                if any(saved.get(field) != state[field] for field in ("input_file", "settings")):
+                    raise ValueError(f"{state_file} was written for another corpus or tokenizer settings")
+                state = saved
+            
+            with open(input_file, 'rb') as f:
+                f.seek(state["bytes_done"])
+                new_bytes = f.read()
+            new_bytes = new_bytes[:new_bytes.rfind(b"\n") + 1]
+            if not new_bytes:
+                self.logger.info(f"{Fore.YELLOW}No new sentences in {input_file}{Style.RESET_ALL}")
+                return {"delta_dir": None, "stats": {"total_sentences": 0, "total_tokens": 0}}
+            
+            self.logger.info(f"{Fore.CYAN}Tokenizing {len(new_bytes) / 1024**2:.1f}MB appended to {input_file}{Style.RESET_ALL}")
+            df = self.backend.read_csv(io.BytesIO(new_bytes), header=None, names=["sentence"])
+            df["clean"] = self.clean_text_gpu(df["sentence"])
+            sentences = self.backend.to_pandas(df["clean"]).tolist()
+            tokenized_sentences = self.tokenize_batch(sentences, batch_size)
+            
+            delta_dir = Path(output_dir) / f"tokenized_delta_{state['deltas']:05d}"
+            ColumnarCorpus.from_sentences(tokenized_sentences).save(delta_dir)
+            state["bytes_done"] += len(new_bytes)
+            state["deltas"] += 1
+            state["total_sentences"] += len(tokenized_sentences)
+            self._write_checkpoint(state_file, state)
+            
+            stats = {
+                "total_sentences": len(tokenized_sentences),
+                "total_tokens": sum(len(sent) for sent in tokenized_sentences),
+                "tokenize_sentences_per_sec": self.last_throughput
+            }
+            processing_time = time.perf_counter() - start_time
+            self.logger.info(f"{Fore.GREEN}Delta tokenized in {processing_time:.2f} seconds, saved to {delta_dir}{Style.RESET_ALL}")
+            return {"delta_dir": str(delta_dir), "stats": stats}
+            
+        except Exception as e:
+            self.logger.error(f"{Fore.RED}Incremental corpus processing failed: {str(e)}{Style.RESET_ALL}")
+            raise
+
+    def cache_params(self) -> Dict:
+        """Settings that determine the tokenized output (part of the cache key)"""
+        return {
+            "model_name": self.model_name,
+            "remove_stop_words": self.remove_stop_words,
+            "remove_punctuation": self.remove_punctuation,
+            "remove_numbers": self.remove_numbers,
+            "min_token_length": self.min_token_length
+        }
+
     def process_corpus(self, 
                       input_file: str, 
                       output_dir: str,
-                      batch_size: int = 1000) -> Dict[str, List[List[str]]]:
-        """Process entire corpus and save tokenized output"""
+                      batch_size: int = 1000,
+                      cache: Optional[ArtifactCache] = None) -> Dict[str, List[List[str]]]:
+        """Process entire corpus and save tokenized output
+
+        The tokens are saved as a columnar corpus in output_dir/tokenized_corpus/
+        (vocabulary table, uint32 token ids, int64 sentence offsets), which
+        the co-occurrence builder memory-maps instead of unpickling.
+        With a cache, a corpus already tokenized with the same settings is
+        restored from the cache instead of being re-tokenized.
+        """
         start_time = time.perf_counter()
         self.logger.info(f"{Fore.GREEN}Starting corpus processing{Style.RESET_ALL}")
         
         try:
             # Create output directory if it doesn't exist
             Path(output_dir).mkdir(parents=True, exist_ok=True)
+            output_file = Path(output_dir) / "tokenized_corpus"
+            stats_file = Path(output_dir) / "corpus_stats.pkl"
+            outputs = ColumnarCorpus.files(output_file) + [str(stats_file)]
+            
+            if cache is not None:
+                cache_key = cache.key("tokenize", [input_file], self.cache_params())
+                if cache.fetch(cache_key, outputs):
+                    self.logger.info(f"{Fore.GREEN}Tokenized corpus restored from cache ({cache_key[:12]}){Style.RESET_ALL}")
+                    tokenized_sentences = ColumnarCorpus.load(output_file).to_sentences()
+                    with open(stats_file, 'rb') as f:
+                        stats = pickle.load(f)
+                    return {
+                        "tokenized_sentences": tokenized_sentences,
+                        "stats": stats
+                    }
             
             # Load corpus
             self.logger.info(f"{Fore.CYAN}Loading corpus from {input_file}{Style.RESET_ALL}")
-            df = cudf.read_csv(input_file, header=None, names=["sentence"])
+            df = self.backend.read_csv(input_file, header=None, names=["sentence"])
             
             # Clean text
-            self.logger.info(f"{Fore.CYAN}Cleaning text on GPU{Style.RESET_ALL}")
+            self.logger.info(f"{Fore.CYAN}Cleaning text on {self.backend.name.upper()}{Style.RESET_ALL}")
             df["clean"] = self.clean_text_gpu(df["sentence"])
             
             # Convert to pandas for tokenization
-            sentences = df["clean"].to_pandas().tolist()
+            sentences = self.backend.to_pandas(df["clean"]).tolist()
             
             # Tokenize
             tokenized_sentences = self.tokenize_batch(sentences, batch_size)
@@ -163,17 +424,16 @@ class GPUTokenizer:
             stats = {
                 "total_sentences": total_sentences,
                 "total_tokens": total_tokens,
-                "avg_tokens_per_sentence": avg_tokens_per_sentence
+                "avg_tokens_per_sentence": avg_tokens_per_sentence,
+                "tokenize_sentences_per_sec": self.last_throughput
             }
             
             # Save results
-            output_file = Path(output_dir) / "tokenized_corpus.pkl"
-            stats_file = Path(output_dir) / "corpus_stats.pkl"
-            
-            with open(output_file, 'wb') as f:
-                pickle.dump(tokenized_sentences, f)
+            ColumnarCorpus.from_sentences(tokenized_sentences).save(output_file)
             with open(stats_file, 'wb') as f:
                 pickle.dump(stats, f)
+            if cache is not None:
+                cache.store(cache_key, outputs, stage="tokenize")
             
             processing_time = time.perf_counter() - start_time
             self.logger.info(f"{Fore.GREEN}Processing complete in {processing_time:.2f} seconds{Style.RESET_ALL}")
@@ -189,20 +449,100 @@ class GPUTokenizer:
             self.logger.error(f"{Fore.RED}Corpus processing failed: {str(e)}{Style.RESET_ALL}")
             raise
 
+def benchmark_tokenizer_paths(sentences: List[str],
+                              model_name: str = "en_core_web_sm",
+                              batch_size: int = 1000,
+                              n_process: int = 1,
+                              log_file: str = "tokenizer_benchmark.log") -> Dict:
+    """CPU throughput of the full pipeline vs the tokenizer-only fast path
+
+    Both paths run with a single process and, when n_process > 1, again
+    with n_process workers, so the gain from excluding components and the
+    gain from the worker fan-out are reported separately. All runs see the
+    same cleaned sentences and must reproduce the single-process full
+    pipeline's token lists exactly.
+    """
+    throughput = {}
+    reference = None
+    identical = True
+    for processes in sorted({1, n_process}):
+        for path, fast_tokenizer in (("full_pipeline", False), ("fast_path", True)):
+            tokenizer = GPUTokenizer(model_name, log_file=log_file, backend="cpu",
+                                     fast_tokenizer=fast_tokenizer, n_process=processes)
+            tokens = tokenizer.tokenize_batch(sentences, batch_size)
+            if reference is None:
+                reference = tokens
+            else:
+                identical = identical and tokens == reference
+            throughput[path, processes] = tokenizer.last_throughput
+    
+    full = throughput["full_pipeline", 1]
+    results = {
+        "sentences": len(sentences),
+        "n_process": n_process,
+        "full_pipeline_sentences_per_sec": full,
+        "fast_path_sentences_per_sec": throughput["fast_path", 1],
+        "speedup": throughput["fast_path", 1] / full if full > 0 else 0.0,
+        "identical_output": identical
+    }
+    if n_process > 1:
+        results["full_pipeline_sentences_per_sec_parallel"] = throughput["full_pipeline", n_process]
+        results["fast_path_sentences_per_sec_parallel"] = throughput["fast_path", n_process]
+        results["parallel_speedup"] = throughput["fast_path", n_process] / full if full > 0 else 0.0
+    return results
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tokenize the English corpus")
+    parser.add_argument("--cache-dir", default="./processed_data/.artifact_cache",
+                        help="Content-addressed artifact cache directory")
+    parser.add_argument("--cache-budget-gb", type=float, default=20.0,
+                        help="Disk budget for the cache; least recently used entries are evicted")
+    parser.add_argument("--force", action="store_true",
+                        help="Ignore cached outputs and recompute")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Tokenize chunk by chunk into tokenized_corpus.txt with resumable checkpoints")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Tokenize only lines appended since the last run into tokenized_delta_NNNNN/")
+    parser.add_argument("--chunk-size", type=int, default=20000,
+                        help="Raw lines per chunk in streaming mode")
+    parser.add_argument("--fast", action="store_true",
+                        help="Tokenizer-only spaCy pipeline (tagger, parser, NER etc. excluded)")
+    parser.add_argument("--n-process", type=int, default=1,
+                        help="spaCy worker processes for nlp.pipe")
+    args = parser.parse_args()
+    
     # Example usage
     try:
+        cache = ArtifactCache(args.cache_dir, budget_gb=args.cache_budget_gb, force=args.force)
         tokenizer = GPUTokenizer(
             remove_stop_words=True,
             remove_punctuation=True,
             remove_numbers=True,
-            min_token_length=3
-        )
-        results = tokenizer.process_corpus(
-            input_file="./dataset/raw/eng_news_2024_300K-sentences.txt",
-            output_dir="./processed_data",
-            batch_size=1000
+            min_token_length=3,
+            fast_tokenizer=args.fast,
+            n_process=args.n_process
         )
+        if args.incremental:
+            results = tokenizer.process_corpus_incremental(
+                input_file="./dataset/raw/eng_news_2024_300K-sentences.txt",
+                output_dir="./processed_data",
+                batch_size=1000
+            )
+        elif args.streaming:
+            results = tokenizer.process_corpus_streaming(
+                input_file="./dataset/raw/eng_news_2024_300K-sentences.txt",
+                output_dir="./processed_data",
+                batch_size=1000,
+                chunk_size=args.chunk_size,
+                cache=cache
+            )
+        else:
+            results = tokenizer.process_corpus(
+                input_file="./dataset/raw/eng_news_2024_300K-sentences.txt",
+                output_dir="./processed_data",
+                batch_size=1000,
+                cache=cache
+            )
         print(f"{Fore.GREEN}Successfully processed corpus{Style.RESET_ALL}")
         print(f"Statistics: {results['stats']}")
         
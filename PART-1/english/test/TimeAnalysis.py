@@ -1,77 +1,148 @@
 """
 Optimized Pipeline for GPU-Accelerated Cleaning, Tokenization, and Embedding Generation (English Only)
-- Loads and cleans data on GPU using cuDF.
+- Loads and cleans data on GPU using cuDF, or memory-maps the columnar
+  tokenized corpus when one exists.
 - Uses spaCy (with GPU enabled) for batch tokenization.
-- Builds vocabulary and a co-occurrence matrix with a sliding window.
+- Builds a frequency-filtered vocabulary and a co-occurrence matrix with a
+  sliding window, accumulated in batches as COO triplets.
 - Applies dimensionality reduction using TruncatedSVD.
 - Displays progress/status bars and timing for each step.
 """
 
+import sys
 import time
 import re
+import resource
+import itertools
 import numpy as np
-from scipy.sparse import lil_matrix
+from pathlib import Path
+from scipy.sparse import coo_matrix, csr_matrix
 from sklearn.decomposition import TruncatedSVD
 from collections import Counter
 from tqdm import tqdm
 
-# ----------------------------
-# Step 1: GPU-Accelerated Data Loading & Cleaning with RAPIDS
-# ----------------------------
-import cudf
-
-def clean_text_gpu(text_series):
-    """
-    Use cuDF vectorized string methods to lowercase and remove punctuation.
-    """
-    clean_series = text_series.str.lower()
-    clean_series = clean_series.str.replace(r'[^\w\s]', '', regex=True)
-    return clean_series
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from columnar_corpus import ColumnarCorpus
+
+# Columnar corpus written by scripts/tokenizer.py. When it exists, steps 1-2
+# are replaced by memory-mapping it.
+COLUMNAR_CORPUS = "./processed_data/tokenized_corpus"
+# Words seen fewer times are left out of the vocabulary (same default as
+# scripts/cooccurrence_builder.py)
+MIN_FREQ = 5
+# Sentences per COO batch; bounds the size of the temporary pair arrays
+BATCH_SIZE = 10000
+
+if ColumnarCorpus.is_corpus(COLUMNAR_CORPUS):
+    start_time = time.perf_counter()
+    print(f"Loading columnar corpus from {COLUMNAR_CORPUS}...")
+    corpus_en = ColumnarCorpus.load(COLUMNAR_CORPUS)
+    print(f"{len(corpus_en)} sentences, {corpus_en.n_tokens} tokens loaded in "
+          f"{(time.perf_counter() - start_time) * 1000:.1f} ms.")
+else:
+    corpus_en = None
+
+    # ----------------------------
+    # Step 1: GPU-Accelerated Data Loading & Cleaning with RAPIDS
+    # ----------------------------
+    import cudf
+
+    def clean_text_gpu(text_series):
+        """
+        Use cuDF vectorized string methods to lowercase and remove punctuation.
+        """
+        clean_series = text_series.str.lower()
+        clean_series = clean_series.str.replace(r'[^\w\s]', '', regex=True)
+        return clean_series
+
+    # Timing the loading and cleaning step
+    start_time = time.perf_counter()
+    print("Loading English corpus on GPU...")
+    # Update the path to your 10K or 300K sentence corpus as needed.
+    # eng_df = cudf.read_csv("./dataset/raw/eng_10k/eng_news_2024_10k-sentences.txt",
+    #                        header=None, names=["sentence"])
+    eng_df = cudf.read_csv("./dataset/raw/eng_300k/eng_news_2024_300k-sentences.txt",
+                           header=None, names=["sentence"])
+    eng_df["clean"] = clean_text_gpu(eng_df["sentence"])
+    print(f"Corpus loaded and cleaned in {time.perf_counter() - start_time:.2f} seconds.")
+
+    # ----------------------------
+    # Step 2: Tokenization using spaCy with GPU acceleration
+    # ----------------------------
+    import spacy
+
+    # Enable GPU (if available)
+    if spacy.prefer_gpu():
+        spacy.require_gpu()
+    nlp_en = spacy.load("en_core_web_sm")  # You can switch to a larger model if desired
+
+    def spacy_tokenize_pipe(sentences, batch_size=1000):
+        """
+        Tokenize sentences using spaCy's pipe for batch processing.
+        Returns a list of token lists.
+        """
+        # n_process=-1 uses all available cores; adjust batch_size as needed.
+        docs = list(nlp_en.pipe(sentences, batch_size=batch_size, n_process=1))
+        return [[token.text for token in doc] for doc in docs]
+
+    start_time = time.perf_counter()
+    # Use spaCy's pipe for fast, batch tokenization
+    print("Tokenizing English corpus...")
+    sentences = eng_df["clean"].to_pandas().tolist()
+    tokenized_sentences = spacy_tokenize_pipe(sentences, batch_size=1000)
+    print(f"Tokenization complete in {time.perf_counter() - start_time:.2f} seconds.")
 
-# Timing the loading and cleaning step
-start_time = time.perf_counter()
-print("Loading English corpus on GPU...")
-# Update the path to your 10K or 300K sentence corpus as needed.
-# eng_df = cudf.read_csv("./dataset/raw/eng_10k/eng_news_2024_10k-sentences.txt",
-#                        header=None, names=["sentence"])
-eng_df = cudf.read_csv("./dataset/raw/eng_300k/eng_news_2024_300k-sentences.txt",
-                       header=None, names=["sentence"])
-eng_df["clean"] = clean_text_gpu(eng_df["sentence"])
-print(f"Corpus loaded and cleaned in {time.perf_counter() - start_time:.2f} seconds.")
 
 # ----------------------------
-# Step 2: Tokenization using spaCy with GPU acceleration
+# Step 3: Build Vocabulary and Co-Occurrence Matrix
 # ----------------------------
-import spacy
-
-# Enable GPU (if available)
-if spacy.prefer_gpu():
-    spacy.require_gpu()
-nlp_en = spacy.load("en_core_web_sm")  # You can switch to a larger model if desired
+def peak_rss_mb():
+    """Peak resident memory of this process so far, in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 ** 2 if sys.platform == "darwin" else 1024)
 
-def spacy_tokenize_pipe(sentences, batch_size=1000):
+def window_cooccurrence(token_ids, sentence_ids, vocab_size, window_size):
     """
-    Tokenize sentences using spaCy's pipe for batch processing.
-    Returns a list of token lists.
+    Symmetric sliding-window counts for one batch of concatenated sentences.
+    For every distance k in 1..window_size, the (token, token k places later)
+    pairs that stay inside one sentence become COO triplets in both
+    directions; converting to CSR sums the duplicates.
     """
-    # n_process=-1 uses all available cores; adjust batch_size as needed.
-    docs = list(nlp_en.pipe(sentences, batch_size=batch_size, n_process=1))
-    return [[token.text for token in doc] for doc in docs]
-
-start_time = time.perf_counter()
-# Use spaCy's pipe for fast, batch tokenization
-print("Tokenizing English corpus...")
-sentences = eng_df["clean"].to_pandas().tolist()
-tokenized_sentences = spacy_tokenize_pipe(sentences, batch_size=1000)
-print(f"Tokenization complete in {time.perf_counter() - start_time:.2f} seconds.")
-
-
-# ----------------------------
-# Step 3: Build Vocabulary and Co-Occurrence Matrix
-# ----------------------------
-def build_vocab_and_cooccurrence(tokenized_sentences, window_size=5):
+    rows, cols = [], []
+    for k in range(1, window_size + 1):
+        same_sentence = sentence_ids[k:] == sentence_ids[:-k]
+        rows.append(token_ids[:-k][same_sentence])
+        cols.append(token_ids[k:][same_sentence])
+    left = np.concatenate(rows)
+    right = np.concatenate(cols)
+    data = np.ones(2 * len(left), dtype=np.float32)
+    return coo_matrix((data, (np.concatenate([left, right]), np.concatenate([right, left]))),
+                      shape=(vocab_size, vocab_size)).tocsr()
+
+def accumulate_cooccurrence(index_lists, vocab_size, window_size, total=None, batch_size=BATCH_SIZE):
+    """
+    Fill a sparse co-occurrence matrix from per-sentence vocabulary index lists
+    with a sliding window. Sentences are processed batch_size at a time, so no
+    Python code runs per token pair. Displays progress with tqdm.
+    """
+    cooc_matrix = csr_matrix((vocab_size, vocab_size), dtype=np.float32)
+    index_lists = iter(index_lists)
+    with tqdm(total=total, desc="Building co-occurrence matrix") as progress:
+        while True:
+            batch = list(itertools.islice(index_lists, batch_size))
+            if not batch:
+                break
+            lengths = np.fromiter(map(len, batch), dtype=np.int64, count=len(batch))
+            token_ids = np.fromiter(itertools.chain.from_iterable(batch), dtype=np.int64, count=int(lengths.sum()))
+            sentence_ids = np.repeat(np.arange(len(batch)), lengths)
+            cooc_matrix += window_cooccurrence(token_ids, sentence_ids, vocab_size, window_size)
+            progress.update(len(batch))
+    return cooc_matrix
+
+def build_vocab_and_cooccurrence(tokenized_sentences, window_size=5, min_freq=MIN_FREQ):
     """
     Build a vocabulary and a sparse co-occurrence matrix from tokenized sentences.
+    Words occurring fewer than min_freq times are dropped before windowing.
     Displays progress with tqdm.
     Returns: vocabulary dict and co-occurrence matrix.
     """
@@ -81,28 +152,49 @@ def build_vocab_and_cooccurrence(tokenized_sentences, window_size=5):
     word_counter = Counter()
     for tokens in tqdm(tokenized_sentences, desc="Building vocabulary"):
         word_counter.update(tokens)
-    vocab = {word: idx for idx, word in enumerate(word_counter.keys())}
+    vocab = {word: idx for idx, (word, count) in enumerate(word_counter.most_common()) if count >= min_freq}
     vocab_size = len(vocab)
-    print(f"Vocabulary size: {vocab_size}")
+    print(f"Vocabulary size: {vocab_size} (min_freq={min_freq}, {len(word_counter)} distinct words)")
     
-    # Initialize a sparse co-occurrence matrix in LIL format (efficient for incremental updates)
-    cooc_matrix = lil_matrix((vocab_size, vocab_size), dtype=np.float32)
+    index_lists = ([vocab[token] for token in tokens if token in vocab] for tokens in tokenized_sentences)
+    cooc_matrix = accumulate_cooccurrence(index_lists, vocab_size, window_size, total=len(tokenized_sentences))
+    print(f"Vocabulary and co-occurrence matrix built in {time.perf_counter() - start:.2f} seconds "
+          f"(peak RSS {peak_rss_mb():.0f} MB).")
+    return vocab, cooc_matrix
+
+def build_vocab_and_cooccurrence_from_ids(corpus, window_size=5, min_freq=MIN_FREQ, batch_size=BATCH_SIZE):
+    """
+    Same as build_vocab_and_cooccurrence for a ColumnarCorpus. Frequencies are
+    one bincount over its token ids and the vocabulary filter is a lookup
+    array, so no token strings are hashed.
+    """
+    start = time.perf_counter()
+    counts = corpus.counts()
+    # Stable sort: equal counts keep first-occurrence order, as most_common() does
+    order = np.argsort(-counts, kind="stable")
+    order = order[counts[order] >= min_freq]
+    vocab = {corpus.vocab[i]: idx for idx, i in enumerate(order.tolist())}
+    print(f"Vocabulary size: {len(vocab)} (min_freq={min_freq}, {len(corpus.vocab)} distinct words)")
     
-    # Build the co-occurrence matrix with a sliding window, with progress bar
-    for tokens in tqdm(tokenized_sentences, desc="Building co-occurrence matrix"):
-        indices = [vocab[token] for token in tokens if token in vocab]
-        for i, center in enumerate(indices):
-            start_idx = max(0, i - window_size)
-            end_idx = min(len(indices), i + window_size + 1)
-            for j in range(start_idx, end_idx):
-                if i != j:
-                    cooc_matrix[center, indices[j]] += 1.0
-    print(f"Vocabulary and co-occurrence matrix built in {time.perf_counter() - start:.2f} seconds.")
+    lookup = np.full(len(corpus.vocab), -1, dtype=np.int64)
+    lookup[order] = np.arange(len(order))
+    cooc_matrix = csr_matrix((len(vocab), len(vocab)), dtype=np.float32)
+    for batch_start in tqdm(range(0, len(corpus), batch_size), desc="Building co-occurrence matrix"):
+        batch = corpus[batch_start:batch_start + batch_size]
+        sentence_ids = np.repeat(np.arange(len(batch)), np.diff(batch.offsets))
+        token_ids = lookup[batch.token_ids]
+        kept = token_ids >= 0
+        cooc_matrix += window_cooccurrence(token_ids[kept], sentence_ids[kept], len(vocab), window_size)
+    print(f"Vocabulary and co-occurrence matrix built in {time.perf_counter() - start:.2f} seconds "
+          f"(peak RSS {peak_rss_mb():.0f} MB).")
     return vocab, cooc_matrix
 
 start_time = time.perf_counter()
 print("Processing English corpus...")
-vocab_en, cooc_en = build_vocab_and_cooccurrence(tokenized_sentences, window_size=5)
+if corpus_en is not None:
+    vocab_en, cooc_en = build_vocab_and_cooccurrence_from_ids(corpus_en, window_size=5)
+else:
+    vocab_en, cooc_en = build_vocab_and_cooccurrence(tokenized_sentences, window_size=5)
 print(f"Corpus processed in {time.perf_counter() - start_time:.2f} seconds.")
 
 # ----------------------------
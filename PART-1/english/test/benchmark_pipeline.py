@@ -0,0 +1,359 @@
+"""
+Reproducible benchmark suite for the English embedding pipeline.
+
+Replaces the hand-timed TimeAnalysis.py numbers: every stage of the real
+pipeline (scripts/) is run on a synthetic Zipf-distributed corpus of the
+requested sizes and measured the same way.
+- Stages: tokenization, vocabulary, encoding, co-occurrence per window,
+  normalization per method, SVD per d and evaluation.
+- Per stage: wall time, peak RSS and throughput.
+- Results are written as JSON; with --baseline they are compared against a
+  stored run and regressions beyond --tolerance are reported.
+
+Example:
+    python benchmark_pipeline.py --sizes 10000 100000 300000 --output bench.json
+    python benchmark_pipeline.py --sizes 10000 --baseline bench.json --fail-on-regression
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from columnar_corpus import ColumnarCorpus
+from cooccurrence_builder import CooccurrenceMatrixBuilder
+from matrix_reducer import MatrixReducer
+from tokenizer import GPUTokenizer
+
+
+# ----------------------------
+# Measurement
+# ----------------------------
+def _status_mb(field):
+    """A memory field of /proc/self/status in MB, or None off Linux"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss():
+    """Reset the kernel's peak-RSS mark so the next reading covers one stage only"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    peak = _status_mb("VmHWM")
+    if peak is None:
+        # ru_maxrss is KB on Linux, bytes on macOS, and never resets
+        scale = 1024 ** 2 if sys.platform == "darwin" else 1024
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    return peak
+
+
+def measure(results, corpus_size, stage, params, fn, work=None, unit=None, repeat=1):
+    """Run fn repeat times and append the median wall time, the peak RSS and
+    the throughput to results; returns the value of the last run"""
+    gc.collect()
+    per_stage_peak = reset_peak_rss()
+    rss_start = _status_mb("VmRSS")
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        times.append(time.perf_counter() - start)
+    wall_time = float(np.median(times))
+    work_done = work(value) if callable(work) else work
+    record = {
+        "corpus_size": corpus_size,
+        "stage": stage,
+        "params": params,
+        "wall_time": wall_time,
+        "wall_times": times,
+        "peak_rss_mb": peak_rss_mb(),
+        "rss_start_mb": rss_start,
+        "peak_rss_per_stage": per_stage_peak,
+        "throughput": work_done / wall_time if work_done is not None and wall_time > 0 else None,
+        "throughput_unit": unit
+    }
+    results.append(record)
+    throughput = f", {record['throughput']:.0f} {unit}" if record["throughput"] is not None else ""
+    print(f"[{corpus_size}] {stage} {params}: {wall_time:.3f}s, peak RSS {record['peak_rss_mb']:.0f}MB{throughput}")
+    return value
+
+
+# ----------------------------
+# Synthetic corpus
+# ----------------------------
+def synthetic_corpus(path, n_sentences, vocab_size=50000, zipf_exponent=1.1, seed=42):
+    """Write n_sentences of Zipf-distributed pseudo-words, one sentence per line.
+
+    Words are random lowercase strings (no digits or commas, so cleaning and
+    the CSV reader see ordinary text); sentence lengths are uniform in 5..30.
+    """
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    lengths = rng.integers(3, 11, size=vocab_size)
+    words = ["".join(rng.choice(letters, size=length)) for length in lengths]
+
+    ranks = np.arange(1, vocab_size + 1, dtype=np.float64)
+    probs = ranks ** -zipf_exponent
+    probs /= probs.sum()
+
+    sentence_lengths = rng.integers(5, 31, size=n_sentences)
+    token_ids = rng.choice(vocab_size, size=int(sentence_lengths.sum()), p=probs)
+    bounds = np.concatenate(([0], np.cumsum(sentence_lengths)))
+    with open(path, "w", encoding="utf-8") as f:
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            sentence = " ".join(words[i] for i in token_ids[start:end])
+            f.write(sentence.capitalize() + ".\n")
+
+
+# ----------------------------
+# Pipeline stages
+# ----------------------------
+def benchmark_size(n_sentences, args, work_dir, results):
+    size_dir = work_dir / f"corpus_{n_sentences}"
+    size_dir.mkdir(parents=True, exist_ok=True)
+    log_dir = work_dir / "logs"
+    log_dir.mkdir(exist_ok=True)
+
+    raw_file = size_dir / "sentences.txt"
+    if not raw_file.exists():
+        print(f"Generating {n_sentences} synthetic sentences...")
+        synthetic_corpus(raw_file, n_sentences, args.vocab_size, args.zipf_exponent, args.seed)
+
+    # Tokenization (load, clean, tokenize, save the columnar corpus)
+    tokenizer = GPUTokenizer(model_name=args.model,
+                             log_file=str(log_dir / "tokenizer.log"),
+                             backend=args.backend,
+                             fast_tokenizer=args.fast_tokenizer,
+                             n_process=args.n_process)
+    measure(results, n_sentences, "tokenization",
+            {"model": args.model, "fast": args.fast_tokenizer, "n_process": args.n_process},
+            lambda: tokenizer.process_corpus(str(raw_file), str(size_dir)),
+            work=n_sentences, unit="sentences/s", repeat=args.repeat)
+    del tokenizer
+
+    corpus = ColumnarCorpus.load(size_dir / "tokenized_corpus")
+    builder = CooccurrenceMatrixBuilder(log_file=str(log_dir / "cooccurrence_builder.log"),
+                                        engine=args.backend,
+                                        n_workers=args.workers)
+    vocab = measure(results, n_sentences, "vocabulary", {"min_freq": args.min_freq},
+                    lambda: builder.build_vocabulary(corpus, args.min_freq),
+                    work=corpus.n_tokens, unit="tokens/s", repeat=args.repeat)
+    token_ids, offsets = measure(results, n_sentences, "encoding", {},
+                                 lambda: builder.encode_corpus(corpus, vocab),
+                                 work=corpus.n_tokens, unit="tokens/s", repeat=args.repeat)
+
+    matrices = {}
+    for window_size in args.windows:
+        matrices[window_size] = measure(
+            results, n_sentences, "cooccurrence", {"window": window_size, "normalize": args.normalize},
+            lambda: builder.cooccurrence_from_ids(token_ids, offsets, len(vocab), window_size, args.normalize),
+            work=len(token_ids), unit="tokens/s", repeat=args.repeat)
+
+    reduce_window = args.reduce_window or max(args.windows)
+    matrix = matrices.get(reduce_window)
+    if matrix is None:
+        raise ValueError(f"--reduce-window {reduce_window} is not one of --windows {args.windows}")
+    del matrices
+
+    reducer = MatrixReducer(str(log_dir), backend=args.backend)
+    normalized = {}
+    for norm_method in args.norms:
+        normalized[norm_method] = measure(
+            results, n_sentences, "normalization", {"method": norm_method, "window": reduce_window},
+            lambda: reducer.apply_normalization(reducer.backend.to_device(matrix), norm_method),
+            work=int(matrix.nnz), unit="nnz/s", repeat=args.repeat)
+
+    svd_norm = args.svd_norm if args.svd_norm in normalized else args.norms[0]
+    embeddings = None
+    for d in sorted(args.dims):
+        if d >= min(matrix.shape):
+            print(f"[{n_sentences}] skipping d={d}: matrix is only {matrix.shape}")
+            continue
+        embeddings = measure(
+            results, n_sentences, "svd", {"d": d, "solver": args.svd_solver, "normalization": svd_norm},
+            lambda: reducer.reduce_dimensionality(normalized[svd_norm], d, solver=args.svd_solver),
+            work=matrix.shape[0], unit="rows/s", repeat=args.repeat)
+    del normalized
+
+    if embeddings is not None and not args.skip_evaluation:
+        run_evaluation(n_sentences, embeddings, vocab, args, log_dir, results)
+
+
+def run_evaluation(n_sentences, embeddings, vocab, args, log_dir, results):
+    """Time analogy and clustering evaluation on the largest embeddings"""
+    from enhanced_evaluation import EnhancedEmbeddingEvaluator
+
+    evaluator = EnhancedEmbeddingEvaluator(str(log_dir))
+    # Synthetic words carry no semantics; these only exercise the code path
+    words = list(vocab)[:4 * args.analogies]
+    analogies = [tuple(words[i:i + 4]) for i in range(0, len(words) - 3, 4)]
+    params = {"d": embeddings.shape[1], "analogies": len(analogies), "clusters": args.clusters}
+
+    def evaluate():
+        evaluator.evaluate_analogies(embeddings, vocab, analogies)
+        evaluator.evaluate_clustering(embeddings, n_clusters=args.clusters)
+
+    measure(results, n_sentences, "evaluation", params, evaluate,
+            work=embeddings.shape[0], unit="words/s", repeat=args.repeat)
+
+
+# ----------------------------
+# Baseline comparison
+# ----------------------------
+def record_key(record):
+    return (record["corpus_size"], record["stage"], json.dumps(record["params"], sort_keys=True))
+
+
+def compare_to_baseline(results, baseline, tolerance, min_delta):
+    """Wall time and peak RSS of every stage relative to the baseline run.
+
+    A stage regresses when it is more than tolerance slower and at least
+    min_delta seconds slower (so millisecond stages do not flag on noise).
+    """
+    baseline_records = {record_key(record): record for record in baseline["results"]}
+    comparison = []
+    for record in results:
+        reference = baseline_records.get(record_key(record))
+        entry = {
+            "corpus_size": record["corpus_size"],
+            "stage": record["stage"],
+            "params": record["params"],
+            "wall_time": record["wall_time"],
+        }
+        if reference is None:
+            entry["status"] = "new"
+        else:
+            ratio = record["wall_time"] / reference["wall_time"] if reference["wall_time"] > 0 else float("inf")
+            delta = record["wall_time"] - reference["wall_time"]
+            if ratio > 1 + tolerance and delta > min_delta:
+                status = "regression"
+            elif ratio < 1 / (1 + tolerance) and -delta > min_delta:
+                status = "improvement"
+            else:
+                status = "ok"
+            entry.update({
+                "baseline_wall_time": reference["wall_time"],
+                "time_ratio": ratio,
+                "baseline_peak_rss_mb": reference["peak_rss_mb"],
+                "rss_ratio": (record["peak_rss_mb"] / reference["peak_rss_mb"]
+                              if reference.get("peak_rss_mb") else None),
+                "status": status
+            })
+        comparison.append(entry)
+    return comparison
+
+
+def print_comparison(comparison):
+    print(f"\n{'size':>8}  {'stage':<14} {'params':<56} {'time':>9} {'baseline':>9} {'ratio':>6}  status")
+    for entry in comparison:
+        params = json.dumps(entry["params"], sort_keys=True)[:56]
+        baseline = f"{entry['baseline_wall_time']:.3f}" if "baseline_wall_time" in entry else "-"
+        ratio = f"{entry['time_ratio']:.2f}" if "time_ratio" in entry else "-"
+        print(f"{entry['corpus_size']:>8}  {entry['stage']:<14} {params:<56} "
+              f"{entry['wall_time']:>9.3f} {baseline:>9} {ratio:>6}  {entry['status']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the English embedding pipeline on synthetic corpora")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000],
+                        help="Corpus sizes in sentences (e.g. 10000 100000 300000)")
+    parser.add_argument("--vocab-size", type=int, default=50000, help="Distinct synthetic words")
+    parser.add_argument("--zipf-exponent", type=float, default=1.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--model", default="en_core_web_sm",
+                        help="spaCy model for tokenization ('blank:en' needs no download)")
+    parser.add_argument("--fast-tokenizer", action="store_true", help="Tokenizer-only spaCy pipeline")
+    parser.add_argument("--n-process", type=int, default=1, help="spaCy worker processes")
+    parser.add_argument("--backend", default="auto", choices=["auto", "cpu", "gpu"])
+    parser.add_argument("--workers", type=int, default=1, help="Co-occurrence counting workers")
+    parser.add_argument("--min-freq", type=int, default=5)
+    parser.add_argument("--windows", type=int, nargs="+", default=[2, 4, 6, 8, 10])
+    parser.add_argument("--normalize", action="store_true", help="Distance-weighted, row-normalized matrices")
+    parser.add_argument("--reduce-window", type=int, default=None,
+                        help="Window whose matrix is normalized and reduced (default: largest)")
+    parser.add_argument("--norms", nargs="+", default=["ppmi", "tfidf", "row_normalize"])
+    parser.add_argument("--svd-norm", default="ppmi", help="Normalization whose matrix is reduced")
+    parser.add_argument("--svd-solver", default="arpack", choices=MatrixReducer.SVD_SOLVERS)
+    parser.add_argument("--dims", type=int, nargs="+", default=[50, 100, 200, 300])
+    parser.add_argument("--analogies", type=int, default=100, help="Synthetic analogy questions")
+    parser.add_argument("--clusters", type=int, default=10)
+    parser.add_argument("--skip-evaluation", action="store_true")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Runs per stage; the median wall time is reported")
+    parser.add_argument("--work-dir", default=None,
+                        help="Where corpora and intermediate files go (default: a temporary directory)")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=None, help="Earlier --output file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Relative slowdown that counts as a regression")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="Absolute slowdown in seconds below which no regression is reported")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit with status 1 when any stage regressed")
+    args = parser.parse_args()
+
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix="pipeline_bench_"))
+    work_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Working directory: {work_dir}")
+
+    results = []
+    for n_sentences in args.sizes:
+        benchmark_size(n_sentences, args, work_dir, results)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args)
+        },
+        "results": results
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        comparison = compare_to_baseline(results, baseline, args.tolerance, args.min_delta)
+        report["comparison"] = {"baseline": args.baseline, "tolerance": args.tolerance, "stages": comparison}
+        print_comparison(comparison)
+        regressions = [entry for entry in comparison if entry["status"] == "regression"]
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+    if regressions:
+        print(f"{len(regressions)} stage(s) regressed beyond {args.tolerance:.0%}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
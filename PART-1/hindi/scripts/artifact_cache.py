@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class ArtifactCache:
+    """Content-addressed store for pipeline stage outputs.
+
+    A cache key is the SHA-256 of the stage name, the content hashes of the
+    stage inputs and the stage parameters, so changing any of them yields a
+    new key while unchanged upstream stages keep hitting. Entries live in
+    cache_dir/<key>/ and are evicted least-recently-used first once the
+    store grows past budget_gb. With force=True every lookup misses, but
+    fresh results are still stored.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: str = ".artifact_cache", budget_gb: float = 20.0, force: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.budget_bytes = int(budget_gb * 1024**3)
+        self.force = force
+        self.index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Any]:
+        index_file = self.cache_dir / self.INDEX_FILE
+        if index_file.exists():
+            with open(index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {"entries": {}, "hashes": {}}
+
+    def _save_index(self) -> None:
+        index_file = self.cache_dir / self.INDEX_FILE
+        tmp_file = index_file.with_name(index_file.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, index_file)
+
+    def file_hash(self, path: str) -> str:
+        """SHA-256 of a file, memoized on (size, mtime) so large inputs are hashed once.
+
+        A directory (e.g. a columnar corpus) hashes to the digest of its
+        files' names and hashes.
+        """
+        path = Path(path).resolve()
+        if path.is_dir():
+            digest = hashlib.sha256()
+            for child in sorted(child for child in path.iterdir() if child.is_file()):
+                digest.update(child.name.encode("utf-8"))
+                digest.update(self.file_hash(str(child)).encode("utf-8"))
+            return digest.hexdigest()
+        stat = path.stat()
+        memo = self.index["hashes"].get(str(path))
+        if memo and memo["size"] == stat.st_size and memo["mtime_ns"] == stat.st_mtime_ns:
+            return memo["sha256"]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self.index["hashes"][str(path)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest.hexdigest()
+        }
+        self._save_index()
+        return digest.hexdigest()
+
+    def key(self, stage: str, inputs: List[str], params: Dict[str, Any]) -> str:
+        """Cache key for a stage run on the given input files with the given parameters"""
+        description = {
+            "stage": stage,
+            "inputs": [self.file_hash(path) for path in inputs],
+            "params": params
+        }
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Directory holding the cached files for key, or None on a miss"""
+        entry = self.index["entries"].get(key)
+        entry_dir = self.cache_dir / key
+        if self.force or entry is None or not entry_dir.is_dir():
+            return None
+        entry["last_used"] = time.time()
+        self._save_index()
+        return entry_dir
+
+    def fetch(self, key: str, outputs: List[str]) -> bool:
+        """Copy the cached files for key to the output paths; False on a miss"""
+        entry_dir = self.lookup(key)
+        if entry_dir is None:
+            return False
+        cached = [entry_dir / Path(output).name for output in outputs]
+        if not all(path.exists() for path in cached):
+            return False
+        for source, output in zip(cached, outputs):
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+            # Copy rather than link: stages rewrite their outputs in place
+            shutil.copy2(source, output)
+        return True
+
+    def meta(self, key: str) -> Optional[Dict[str, Any]]:
+        """JSON metadata recorded with an entry (e.g. a stage's results summary)"""
+        entry = self.index["entries"].get(key)
+        return entry.get("meta") if entry else None
+
+    def store(self,
+              key: str,
+              outputs: List[str],
+              stage: str = "",
+              move: bool = False,
+              meta: Optional[Dict[str, Any]] = None) -> None:
+        """Add stage outputs under key, then evict old entries beyond the budget"""
+        entry_dir = self.cache_dir / key
+        tmp_dir = self.cache_dir / f"{key}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        for output in outputs:
+            if move:
+                shutil.move(str(output), tmp_dir / Path(output).name)
+            else:
+                shutil.copy2(output, tmp_dir / Path(output).name)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, entry_dir)
+
+        self.index["entries"][key] = {
+            "stage": stage,
+            "files": [Path(output).name for output in outputs],
+            "size": sum(path.stat().st_size for path in entry_dir.iterdir()),
+            "last_used": time.time(),
+            "meta": meta
+        }
+        self.evict(keep=key)
+        self._save_index()
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        """Drop least-recently-used entries until the store fits the disk budget"""
+        entries = self.index["entries"]
+        total = sum(entry["size"] for entry in entries.values())
+        evicted = []
+        for key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+            if total <= self.budget_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entries[key]["size"]
+            shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+            evicted.append(key)
+        for key in evicted:
+            del entries[key]
+        return evicted
+
+    def size_bytes(self) -> int:
+        return sum(entry["size"] for entry in self.index["entries"].values())
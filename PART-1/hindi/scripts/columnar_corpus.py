@@ -0,0 +1,122 @@
+import json
+import os
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Union
+
+import numpy as np
+
+
+class ColumnarCorpus:
+    """Tokenized corpus stored as a vocabulary table plus two flat arrays.
+
+    token_ids holds the uint32 vocabulary index of every token of every
+    sentence back to back; sentence i is token_ids[offsets[i]:offsets[i + 1]].
+    On disk a corpus is a directory with vocab.json, token_ids.npy and
+    offsets.npy, so loading it is a JSON read plus two memory maps instead of
+    unpickling millions of Python strings. The vocabulary table lists words
+    in order of first occurrence, which keeps frequency ties in the same
+    order as counting the token lists directly.
+    """
+
+    VOCAB_FILE = "vocab.json"
+    TOKEN_IDS_FILE = "token_ids.npy"
+    OFFSETS_FILE = "offsets.npy"
+    FILES = (VOCAB_FILE, TOKEN_IDS_FILE, OFFSETS_FILE)
+
+    def __init__(self, vocab: List[str], token_ids: np.ndarray, offsets: np.ndarray):
+        self.vocab = vocab
+        self.token_ids = token_ids
+        self.offsets = offsets
+
+    @classmethod
+    def from_sentences(cls, tokenized_sentences: Iterable[List[str]]) -> "ColumnarCorpus":
+        """Encode token lists; the input is consumed once, so a generator works"""
+        index: Dict[str, int] = {}
+        token_ids = array('I')
+        offsets = array('q', [0])
+        for sentence in tokenized_sentences:
+            for token in sentence:
+                token_id = index.get(token)
+                if token_id is None:
+                    token_id = index[token] = len(index)
+                token_ids.append(token_id)
+            offsets.append(len(token_ids))
+        return cls(list(index),
+                   np.frombuffer(token_ids, dtype=np.uint32) if token_ids else np.zeros(0, dtype=np.uint32),
+                   np.frombuffer(offsets, dtype=np.int64))
+
+    @classmethod
+    def is_corpus(cls, path: Union[str, Path]) -> bool:
+        path = Path(path)
+        return path.is_dir() and all((path / name).exists() for name in cls.FILES)
+
+    @classmethod
+    def files(cls, directory: Union[str, Path]) -> List[str]:
+        """Paths of the files making up a saved corpus"""
+        return [str(Path(directory) / name) for name in cls.FILES]
+
+    def save(self, directory: Union[str, Path]) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        # Arrays first and the vocabulary last, each via os.replace, so a
+        # crashed save never leaves a table that looks complete
+        for name, values in ((self.TOKEN_IDS_FILE, np.asarray(self.token_ids, dtype=np.uint32)),
+                             (self.OFFSETS_FILE, np.asarray(self.offsets, dtype=np.int64))):
+            tmp_file = directory / f"{name}.tmp"
+            with open(tmp_file, 'wb') as f:
+                np.save(f, values)
+            os.replace(tmp_file, directory / name)
+        tmp_file = directory / f"{self.VOCAB_FILE}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.vocab, f, ensure_ascii=False)
+        os.replace(tmp_file, directory / self.VOCAB_FILE)
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap: bool = True) -> "ColumnarCorpus":
+        """Open a saved corpus; with mmap=True the arrays are read-only memory maps"""
+        directory = Path(directory)
+        mmap_mode = 'r' if mmap else None
+        with open(directory / cls.VOCAB_FILE, 'r', encoding='utf-8') as f:
+            vocab = json.load(f)
+        token_ids = np.load(directory / cls.TOKEN_IDS_FILE, mmap_mode=mmap_mode)
+        offsets = np.load(directory / cls.OFFSETS_FILE, mmap_mode=mmap_mode)
+        return cls(vocab, token_ids, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def n_tokens(self) -> int:
+        return int(self.offsets[-1])
+
+    def sentence(self, i: int) -> List[str]:
+        return [self.vocab[token_id] for token_id in self.token_ids[self.offsets[i]:self.offsets[i + 1]]]
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[List[str], "ColumnarCorpus"]:
+        """A sentence, or for a slice a sub-corpus sharing the vocabulary and
+        viewing (not copying) the token ids, so shards of a memory-mapped
+        corpus stay on disk until used"""
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("ColumnarCorpus slices must be contiguous")
+            stop = max(start, stop)
+            token_ids = self.token_ids[self.offsets[start]:self.offsets[stop]]
+            offsets = np.asarray(self.offsets[start:stop + 1]) - self.offsets[start]
+            return ColumnarCorpus(self.vocab, token_ids, offsets)
+        return self.sentence(key)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for i in range(len(self)):
+            yield self.sentence(i)
+
+    def to_sentences(self) -> List[List[str]]:
+        """Materialize the nested token lists (for code paths that need strings)"""
+        tokens = np.asarray(self.vocab, dtype=object)[self.token_ids].tolist()
+        offsets = self.offsets.tolist()
+        return [tokens[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def counts(self) -> np.ndarray:
+        """Corpus frequency of every vocabulary-table entry"""
+        return np.bincount(self.token_ids, minlength=len(self.vocab))
@@ -1,33 +1,89 @@
 import numpy as np
-import cupy as cp
-from cupyx.scipy.sparse import csr_matrix as cp_csr_matrix
-from scipy.sparse import save_npz, csr_matrix
+from scipy.sparse import csr_matrix
 import pickle
 from pathlib import Path
 import time
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 import logging
 from tqdm import tqdm
 from colorama import Fore, Style, init
 import json
+import os
 import sys
+import argparse
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from itertools import chain, repeat
+
+from array_backend import ArrayBackend, gpu_available
+from artifact_cache import ArtifactCache
+from columnar_corpus import ColumnarCorpus
+from sparse_io import load_csr, save_csr
 
 # Initialize colorama
 init()
 
+def _count_partition(ids_name: str,
+                     n_tokens: int,
+                     offsets_name: str,
+                     n_offsets: int,
+                     first_sentence: int,
+                     last_sentence: int,
+                     max_k: int,
+                     vocab_size: int,
+                     symmetric: bool,
+                     by_distance: bool) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Worker: pair counts for a contiguous block of sentences.
+
+    The encoded corpus is read from shared memory, so only the block bounds
+    travel with the task.
+    """
+    ids_shm = shared_memory.SharedMemory(name=ids_name)
+    offsets_shm = shared_memory.SharedMemory(name=offsets_name)
+    try:
+        token_ids = np.ndarray((n_tokens,), dtype=np.int32, buffer=ids_shm.buf)
+        offsets = np.ndarray((n_offsets,), dtype=np.int64, buffer=offsets_shm.buf)
+        block_offsets = offsets[first_sentence:last_sentence + 1]
+        block_ids = np.array(token_ids[block_offsets[0]:block_offsets[-1]])
+        return HindiCooccurrenceMatrixBuilder._count_block(block_ids, block_offsets - block_offsets[0], vocab_size,
+                                max_k, symmetric, by_distance)
+    finally:
+        ids_shm.close()
+        offsets_shm.close()
+
 class HindiCooccurrenceMatrixBuilder:
     """Builds co-occurrence matrices for Hindi text with GPU acceleration and different window sizes"""
     
-    def __init__(self, log_file: str = "hindi_cooccurrence_builder.log"):
+    # Smallest per-run window (in pairs) read by a merge block; with more runs
+    # than the memory budget allows at this size, runs are merged in groups first
+    MERGE_MIN_WINDOW_PAIRS = 4096
+
+    # State kept next to the matrices by process_incremental
+    INCREMENTAL_DIR = ".incremental"
+    
+    def __init__(self, log_file: str = "hindi_cooccurrence_builder.log", engine: str = "auto", n_workers: int = 1):
+        if engine == "auto":
+            engine = "gpu" if gpu_available() else "cpu"
+        if engine not in ("gpu", "cpu"):
+            raise ValueError(f"Unknown engine: {engine}")
+        if n_workers < 1:
+            raise ValueError(f"n_workers must be at least 1, got {n_workers}")
+        self.engine = engine
+        # CuPy is only imported for the GPU engine
+        self.backend = ArrayBackend(engine)
+        # Worker processes used by the NumPy counting paths (CPU engine and single pass)
+        self.n_workers = n_workers
         self.setup_logging(log_file)
-        self._check_gpu()
+        if self.engine == "gpu":
+            self._check_gpu()
         
     def _check_gpu(self) -> None:
         """Check GPU availability and memory"""
         try:
-            mem_info = cp.cuda.runtime.memGetInfo()
-            free_memory = mem_info[0] / 1024**3  # Convert to GB
-            total_memory = mem_info[1] / 1024**3
+            free_memory, total_memory = self.backend.memory_info()  # In GB
             self.logger.info(f"{Fore.GREEN}GPU Memory: {free_memory:.2f}GB free / {total_memory:.2f}GB total{Style.RESET_ALL}")
         except Exception as e:
             self.logger.error(f"{Fore.RED}GPU check failed: {str(e)}{Style.RESET_ALL}")
@@ -54,7 +110,16 @@ class HindiCooccurrenceMatrixBuilder:
         self.logger.addHandler(fh)
         self.logger.addHandler(ch)
 
-    def build_vocabulary(self, tokenized_sentences: List[List[str]], 
+    @staticmethod
+    def load_tokenized_corpus(input_file: str) -> Union[ColumnarCorpus, List[List[str]]]:
+        """Load a tokenized corpus: a columnar corpus directory (memory-mapped)
+        or a pickled list of token lists"""
+        if ColumnarCorpus.is_corpus(input_file):
+            return ColumnarCorpus.load(input_file)
+        with open(input_file, 'rb') as f:
+            return pickle.load(f)
+
+    def build_vocabulary(self, tokenized_sentences: Union[ColumnarCorpus, List[List[str]]], 
                         min_freq: int = 3) -> Dict[str, int]:  # Lower min_freq for Hindi
         """Build vocabulary from tokenized Hindi sentences with minimum frequency threshold"""
         try:
@@ -62,11 +127,18 @@ class HindiCooccurrenceMatrixBuilder:
             
             # Count word frequencies
             self.logger.info(f"{Fore.CYAN}Counting Hindi word frequencies...{Style.RESET_ALL}")
-            for sentence in tqdm(tokenized_sentences, desc="Building Hindi vocabulary"):
-                for token in sentence:
-                    # Verify token is in Devanagari script
-                    if any('\u0900' <= char <= '\u097F' for char in token):
-                        word_freq[token] = word_freq.get(token, 0) + 1
+            if isinstance(tokenized_sentences, ColumnarCorpus):
+                # One bincount, then the script check once per distinct word; the
+                # table is in first-occurrence order, so ties sort as below
+                counts = tokenized_sentences.counts().tolist()
+                word_freq = {word: freq for word, freq in zip(tokenized_sentences.vocab, counts)
+                             if freq > 0 and any('\u0900' <= char <= '\u097F' for char in word)}
+            else:
+                for sentence in tqdm(tokenized_sentences, desc="Building Hindi vocabulary"):
+                    for token in sentence:
+                        # Verify token is in Devanagari script
+                        if any('\u0900' <= char <= '\u097F' for char in token):
+                            word_freq[token] = word_freq.get(token, 0) + 1
             
             # Filter by minimum frequency and sort by frequency
             sorted_words = sorted(
@@ -88,13 +160,581 @@ class HindiCooccurrenceMatrixBuilder:
             self.logger.error(f"{Fore.RED}Hindi vocabulary building failed: {str(e)}{Style.RESET_ALL}")
             raise
 
-    def build_cooccurrence_matrix(self, 
-                                tokenized_sentences: List[List[str]],
+    def encode_corpus(self,
+                      tokenized_sentences: Union[ColumnarCorpus, List[List[str]]],
+                      vocab: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Encode the corpus as one flat int32 token-id array plus int64 sentence offsets.
+
+        Unknown words are dropped before encoding, so positions inside a sentence
+        match the filtered index lists used by the GPU engine. The vocabulary only
+        holds Devanagari tokens, so this also applies the script filter.
+        """
+        try:
+            self.logger.info(f"{Fore.CYAN}Encoding Hindi corpus to token ids...{Style.RESET_ALL}")
+            return self._encode_sentences(tokenized_sentences, vocab)
+
+        except Exception as e:
+            self.logger.error(f"{Fore.RED}Hindi corpus encoding failed: {str(e)}{Style.RESET_ALL}")
+            raise
+
+    @staticmethod
+    def _encode_sentences(tokenized_sentences: Union[ColumnarCorpus, List[List[str]]],
+                          vocab: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Token ids and sentence offsets for a list of sentences, unknown words dropped"""
+        if isinstance(tokenized_sentences, ColumnarCorpus):
+            return HindiCooccurrenceMatrixBuilder._encode_columnar(tokenized_sentences, vocab)
+        raw_offsets = np.zeros(len(tokenized_sentences) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, tokenized_sentences), dtype=np.int64, count=len(tokenized_sentences)),
+                  out=raw_offsets[1:])
+        # map() keeps the per-token dict lookup in C; a generator expression
+        # around vocab.get costs an extra Python frame per token
+        raw_ids = np.fromiter(map(vocab.get, chain.from_iterable(tokenized_sentences), repeat(-1)),
+                              dtype=np.int32, count=int(raw_offsets[-1]))
+
+        # Drop unknown words; new offsets are the running count of kept tokens
+        known = raw_ids >= 0
+        kept = np.zeros(len(known) + 1, dtype=np.int64)
+        np.cumsum(known, out=kept[1:])
+        return raw_ids[known], kept[raw_offsets]
+
+    @staticmethod
+    def _encode_columnar(corpus: ColumnarCorpus,
+                         vocab: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Remap a columnar corpus to vocab ids without touching its tokens as strings.
+
+        Only the corpus vocabulary table is looked up; the token ids go through
+        a lookup array, and the new offsets are the running count of kept
+        tokens sampled at the old offsets.
+        """
+        lookup = np.fromiter((vocab.get(word, -1) for word in corpus.vocab),
+                             dtype=np.int32, count=len(corpus.vocab))
+        raw_ids = lookup[corpus.token_ids]
+        known = raw_ids >= 0
+        kept = np.zeros(len(known) + 1, dtype=np.int64)
+        np.cumsum(known, out=kept[1:])
+        return raw_ids[known], kept[corpus.offsets]
+
+    @staticmethod
+    def _pair_keys(token_ids: np.ndarray,
+                   sentence_ids: np.ndarray,
+                   k: int,
+                   vocab_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Unique (left, right) pair keys at distance k and their counts.
+
+        Pairs are the token array against itself shifted by k, masked to tokens
+        of the same sentence, and encoded as left * vocab_size + right so that a
+        single integer sort groups duplicates.
+        """
+        same_sentence = sentence_ids[:-k] == sentence_ids[k:]
+        keys = token_ids[:-k][same_sentence].astype(np.int64) * vocab_size + token_ids[k:][same_sentence]
+        if len(keys) == 0:
+            return keys, np.zeros(0, dtype=np.int64)
+        keys.sort()
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        counts = np.diff(np.append(starts, len(keys)))
+        return keys[starts], counts
+
+    @staticmethod
+    def _window_keys(token_ids: np.ndarray,
+                     offsets: np.ndarray,
+                     vocab_size: int,
+                     max_k: int,
+                     symmetric: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Unsorted pair keys of every distance 1..max_k, laid out distance by distance.
+
+        The keys at distance k are keys[bounds[k - 1]:bounds[k]]. A key is
+        left * vocab_size + right, or min * vocab_size + max with symmetric=True
+        so that both orders of a pair share one key. Sentences are grouped by
+        length: a group of n sentences of length L is an n x L array whose pairs
+        at distance k are two column slices, so no same-sentence mask or boolean
+        gather is needed. Keys are uint32 whenever vocab_size ** 2 fits, which
+        halves the bytes moved by the sort.
+        """
+        key_dtype = np.uint32 if vocab_size * vocab_size <= 2 ** 32 else np.int64
+        lengths = np.diff(offsets)
+        group_lengths, group_sizes = np.unique(lengths[lengths > 1], return_counts=True)
+
+        # A sentence of length L has L - k pairs at distance k
+        distances = np.arange(1, max_k + 1)
+        per_distance = np.clip(group_lengths[None, :] - distances[:, None], 0, None) @ group_sizes
+        bounds = np.zeros(max_k + 1, dtype=np.int64)
+        np.cumsum(per_distance, out=bounds[1:])
+        keys = np.empty(int(bounds[-1]), dtype=key_dtype)
+        filled = bounds[:-1].tolist()
+
+        right = token_ids.astype(key_dtype)
+        left = right * key_dtype(vocab_size)
+        order = np.argsort(lengths, kind='stable')
+        group_starts = np.searchsorted(lengths[order], group_lengths)
+        for length, start, size in zip(group_lengths.tolist(), group_starts.tolist(), group_sizes.tolist()):
+            positions = offsets[order[start:start + size]][:, None] + np.arange(length)
+            group_left, group_right = left[positions], right[positions]
+            for k in range(1, min(max_k, length - 1) + 1):
+                out = keys[filled[k - 1]:filled[k - 1] + size * (length - k)].reshape(size, length - k)
+                if symmetric:
+                    np.minimum(group_left[:, :-k], group_left[:, k:], out=out)
+                    out += np.maximum(group_right[:, :-k], group_right[:, k:])
+                else:
+                    np.add(group_left[:, :-k], group_right[:, k:], out=out)
+                filled[k - 1] += out.size
+        return keys, bounds
+
+    @classmethod
+    def _count_block(cls,
+                     token_ids: np.ndarray,
+                     offsets: np.ndarray,
+                     vocab_size: int,
+                     max_k: int,
+                     symmetric: bool = False,
+                     by_distance: bool = True) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Sorted unique pair keys and integer counts, one entry per distance
+        or, with by_distance=False, a single entry over all distances"""
+        keys, bounds = cls._window_keys(token_ids, offsets, vocab_size, max_k, symmetric)
+        spans = zip(bounds[:-1].tolist(), bounds[1:].tolist()) if by_distance else [(0, len(keys))]
+        counted = []
+        for start, end in spans:
+            span_keys = keys[start:end]
+            if len(span_keys) == 0:
+                counted.append((span_keys, np.zeros(0, dtype=np.int64)))
+                continue
+            # Sorts the shared buffer in place, one span at a time
+            span_keys.sort()
+            starts = np.flatnonzero(np.concatenate(([True], span_keys[1:] != span_keys[:-1])))
+            counted.append((span_keys[starts], np.diff(np.append(starts, len(span_keys)))))
+        return counted
+
+    @staticmethod
+    def _reduce_keys(keys: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Sort pair keys and sum the weights of duplicates"""
+        if len(keys) == 0:
+            return keys, weights
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        weights = weights[order]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        return keys[starts], np.add.reduceat(weights, starts)
+
+    @staticmethod
+    def _sorted_keys_to_csr(keys: np.ndarray,
+                            data: np.ndarray,
+                            vocab_size: int) -> csr_matrix:
+        """CSR matrix from strictly increasing pair keys, built without sorting"""
+        # Keys are sorted by row then column, so CSR can be built directly
+        rows = keys // vocab_size
+        indptr = np.zeros(vocab_size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=vocab_size), out=indptr[1:])
+        return csr_matrix((data, (keys % vocab_size).astype(np.int32), indptr),
+                          shape=(vocab_size, vocab_size))
+
+    @classmethod
+    def _keys_to_csr(cls,
+                     keys: np.ndarray,
+                     weights: np.ndarray,
+                     vocab_size: int) -> csr_matrix:
+        """Reduce (possibly repeated) pair keys with weights into a CSR matrix"""
+        if len(keys) == 0:
+            return csr_matrix((vocab_size, vocab_size), dtype=np.float64)
+        keys, data = cls._reduce_keys(keys, weights)
+        return cls._sorted_keys_to_csr(keys, data, vocab_size)
+
+    def distance_counts(self,
+                        token_ids: np.ndarray,
+                        offsets: np.ndarray,
+                        vocab_size: int,
+                        max_k: int,
+                        symmetric: bool = False,
+                        by_distance: bool = True) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Unique one-sided pair keys and integer counts for each distance 1..max_k.
+
+        symmetric=True keys each unordered pair as min * vocab_size + max, and
+        by_distance=False returns a single entry summed over all distances
+        (see _count_block). With n_workers > 1 the sentences are split into
+        token-balanced blocks counted by a process pool; the corpus arrays are
+        placed in shared memory instead of being pickled per task. Partial
+        counts are integers, so the merged result is bit-identical to the
+        serial one.
+        """
+        if self.n_workers == 1 or len(offsets) < 3:
+            return self._count_block(token_ids, offsets, vocab_size, max_k, symmetric, by_distance)
+
+        # Token-balanced sentence blocks, a few per worker for load balancing
+        n_blocks = min(self.n_workers * 4, len(offsets) - 1)
+        targets = np.linspace(0, offsets[-1], n_blocks + 1)
+        bounds = np.unique(np.searchsorted(offsets, targets, side='left'))
+        bounds[0], bounds[-1] = 0, len(offsets) - 1
+        bounds = np.unique(bounds)
+
+        token_ids = np.ascontiguousarray(token_ids, dtype=np.int32)
+        offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+        ids_shm = shared_memory.SharedMemory(create=True, size=max(token_ids.nbytes, 1))
+        offsets_shm = shared_memory.SharedMemory(create=True, size=offsets.nbytes)
+        try:
+            np.ndarray(token_ids.shape, dtype=np.int32, buffer=ids_shm.buf)[:] = token_ids
+            np.ndarray(offsets.shape, dtype=np.int64, buffer=offsets_shm.buf)[:] = offsets
+
+            partials = [[] for _ in range(max_k if by_distance else 1)]
+            with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                futures = [pool.submit(_count_partition, ids_shm.name, len(token_ids),
+                                       offsets_shm.name, len(offsets),
+                                       int(first), int(last), max_k, vocab_size,
+                                       symmetric, by_distance)
+                           for first, last in zip(bounds[:-1], bounds[1:])]
+                for future in tqdm(futures, desc="Counting blocks"):
+                    for j, partial in enumerate(future.result()):
+                        partials[j].append(partial)
+        finally:
+            ids_shm.close()
+            ids_shm.unlink()
+            offsets_shm.close()
+            offsets_shm.unlink()
+
+        merged = []
+        for block_counts in partials:
+            keys = np.concatenate([keys for keys, _ in block_counts])
+            counts = np.concatenate([counts for _, counts in block_counts])
+            merged.append(self._reduce_keys(keys, counts))
+        return merged
+
+    def cooccurrence_from_ids(self,
+                              token_ids: np.ndarray,
+                              offsets: np.ndarray,
+                              vocab_size: int,
+                              window_size: int,
+                              normalize: bool = False,
+                              distance_weighting: bool = True) -> csr_matrix:
+        """Build co-occurrence matrix on the CPU from an encoded corpus.
+
+        Every offset k in 1..window_size contributes its (left, right) pairs
+        with weight 1/k (or 1 without distance weighting). Since the window is symmetric the full matrix
+        is the one-sided counts plus their transpose.
+        """
+        try:
+            self.logger.info(f"{Fore.CYAN}Building Hindi co-occurrence matrix with window size {window_size} (CPU)...{Style.RESET_ALL}")
+
+            if len(token_ids) < 2:
+                raise ValueError("No valid Hindi co-occurrences found in the corpus")
+
+            # Both orders of a pair share one key, so the counts form the upper
+            # triangle. Weighted distances are kept apart and added as CSR
+            # matrices, whose rows are already sorted; unweighted, every
+            # distance counts the same and all keys are sorted at once
+            upper = None
+            max_k = min(window_size, len(token_ids) - 1)
+            counted = self.distance_counts(token_ids, offsets, vocab_size, max_k,
+                                           symmetric=True, by_distance=distance_weighting)
+            for k, (pair_keys, counts) in enumerate(counted, start=1):
+                # Apply distance weighting if enabled
+                weights = counts * (1.0 / k) if distance_weighting else counts.astype(np.float64)
+                distance_matrix = self._sorted_keys_to_csr(pair_keys, weights, vocab_size)
+                upper = distance_matrix if upper is None else upper + distance_matrix
+
+            if upper.nnz == 0:
+                raise ValueError("No valid Hindi co-occurrences found in the corpus")
+
+            # The diagonal is on both sides, so a word next to itself counts twice
+            matrix = (upper + upper.T).tocsr()
+
+            if normalize:
+                # Normalize by row sums, scaling the CSR data in place
+                row_sums = np.asarray(matrix.sum(axis=1)).flatten()
+                row_sums[row_sums == 0] = 1  # Avoid division by zero
+                matrix.data *= np.repeat(1 / row_sums, np.diff(matrix.indptr))
+
+            # Only the data changes type; the index arrays are reused, not copied
+            matrix = csr_matrix((matrix.data.astype(np.float32), matrix.indices, matrix.indptr),
+                                shape=matrix.shape)
+            self.logger.info(f"{Fore.GREEN}Hindi matrix shape: {matrix.shape}, Non-zero elements: {matrix.nnz}{Style.RESET_ALL}")
+            return matrix
+
+        except Exception as e:
+            self.logger.error(f"{Fore.RED}Hindi co-occurrence matrix building failed: {str(e)}{Style.RESET_ALL}")
+            raise
+
+    def distance_binned_matrices(self,
+                                 token_ids: np.ndarray,
+                                 offsets: np.ndarray,
+                                 vocab_size: int,
+                                 max_window: int) -> List[csr_matrix]:
+        """Count one-sided co-occurrences binned by distance in a single pass.
+
+        Entry k-1 of the returned list holds the unweighted (left, right) counts
+        of pairs exactly k tokens apart, for k in 1..max_window.
+        """
+        try:
+            self.logger.info(f"{Fore.CYAN}Counting Hindi co-occurrences by distance up to {max_window}...{Style.RESET_ALL}")
+
+            bins = []
+            for pair_keys, counts in self.distance_counts(token_ids, offsets, vocab_size, max_window):
+                bins.append(self._sorted_keys_to_csr(pair_keys, counts.astype(np.float64), vocab_size))
+            return bins
+
+        except Exception as e:
+            self.logger.error(f"{Fore.RED}Distance binning failed: {str(e)}{Style.RESET_ALL}")
+            raise
+
+    def cumulative_window_matrices(self,
+                                   bins: List[csr_matrix],
+                                   window_sizes: List[int],
+                                   normalize: bool = False,
+                                   distance_weighting: bool = True) -> Dict[int, csr_matrix]:
+        """Derive every requested window matrix as a cumulative sum of distance bins"""
+        try:
+            matrices = {}
+            wanted = set(window_sizes)
+            running = None
+            for k, bin_matrix in enumerate(bins, start=1):
+                # Apply distance weighting if enabled
+                weighted = bin_matrix * (1.0 / k) if distance_weighting else bin_matrix
+                running = weighted if running is None else running + weighted
+                if k not in wanted:
+                    continue
+
+                matrix = (running + running.T).tocsr()
+                if matrix.nnz == 0:
+                    raise ValueError("No valid Hindi co-occurrences found in the corpus")
+                if normalize:
+                    # Normalize by row sums
+                    row_sums = np.asarray(matrix.sum(axis=1)).flatten()
+                    row_sums[row_sums == 0] = 1  # Avoid division by zero
+                    matrix = csr_matrix(matrix.multiply(1 / row_sums.reshape(-1, 1)))
+                matrices[k] = matrix.astype(np.float32)
+            return matrices
+
+        except Exception as e:
+            self.logger.error(f"{Fore.RED}Cumulative window build failed: {str(e)}{Style.RESET_ALL}")
+            raise
+
+    def _spill_run(self,
+                   keys: List[np.ndarray],
+                   weights: List[np.ndarray],
+                   spill_dir: Path,
+                   run_id: int) -> Tuple[Path, Path]:
+        """Reduce buffered pairs into one sorted run and write it to disk.
+
+        Runs are raw int64 keys plus float64 values, so merge passes can
+        append to a run without knowing its final length.
+        """
+        run_keys, run_values = self._reduce_keys(np.concatenate(keys), np.concatenate(weights))
+        keys_file = spill_dir / f"run_{run_id:05d}_keys.bin"
+        values_file = spill_dir / f"run_{run_id:05d}_values.bin"
+        run_keys.astype(np.int64, copy=False).tofile(keys_file)
+        run_values.astype(np.float64, copy=False).tofile(values_file)
+        self.logger.info(f"{Fore.CYAN}Spilled run {run_id} with {len(run_keys)} pairs{Style.RESET_ALL}")
+        return keys_file, values_file
+
+    @classmethod
+    def _merge_blocks(cls, runs: List[Tuple[Path, Path]], budget_pairs: int):
+        """K-way merge of sorted runs, yielded as reduced (keys, values) blocks in key order.
+
+        Runs are memory-mapped and merged block by block: each block takes every
+        key up to the smallest last key among the runs' next windows. A window
+        is budget_pairs / (4 * len(runs)) pairs, so a block never holds more
+        than a quarter of the budget however many runs there are.
+        """
+        run_keys = [np.memmap(keys_file, dtype=np.int64, mode='r') for keys_file, _ in runs]
+        run_values = [np.memmap(values_file, dtype=np.float64, mode='r') for _, values_file in runs]
+        positions = [0] * len(runs)
+        chunk_pairs = max(1, budget_pairs // (4 * len(runs)))
+
+        while True:
+            active = [r for r in range(len(runs)) if positions[r] < len(run_keys[r])]
+            if not active:
+                break
+            cutoff = min(run_keys[r][min(positions[r] + chunk_pairs, len(run_keys[r])) - 1] for r in active)
+
+            block_keys, block_values = [], []
+            for r in active:
+                end = positions[r] + int(np.searchsorted(
+                    run_keys[r][positions[r]:positions[r] + chunk_pairs], cutoff, side='right'))
+                block_keys.append(np.asarray(run_keys[r][positions[r]:end]))
+                block_values.append(np.asarray(run_values[r][positions[r]:end]))
+                positions[r] = end
+
+            yield cls._reduce_keys(np.concatenate(block_keys), np.concatenate(block_values))
+
+    def _merge_run_group(self,
+                         runs: List[Tuple[Path, Path]],
+                         spill_dir: Path,
+                         run_id: int,
+                         budget_pairs: int) -> Tuple[Path, Path]:
+        """Merge a group of sorted runs into one sorted run, deleting the inputs"""
+        keys_file = spill_dir / f"merged_{run_id:05d}_keys.bin"
+        values_file = spill_dir / f"merged_{run_id:05d}_values.bin"
+        with open(keys_file, 'wb') as keys_out, open(values_file, 'wb') as values_out:
+            for keys, values in self._merge_blocks(runs, budget_pairs):
+                keys_out.write(keys.tobytes())
+                values_out.write(values.tobytes())
+        for run in runs:
+            for path in run:
+                path.unlink()
+        return keys_file, values_file
+
+    def _merge_runs(self,
+                    runs: List[Tuple[Path, Path]],
+                    vocab_size: int,
+                    spill_dir: Path,
+                    budget_pairs: int) -> Tuple[Path, Path, np.ndarray, np.ndarray]:
+        """Merge sorted runs into raw CSR data/indices files.
+
+        A merge reads a window of budget_pairs / (4 * fan_in) pairs per run;
+        fan_in is capped so that window stays at least MERGE_MIN_WINDOW_PAIRS,
+        and when there are more runs than that, groups of them are first
+        merged into longer runs (one extra pass over the pairs per level).
+        The windows of a merge therefore hold at most budget_pairs / 4 pairs
+        however many runs the corpus spilled.
+        """
+        fan_in = max(2, budget_pairs // (4 * self.MERGE_MIN_WINDOW_PAIRS))
+        next_id = 0
+        while len(runs) > fan_in:
+            self.logger.info(f"{Fore.CYAN}Merging {len(runs)} runs in groups of {fan_in}...{Style.RESET_ALL}")
+            merged = []
+            for start in range(0, len(runs), fan_in):
+                merged.append(self._merge_run_group(runs[start:start + fan_in], spill_dir, next_id, budget_pairs))
+                next_id += 1
+            runs = merged
+
+        row_counts = np.zeros(vocab_size, dtype=np.int64)
+        row_sums = np.zeros(vocab_size, dtype=np.float64)
+        data_file = spill_dir / "merged_data.bin"
+        indices_file = spill_dir / "merged_indices.bin"
+
+        with open(data_file, 'wb') as data_out, open(indices_file, 'wb') as indices_out:
+            for keys, values in self._merge_blocks(runs, budget_pairs):
+                rows = keys // vocab_size
+                row_counts += np.bincount(rows, minlength=vocab_size)
+                row_sums += np.bincount(rows, weights=values, minlength=vocab_size)
+                data_out.write(values.tobytes())
+                indices_out.write((keys % vocab_size).astype(np.int32).tobytes())
+
+        return data_file, indices_file, row_counts, row_sums
+
+    @staticmethod
+    def _write_npy_entry(archive: zipfile.ZipFile,
+                         name: str,
+                         source: Path,
+                         source_dtype: np.dtype,
+                         dtype: np.dtype,
+                         chunk_pairs: int,
+                         transform=None) -> None:
+        """Stream a raw binary file into the archive as a .npy member, chunk by chunk"""
+        source_dtype = np.dtype(source_dtype)
+        n_items = source.stat().st_size // source_dtype.itemsize
+        with archive.open(name, 'w', force_zip64=True) as member, open(source, 'rb') as f:
+            np.lib.format.write_array_header_1_0(
+                member, {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                         'fortran_order': False,
+                         'shape': (n_items,)})
+            start = 0
+            while start < n_items:
+                chunk = np.fromfile(f, dtype=source_dtype, count=chunk_pairs)
+                if transform is not None:
+                    chunk = transform(chunk, start)
+                member.write(chunk.astype(dtype).tobytes())
+                start += len(chunk)
+
+    def build_cooccurrence_matrix_streaming(self,
+                                  tokenized_sentences: Union[ColumnarCorpus, List[List[str]]],
+                                  vocab: Dict[str, int],
+                                  window_size: int,
+                                  output_file: str,
+                                  normalize: bool = False,
+                                  distance_weighting: bool = True,
+                                  memory_budget_mb: int = 1024,
+                                  shard_size: int = 10000,
+                                  spill_dir: Optional[str] = None) -> Dict[str, int]:
+        """Build a Hindi co-occurrence matrix out of core and save it as a CSR .npz.
+
+        Sentences are processed in shards; their pairs are buffered until the
+        memory budget is reached and then spilled to disk as a sorted run. The
+        runs are k-way merged (in several passes when there are many) and
+        streamed straight into output_file, so peak memory is set by
+        memory_budget_mb and shard_size rather than the corpus size.
+        """
+        try:
+            self.logger.info(f"{Fore.CYAN}Building Hindi co-occurrence matrix with window size {window_size} (streaming, {memory_budget_mb}MB budget)...{Style.RESET_ALL}")
+            vocab_size = len(vocab)
+            # Keys and weights take 16 bytes per pair; leave the other half for sorting
+            budget_pairs = max(1, memory_budget_mb * 1024**2 // 32)
+            chunk_pairs = max(1, budget_pairs // 4)
+            work_dir = Path(tempfile.mkdtemp(prefix="cooc_runs_", dir=spill_dir))
+
+            try:
+                runs = []
+                buffer_keys, buffer_weights, buffered = [], [], 0
+                for start in tqdm(range(0, len(tokenized_sentences), shard_size), desc="Processing shards"):
+                    token_ids, offsets = self._encode_sentences(tokenized_sentences[start:start + shard_size], vocab)
+                    lengths = np.diff(offsets)
+                    sentence_ids = np.repeat(np.arange(len(lengths), dtype=np.int64), lengths)
+
+                    for k in range(1, min(window_size, len(token_ids) - 1) + 1):
+                        pair_keys, counts = self._pair_keys(token_ids, sentence_ids, k, vocab_size)
+                        # Apply distance weighting if enabled
+                        weights = counts * (1.0 / k) if distance_weighting else counts.astype(np.float64)
+                        # Each pair counts in both directions
+                        buffer_keys += [pair_keys, (pair_keys % vocab_size) * vocab_size + pair_keys // vocab_size]
+                        buffer_weights += [weights, weights]
+                        buffered += 2 * len(pair_keys)
+
+                    if buffered >= budget_pairs:
+                        runs.append(self._spill_run(buffer_keys, buffer_weights, work_dir, len(runs)))
+                        buffer_keys, buffer_weights, buffered = [], [], 0
+
+                if buffered:
+                    runs.append(self._spill_run(buffer_keys, buffer_weights, work_dir, len(runs)))
+                if not runs:
+                    raise ValueError("No valid Hindi co-occurrences found in the corpus")
+
+                self.logger.info(f"{Fore.CYAN}Merging {len(runs)} sorted runs...{Style.RESET_ALL}")
+                data_file, indices_file, row_counts, row_sums = self._merge_runs(
+                    runs, vocab_size, work_dir, budget_pairs)
+                nnz = int(row_counts.sum())
+                if nnz == 0:
+                    raise ValueError("No valid Hindi co-occurrences found in the corpus")
+
+                indptr = np.zeros(vocab_size + 1, dtype=np.int64)
+                np.cumsum(row_counts, out=indptr[1:])
+                index_dtype = np.int32 if nnz < np.iinfo(np.int32).max else np.int64
+
+                row_sums[row_sums == 0] = 1  # Avoid division by zero
+                def normalize_rows(chunk: np.ndarray, start: int) -> np.ndarray:
+                    # Normalize by row sums
+                    rows = np.searchsorted(indptr, np.arange(start, start + len(chunk)), side='right') - 1
+                    return chunk / row_sums[rows]
+
+                # Same layout as sparse_io.save_csr: members stored uncompressed so
+                # the reducer can memory-map them
+                with zipfile.ZipFile(output_file, 'w', compression=zipfile.ZIP_STORED) as archive:
+                    self._write_npy_entry(archive, 'indices.npy', indices_file, np.int32, index_dtype, chunk_pairs)
+                    with archive.open('indptr.npy', 'w') as member:
+                        np.lib.format.write_array(member, indptr.astype(index_dtype))
+                    with archive.open('format.npy', 'w') as member:
+                        np.lib.format.write_array(member, np.array(b'csr'))
+                    with archive.open('shape.npy', 'w') as member:
+                        np.lib.format.write_array(member, np.array((vocab_size, vocab_size)))
+                    self._write_npy_entry(archive, 'data.npy', data_file, np.float64, np.float32, chunk_pairs,
+                                          normalize_rows if normalize else None)
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+            self.logger.info(f"{Fore.GREEN}Hindi matrix shape: {(vocab_size, vocab_size)}, Non-zero elements: {nnz}{Style.RESET_ALL}")
+            return {"shape": (vocab_size, vocab_size), "nonzero": nnz, "runs": len(runs)}
+
+        except Exception as e:
+            self.logger.error(f"{Fore.RED}Streaming Hindi co-occurrence matrix building failed: {str(e)}{Style.RESET_ALL}")
+            raise
+
+    def build_cooccurrence_matrix(self,
+                                tokenized_sentences: Union[ColumnarCorpus, List[List[str]]],
                                 vocab: Dict[str, int],
                                 window_size: int,
                                 normalize: bool = False,
-                                distance_weighting: bool = True) -> cp_csr_matrix:
-        """Build co-occurrence matrix for Hindi text using GPU acceleration"""
+                                distance_weighting: bool = True) -> csr_matrix:
+        """Build co-occurrence matrix for Hindi text using GPU acceleration (or the CPU engine)"""
+        if self.engine == "cpu":
+            token_ids, offsets = self.encode_corpus(tokenized_sentences, vocab)
+            return self.cooccurrence_from_ids(token_ids, offsets, len(vocab), window_size,
+                                              normalize, distance_weighting)
+
         try:
             vocab_size = len(vocab)
             row_indices = []
@@ -136,18 +776,19 @@ class HindiCooccurrenceMatrixBuilder:
                 raise ValueError("No valid Hindi co-occurrences found in the corpus")
                 
             # Convert to GPU arrays
-            rows = cp.array(row_indices, dtype=cp.int32)
-            cols = cp.array(col_indices, dtype=cp.int32)
-            vals = cp.array(values, dtype=cp.float32)
+            xp = self.backend.xp
+            rows = xp.array(row_indices, dtype=xp.int32)
+            cols = xp.array(col_indices, dtype=xp.int32)
+            vals = xp.array(values, dtype=xp.float32)
             
             # Create sparse matrix on GPU
-            matrix = cp_csr_matrix((vals, (rows, cols)), 
+            matrix = self.backend.sparse.csr_matrix((vals, (rows, cols)), 
                                  shape=(vocab_size, vocab_size),
-                                 dtype=cp.float32)
+                                 dtype=xp.float32)
             
             if normalize:
                 # Normalize by row sums
-                row_sums = cp.array(matrix.sum(axis=1)).flatten()
+                row_sums = xp.array(matrix.sum(axis=1)).flatten()
                 row_sums[row_sums == 0] = 1
                 matrix = matrix.multiply(1 / row_sums.reshape(-1, 1))
             
@@ -164,47 +805,105 @@ class HindiCooccurrenceMatrixBuilder:
                                window_sizes: List[int],
                                min_freq: int = 3,
                                normalize: bool = False,
-                               distance_weighting: bool = True) -> None:
-        """Process Hindi corpus with multiple window sizes and save results"""
+                               distance_weighting: bool = True,
+                               single_pass: bool = False,
+                               memory_budget_mb: Optional[int] = None,
+                               cache: Optional[ArtifactCache] = None) -> None:
+        """Process Hindi corpus with multiple window sizes and save results
+
+        With single_pass=True the corpus is walked once up to max(window_sizes),
+        counts are binned by distance and each window matrix is a cumulative sum
+        of the bins instead of a full rebuild per window. With memory_budget_mb
+        set, each window is built out of core and streamed to disk instead.
+        With a cache, windows (and the vocabulary) already built from the same
+        corpus with the same parameters are restored instead of rebuilt.
+        """
         try:
+            if single_pass and memory_budget_mb is not None:
+                raise ValueError("single_pass and memory_budget_mb cannot be combined")
             start_time = time.perf_counter()
             Path(output_dir).mkdir(parents=True, exist_ok=True)
             
+            vocab_file = Path(output_dir) / "hindi_vocabulary.json"
+            freq_file = Path(output_dir) / "hindi_word_frequencies.json"
+            
+            if cache is not None:
+                vocab_key = cache.key("hindi_vocabulary", [input_file], {"min_freq": min_freq})
+                window_keys = {window_size: cache.key("hindi_cooccurrence", [input_file], {
+                    "window_size": window_size, "min_freq": min_freq, "normalize": normalize, "distance_weighting": distance_weighting})
+                    for window_size in window_sizes}
+                vocab_cached = cache.fetch(vocab_key, [str(vocab_file), str(freq_file)])
+                pending = []
+                for window_size in window_sizes:
+                    outputs = [str(Path(output_dir) / f"hindi_cooc_matrix_w{window_size}.npz"),
+                               str(Path(output_dir) / f"hindi_matrix_info_w{window_size}.json")]
+                    if cache.fetch(window_keys[window_size], outputs):
+                        self.logger.info(f"{Fore.GREEN}Window {window_size} restored from cache{Style.RESET_ALL}")
+                    else:
+                        pending.append(window_size)
+                window_sizes = pending
+                if vocab_cached and not window_sizes:
+                    self.logger.info(f"{Fore.GREEN}All windows restored from cache{Style.RESET_ALL}")
+                    return
+            
             # Load tokenized sentences
             self.logger.info(f"{Fore.CYAN}Loading tokenized Hindi corpus from {input_file}{Style.RESET_ALL}")
-            with open(input_file, 'rb') as f:
-                tokenized_sentences = pickle.load(f)
+            tokenized_sentences = self.load_tokenized_corpus(input_file)
             
             # Build vocabulary with frequency information
             vocab, freq_info = self.build_vocabulary(tokenized_sentences, min_freq)
             
             # Save vocabulary and frequency information
-            vocab_file = Path(output_dir) / "hindi_vocabulary.json"
-            freq_file = Path(output_dir) / "hindi_word_frequencies.json"
-            
             with open(vocab_file, 'w', encoding='utf-8') as f:
                 json.dump(vocab, f, ensure_ascii=False, indent=2)
             with open(freq_file, 'w', encoding='utf-8') as f:
                 json.dump(freq_info, f, ensure_ascii=False, indent=2)
+            if cache is not None:
+                cache.store(vocab_key, [str(vocab_file), str(freq_file)], stage="hindi_vocabulary")
+            
+            # The CPU engine encodes the corpus once and reuses it for every window
+            if (self.engine == "cpu" or single_pass) and memory_budget_mb is None and window_sizes:
+                token_ids, offsets = self.encode_corpus(tokenized_sentences, vocab)
+            
+            if single_pass and window_sizes:
+                bins = self.distance_binned_matrices(token_ids, offsets, len(vocab), max(window_sizes))
+                window_matrices = self.cumulative_window_matrices(
+                    bins, window_sizes, normalize, distance_weighting)
+                del bins
             
             # Process each window size
             for window_size in window_sizes:
                 self.logger.info(f"{Fore.CYAN}Processing window size {window_size}{Style.RESET_ALL}")
                 
-                # Build matrix
-                matrix = self.build_cooccurrence_matrix(
-                    tokenized_sentences, vocab, window_size, normalize, distance_weighting)
-                
-                # Convert to CPU and save
-                matrix_cpu = csr_matrix(matrix.get())
                 matrix_file = Path(output_dir) / f"hindi_cooc_matrix_w{window_size}.npz"
-                save_npz(str(matrix_file), matrix_cpu)
+                
+                # Build and save matrix
+                if memory_budget_mb is not None:
+                    stream_info = self.build_cooccurrence_matrix_streaming(
+                        tokenized_sentences, vocab, window_size, str(matrix_file),
+                        normalize, distance_weighting, memory_budget_mb=memory_budget_mb)
+                    shape, nonzero = stream_info["shape"], stream_info["nonzero"]
+                else:
+                    if single_pass:
+                        matrix = window_matrices[window_size]
+                        matrix_cpu = matrix
+                    elif self.engine == "cpu":
+                        matrix = self.cooccurrence_from_ids(
+                            token_ids, offsets, len(vocab), window_size, normalize, distance_weighting)
+                        matrix_cpu = matrix
+                    else:
+                        matrix = self.build_cooccurrence_matrix(
+                            tokenized_sentences, vocab, window_size, normalize, distance_weighting)
+                        # Convert to CPU
+                        matrix_cpu = csr_matrix(self.backend.to_host(matrix))
+                    save_csr(str(matrix_file), matrix_cpu)
+                    shape, nonzero = matrix.shape, int(matrix.nnz)
                 
                 # Save matrix info with Hindi-specific details
                 matrix_info = {
                     "window_size": window_size,
-                    "shape": matrix.shape,
-                    "nonzero": int(matrix.nnz),
+                    "shape": shape,
+                    "nonzero": nonzero,
                     "normalized": normalize,
                     "distance_weighted": distance_weighting,
                     "vocabulary_size": len(vocab),
@@ -214,6 +913,9 @@ class HindiCooccurrenceMatrixBuilder:
                 info_file = Path(output_dir) / f"hindi_matrix_info_w{window_size}.json"
                 with open(info_file, 'w') as f:
                     json.dump(matrix_info, f, indent=2)
+                if cache is not None:
+                    cache.store(window_keys[window_size], [str(matrix_file), str(info_file)],
+                                stage="hindi_cooccurrence")
             
             processing_time = time.perf_counter() - start_time
             self.logger.info(f"{Fore.GREEN}All Hindi matrices processed in {processing_time:.2f} seconds{Style.RESET_ALL}")
@@ -222,18 +924,288 @@ class HindiCooccurrenceMatrixBuilder:
             self.logger.error(f"{Fore.RED}Hindi matrix processing failed: {str(e)}{Style.RESET_ALL}")
             raise
 
+    @staticmethod
+    def _rare_positions(corpus: ColumnarCorpus,
+                        vocab: Dict[str, int],
+                        word_counts: Dict[str, int]) -> Dict[str, List[int]]:
+        """Sentence indices of corpus holding each counted word that is not in vocab"""
+        rare = np.fromiter((word not in vocab and word in word_counts for word in corpus.vocab),
+                           dtype=bool, count=len(corpus.vocab))
+        hits = np.flatnonzero(rare[corpus.token_ids])
+        if len(hits) == 0:
+            return {}
+        sentences = np.searchsorted(corpus.offsets, hits, side='right') - 1
+        # One key per (word, sentence), so a word seen twice in a sentence is listed once
+        pairs = np.unique(np.asarray(corpus.token_ids[hits], dtype=np.int64) * len(corpus) + sentences)
+        positions = {}
+        for word_id, sentence in zip((pairs // len(corpus)).tolist(), (pairs % len(corpus)).tolist()):
+            positions.setdefault(corpus.vocab[word_id], []).append(sentence)
+        return positions
+
+    @staticmethod
+    def _gather_sentences(corpus: ColumnarCorpus, sentence_idx: np.ndarray) -> ColumnarCorpus:
+        """Sub-corpus of the given sentences (reads only their tokens from a memory map)"""
+        starts = np.asarray(corpus.offsets[sentence_idx])
+        lengths = np.asarray(corpus.offsets[sentence_idx + 1]) - starts
+        offsets = np.zeros(len(sentence_idx) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        positions = np.arange(offsets[-1]) - np.repeat(offsets[:-1] - starts, lengths)
+        return ColumnarCorpus(corpus.vocab, corpus.token_ids[positions], offsets)
+
+    def _corpus_bins(self,
+                     corpus: ColumnarCorpus,
+                     vocab: Dict[str, int],
+                     vocab_size: int,
+                     max_window: int) -> List[csr_matrix]:
+        """Distance bins of a columnar corpus encoded with vocab, sized vocab_size"""
+        token_ids, offsets = self.encode_corpus(corpus, vocab)
+        return self.distance_binned_matrices(token_ids, offsets, vocab_size, max_window)
+
+    @staticmethod
+    def _discard_uncommitted(state_dir: Path, state: Dict) -> None:
+        """Delete generations, segments and temporary files that state does not
+        reference, i.e. the leftovers of an interrupted process_incremental"""
+        committed = set(state["segments"]) | {state["generation"]}
+        for entry in state_dir.iterdir():
+            if entry.name.startswith(("generation_", "segment_")) and entry.name not in committed:
+                shutil.rmtree(entry, ignore_errors=True)
+            elif entry.name.endswith(".tmp"):
+                entry.unlink()
+
+    def process_incremental(self,
+                            input_file: str,
+                            output_dir: str,
+                            window_sizes: List[int],
+                            min_freq: int = 3,
+                            normalize: bool = False,
+                            distance_weighting: bool = True) -> Dict:
+        """Add the sentences of a columnar Hindi corpus to the matrices in output_dir
+
+        output_dir/.incremental/ keeps the frequency table of every Devanagari
+        word seen (rare words included), the unweighted one-sided distance bins up to
+        max(window_sizes) and a copy of each ingested corpus segment. A call
+        counts only the new sentences, adds them to the bins and re-derives
+        the window matrices from the bins, as single_pass does. On the first
+        call (no state yet) this is a full single-pass build.
+
+        Bins, vocabulary and frequency table live in a generation directory
+        that a call never modifies: it writes a new one next to it and then
+        replaces state.json, which names the current generation, in one
+        os.replace. That replace is the only commit point, so a call that dies
+        half way leaves the previous generation in force (the delta is not
+        counted) and the next call deletes what it left behind.
+
+        Words that cross min_freq get the next free vocabulary ids, so existing
+        ids (and the rows of older embeddings) never move; the result equals
+        a full rebuild up to that ordering. Previously ingested sentences that
+        contain a newly admitted word are the only old text read again: their
+        counts are subtracted under the old vocabulary and re-added under the
+        new one, since the admitted word shifts its neighbours apart. They
+        are found through rare_positions.json, which lists the (segment,
+        sentence) positions of every counted word still below min_freq, so no
+        segment without an admitted word is opened.
+        """
+        try:
+            start_time = time.perf_counter()
+            output_path = Path(output_dir)
+            state_dir = output_path / self.INCREMENTAL_DIR
+            state_dir.mkdir(parents=True, exist_ok=True)
+            state_file = state_dir / "state.json"
+            vocab_file = output_path / "hindi_vocabulary.json"
+            freq_file = output_path / "hindi_word_frequencies.json"
+            max_window = max(window_sizes)
+            settings = {"min_freq": min_freq, "normalize": normalize,
+                        "distance_weighting": distance_weighting, "max_window": max_window}
+            
+            if ColumnarCorpus.is_corpus(input_file):
+                delta = ColumnarCorpus.load(input_file)
+            else:
+                delta = ColumnarCorpus.from_sentences(self.load_tokenized_corpus(input_file))
+            self.logger.info(f"{Fore.CYAN}Ingesting {len(delta)} Hindi sentences from {input_file}{Style.RESET_ALL}")
+            
+            if state_file.exists():
+                with open(state_file, 'r') as f:
+                    state = json.load(f)
+                if state["settings"] != settings:
+                    raise ValueError(f"Incremental state was built with {state['settings']}, not {settings}; "
+                                     f"rebuild into a fresh output directory")
+            else:
+                state = {"settings": settings, "segments": [], "sources": [], "generation": None}
+            self._discard_uncommitted(state_dir, state)
+            
+            if state["generation"] is not None:
+                generation_dir = state_dir / state["generation"]
+                with open(generation_dir / "vocabulary.json", 'r', encoding='utf-8') as f:
+                    vocab = json.load(f)
+                with open(generation_dir / "word_counts.json", 'r', encoding='utf-8') as f:
+                    word_counts = json.load(f)
+                with open(generation_dir / "rare_positions.json", 'r', encoding='utf-8') as f:
+                    rare_positions = json.load(f)
+                bins = [load_csr(generation_dir / f"bin_k{k}.npz", mmap=False) for k in range(1, max_window + 1)]
+            else:
+                vocab, word_counts, rare_positions, bins = {}, {}, {}, None
+            
+            # Update the full frequency table (Devanagari tokens only), then admit
+            # words that crossed min_freq, most frequent first as in build_vocabulary
+            for word, count in zip(delta.vocab, delta.counts().tolist()):
+                if count and any('\u0900' <= char <= '\u097F' for char in word):
+                    word_counts[word] = word_counts.get(word, 0) + count
+            admitted = sorted([word for word in delta.vocab
+                               if word not in vocab and word_counts.get(word, 0) >= min_freq],
+                              key=lambda word: word_counts[word], reverse=True)
+            old_vocab = dict(vocab)
+            for word in admitted:
+                vocab[word] = len(vocab)
+            vocab_size = len(vocab)
+            self.logger.info(f"{Fore.GREEN}{len(admitted)} words admitted, Hindi vocabulary size {vocab_size}{Style.RESET_ALL}")
+            
+            delta_bins = self._corpus_bins(delta, vocab, vocab_size, max_window)
+            
+            # Re-count earlier sentences whose encoding changed
+            affected = {}
+            for word in admitted:
+                for segment_index, sentence in rare_positions.pop(word, []):
+                    affected.setdefault(segment_index, []).append(sentence)
+            recounted = 0
+            for segment_index, sentences in sorted(affected.items()):
+                segment = ColumnarCorpus.load(state_dir / state["segments"][segment_index])
+                subset = self._gather_sentences(segment, np.unique(sentences))
+                recounted += len(subset)
+                added = self._corpus_bins(subset, vocab, vocab_size, max_window)
+                removed = self._corpus_bins(subset, old_vocab, vocab_size, max_window)
+                delta_bins = [bin_matrix + plus - minus
+                              for bin_matrix, plus, minus in zip(delta_bins, added, removed)]
+            if recounted:
+                self.logger.info(f"{Fore.CYAN}Re-counted {recounted} earlier sentences{Style.RESET_ALL}")
+            
+            # Index the words of the delta that are still below min_freq
+            segment_index = len(state["segments"])
+            for word, sentences in self._rare_positions(delta, vocab, word_counts).items():
+                rare_positions.setdefault(word, []).extend([segment_index, sentence] for sentence in sentences)
+            
+            if bins is None:
+                bins = delta_bins
+            else:
+                for bin_matrix in bins:
+                    bin_matrix.resize((vocab_size, vocab_size))
+                bins = [(bin_matrix + delta_bin).tocsr() for bin_matrix, delta_bin in zip(bins, delta_bins)]
+            for bin_matrix in bins:
+                bin_matrix.eliminate_zeros()
+            
+            window_matrices = self.cumulative_window_matrices(bins, window_sizes, normalize, distance_weighting)
+            
+            # Commit: a new generation and segment, then state.json pointing at them
+            generation = f"generation_{len(state['segments']):05d}"
+            generation_dir = state_dir / generation
+            generation_dir.mkdir()
+            for k, bin_matrix in enumerate(bins, start=1):
+                save_csr(str(generation_dir / f"bin_k{k}.npz"), bin_matrix)
+            with open(generation_dir / "vocabulary.json", 'w', encoding='utf-8') as f:
+                json.dump(vocab, f, ensure_ascii=False)
+            with open(generation_dir / "word_counts.json", 'w', encoding='utf-8') as f:
+                json.dump(word_counts, f, ensure_ascii=False)
+            with open(generation_dir / "rare_positions.json", 'w', encoding='utf-8') as f:
+                json.dump(rare_positions, f, ensure_ascii=False)
+            segment_name = f"segment_{segment_index:05d}"
+            delta.save(state_dir / segment_name)
+            previous_generation = state["generation"]
+            state["segments"].append(segment_name)
+            state["sources"].append(str(Path(input_file).resolve()))
+            state["generation"] = generation
+            tmp_file = state_file.with_name(state_file.name + ".tmp")
+            with open(tmp_file, 'w') as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_file, state_file)
+            if previous_generation is not None:
+                shutil.rmtree(state_dir / previous_generation, ignore_errors=True)
+            
+            # Outputs are derived from the committed state; if this part is
+            # interrupted the next call rewrites them
+            for window_size in window_sizes:
+                matrix = window_matrices[window_size]
+                save_csr(str(output_path / f"hindi_cooc_matrix_w{window_size}.npz"), matrix)
+                matrix_info = {
+                    "window_size": window_size,
+                    "shape": matrix.shape,
+                    "nonzero": int(matrix.nnz),
+                    "normalized": normalize,
+                    "distance_weighted": distance_weighting,
+                    "vocabulary_size": vocab_size,
+                    "min_frequency": min_freq,
+                    "language": "hindi"
+                }
+                with open(output_path / f"hindi_matrix_info_w{window_size}.json", 'w') as f:
+                    json.dump(matrix_info, f, indent=2)
+            
+            with open(vocab_file, 'w', encoding='utf-8') as f:
+                json.dump(vocab, f, ensure_ascii=False, indent=2)
+            with open(freq_file, 'w', encoding='utf-8') as f:
+                json.dump({word: freq for word, freq in word_counts.items() if freq >= min_freq},
+                          f, ensure_ascii=False, indent=2)
+            
+            processing_time = time.perf_counter() - start_time
+            self.logger.info(f"{Fore.GREEN}Incremental Hindi update complete in {processing_time:.2f} seconds{Style.RESET_ALL}")
+            return {
+                "new_sentences": len(delta),
+                "admitted_words": len(admitted),
+                "recounted_sentences": recounted,
+                "vocabulary_size": vocab_size
+            }
+            
+        except Exception as e:
+            self.logger.error(f"{Fore.RED}Incremental Hindi update failed: {str(e)}{Style.RESET_ALL}")
+            raise
+
+    def ingested_sources(self, output_dir: str) -> List[str]:
+        """Resolved paths of the corpora already added by process_incremental"""
+        state_file = Path(output_dir) / self.INCREMENTAL_DIR / "state.json"
+        if not state_file.exists():
+            return []
+        with open(state_file, 'r') as f:
+            return json.load(f)["sources"]
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build Hindi co-occurrence matrices")
+    parser.add_argument("--cache-dir", default="./processed_data/.artifact_cache",
+                        help="Content-addressed artifact cache directory")
+    parser.add_argument("--cache-budget-gb", type=float, default=20.0,
+                        help="Disk budget for the cache; least recently used entries are evicted")
+    parser.add_argument("--force", action="store_true",
+                        help="Ignore cached outputs and recompute")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Add every processed_data/hindi_tokenized_delta_* corpus not ingested yet")
+    args = parser.parse_args()
+    
     try:
+        cache = ArtifactCache(args.cache_dir, budget_gb=args.cache_budget_gb, force=args.force)
         # Example usage
-        builder = HindiCooccurrenceMatrixBuilder(log_file="./logs/hindi_cooccurrence_builder.log")
-        builder.process_multiple_windows(
-            input_file="./processed_data/hindi_tokenized_corpus.pkl",
-            output_dir="./processed_data/hindi_cooccurrence_matrices",
-            window_sizes=[2, 4, 6, 8, 10],
-            min_freq=3,  # Lower threshold for Hindi
-            normalize=True,
-            distance_weighting=True
-        )
+        builder = HindiCooccurrenceMatrixBuilder(log_file="./logs/hindi_cooccurrence_builder.log", engine="auto")
+        if args.incremental:
+            output_dir = "./processed_data/hindi_cooccurrence_matrices"
+            ingested = set(builder.ingested_sources(output_dir))
+            for delta_dir in sorted(Path("./processed_data").glob("hindi_tokenized_delta_*")):
+                if str(delta_dir.resolve()) in ingested:
+                    continue
+                summary = builder.process_incremental(
+                    input_file=str(delta_dir),
+                    output_dir=output_dir,
+                    window_sizes=[2, 4, 6, 8, 10],
+                    min_freq=3,
+                    normalize=True,
+                    distance_weighting=True
+                )
+                print(f"{delta_dir.name}: {summary}")
+        else:
+            builder.process_multiple_windows(
+                input_file="./processed_data/hindi_tokenized_corpus",
+                output_dir="./processed_data/hindi_cooccurrence_matrices",
+                window_sizes=[2, 4, 6, 8, 10],
+                min_freq=3,  # Lower threshold for Hindi
+                normalize=True,
+                distance_weighting=True,
+                single_pass=True,
+                cache=cache
+            )
         print(f"{Fore.GREEN}Successfully built Hindi co-occurrence matrices{Style.RESET_ALL}")
         
     except Exception as e:
@@ -0,0 +1,214 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import torch
+from scipy.stats import spearmanr, t as student_t
+
+ANALOGY_METHODS = ("3cosadd", "3cosmul")
+_COSMUL_EPS = 1e-3
+
+
+def unit_rows(embeddings: np.ndarray, device: Union[str, torch.device] = "cpu") -> torch.Tensor:
+    """float32 copy of the embedding matrix on device with L2-normalized rows
+    (all-zero rows stay zero)"""
+    matrix = torch.tensor(np.asarray(embeddings), dtype=torch.float32, device=device)
+    norms = torch.linalg.vector_norm(matrix, dim=1, keepdim=True)
+    return matrix / norms.clamp_min(1e-8)
+
+
+def load_analogy_file(path: Union[str, Path], lowercase: bool = True) -> List[Tuple[str, str, str, str]]:
+    """Read analogy questions in the Google questions-words.txt format:
+    one 'a b c d' question per line, ': section' headers are skipped"""
+    analogies = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith(':'):
+                continue
+            words = line.lower().split() if lowercase else line.split()
+            if len(words) == 4:
+                analogies.append(tuple(words))
+    return analogies
+
+
+def resolve_analogies(analogies: Iterable[Tuple[str, str, str, str]],
+                      vocab: Dict[str, int]) -> Tuple[np.ndarray, int]:
+    """Vocabulary indices of every fully covered question as a Q x 4 array,
+    plus the number of questions skipped for out-of-vocabulary words"""
+    questions = []
+    skipped = 0
+    for question in analogies:
+        indices = [vocab.get(word) for word in question]
+        if None in indices:
+            skipped += 1
+        else:
+            questions.append(indices)
+    return np.asarray(questions, dtype=np.int64).reshape(-1, 4), skipped
+
+
+def analogy_predictions(unit: torch.Tensor,
+                        questions: np.ndarray,
+                        method: str = "3cosadd",
+                        top_k: int = 1,
+                        chunk_size: int = 512) -> torch.Tensor:
+    """Top-k answers (Q x top_k vocabulary indices) for a:b :: c:?.
+
+    unit is the row-normalized embedding matrix from unit_rows. Queries are
+    scored chunk_size at a time against the whole vocabulary with one matmul
+    per chunk (three for 3CosMul), and a, b and c are masked out before the
+    top-k so they are never returned as answers.
+    - 3cosadd: argmax cos(x, b - a + c)
+    - 3cosmul: argmax cos(x, b) * cos(x, c) / (cos(x, a) + eps), with the
+      cosines shifted to [0, 1] (Levy & Goldberg, 2014)
+    """
+    if method not in ANALOGY_METHODS:
+        raise ValueError(f"Unknown analogy method: {method}. Choose from {ANALOGY_METHODS}")
+    questions = torch.as_tensor(questions, dtype=torch.long, device=unit.device)
+    predictions = []
+    for start in range(0, len(questions), chunk_size):
+        chunk = questions[start:start + chunk_size]
+        vec_a, vec_b, vec_c = unit[chunk[:, 0]], unit[chunk[:, 1]], unit[chunk[:, 2]]
+        if method == "3cosadd":
+            # Ranking by dot product equals ranking by cosine for a fixed query
+            scores = (vec_b - vec_a + vec_c) @ unit.T
+        else:
+            # ((b+1)/2)((c+1)/2) / ((a+1)/2 + eps) up to a positive constant,
+            # computed in place to keep one extra chunk x V buffer alive
+            scores = vec_b @ unit.T
+            scores += 1
+            scores *= (vec_c @ unit.T).add_(1)
+            scores /= (vec_a @ unit.T).add_(1 + 2 * _COSMUL_EPS)
+        scores.scatter_(1, chunk[:, :3], float("-inf"))
+        predictions.append(scores.topk(top_k, dim=1).indices)
+    if not predictions:
+        return torch.zeros((0, top_k), dtype=torch.long, device=unit.device)
+    return torch.cat(predictions)
+
+
+def evaluate_analogies(embeddings: Union[np.ndarray, torch.Tensor],
+                       vocab: Dict[str, int],
+                       analogies: Iterable[Tuple[str, str, str, str]],
+                       method: str = "3cosadd",
+                       top_k: int = 1,
+                       chunk_size: int = 512,
+                       device: Union[str, torch.device] = "cpu",
+                       resolved: Optional[Tuple[np.ndarray, int]] = None) -> Dict:
+    """Analogy accuracy over all covered questions in one batched pass.
+
+    embeddings may be a raw matrix or the output of unit_rows (to reuse one
+    normalization across methods); resolved may carry the output of
+    resolve_analogies when the same questions are scored on many files.
+    """
+    unit = embeddings if isinstance(embeddings, torch.Tensor) else unit_rows(embeddings, device)
+    questions, skipped = resolved if resolved is not None else resolve_analogies(analogies, vocab)
+    total = len(questions)
+    results = {"Analogy-Method": method, "Analogy-Total": total, "Analogy-Skipped": skipped,
+               "Analogy-Coverage": total / (total + skipped) if total + skipped > 0 else 0}
+    if total == 0:
+        results["Analogy-Accuracy"] = 0
+        if top_k > 1:
+            results[f"Analogy-Top{top_k}-Accuracy"] = 0
+        return results
+
+    predictions = analogy_predictions(unit, questions, method, top_k, chunk_size).cpu()
+    hits = predictions == torch.as_tensor(questions[:, 3:4])
+    results["Analogy-Accuracy"] = hits[:, 0].double().mean().item()
+    if top_k > 1:
+        results[f"Analogy-Top{top_k}-Accuracy"] = hits.any(dim=1).double().mean().item()
+    return results
+
+
+def resolve_similarity_pairs(dataset: pd.DataFrame,
+                             vocab: Dict[str, int],
+                             columns: Tuple[str, str, str] = ("word1", "word2", "similarity"),
+                             lowercase: bool = True) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Vocabulary indices (P x 2) and gold scores of every pair whose two
+    words are in the vocabulary, plus the number of pairs skipped.
+
+    columns names the two word columns and the score column of dataset.
+    """
+    word1, word2, score = columns
+    left, right = dataset[word1].astype(str), dataset[word2].astype(str)
+    if lowercase:
+        left, right = left.str.lower(), right.str.lower()
+    left, right = left.map(vocab), right.map(vocab)
+    gold = pd.to_numeric(dataset[score], errors='coerce')
+    covered = (left.notna() & right.notna() & gold.notna()).to_numpy()
+    pairs = np.stack([left.to_numpy()[covered], right.to_numpy()[covered]], axis=1).astype(np.int64)
+    return pairs.reshape(-1, 2), gold.to_numpy(dtype=np.float64)[covered], int((~covered).sum())
+
+
+def pair_cosines(embeddings: np.ndarray, pairs: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every (i, j) row pair. Only the 2P rows involved
+    are gathered, so a memory-mapped matrix is never read in full."""
+    left = np.asarray(embeddings[pairs[:, 0]], dtype=np.float64)
+    right = np.asarray(embeddings[pairs[:, 1]], dtype=np.float64)
+    norms = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+    return np.einsum('ij,ij->i', left, right) / np.maximum(norms, 1e-12)
+
+
+def evaluate_similarity(embeddings: np.ndarray,
+                        resolved: Tuple[np.ndarray, np.ndarray, int],
+                        name: str = "Similarity") -> Dict:
+    """Spearman correlation between pair cosines and gold scores, plus coverage.
+
+    resolved is the output of resolve_similarity_pairs; resolving once and
+    reusing it across embedding files that share a vocabulary skips the word
+    lookups entirely. Keys are prefixed with name (e.g. SimLex-Correlation).
+    """
+    pairs, gold, skipped = resolved
+    covered = len(pairs)
+    correlation = float("nan")
+    if covered >= 2:
+        correlation = float(spearmanr(gold, pair_cosines(embeddings, pairs)).correlation)
+    return {f"{name}-Correlation": correlation,
+            f"{name}-Coverage": covered / (covered + skipped) if covered + skipped > 0 else 0.0,
+            f"{name}-Pairs": covered}
+
+
+def evaluate_clustering(embeddings: np.ndarray,
+                        n_clusters: int = 10,
+                        sample_size: int = 10000,
+                        n_samples: int = 5,
+                        batch_size: int = 4096,
+                        confidence: float = 0.95,
+                        seed: int = 42) -> Dict:
+    """Clustering quality that scales linearly with the vocabulary.
+
+    Clusters come from MiniBatchKMeans over all rows; the silhouette (O(n^2)
+    for n rows) is averaged over n_samples random subsets of sample_size
+    rows, and the spread across subsets gives a Student-t confidence
+    interval. With sample_size >= the vocabulary one exact score is computed.
+    """
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.metrics import silhouette_score
+
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size, n_init=3, random_state=seed)
+    labels = kmeans.fit_predict(matrix)
+
+    rng = np.random.default_rng(seed)
+    if sample_size >= len(matrix):
+        sample_size, n_samples = len(matrix), 1
+    scores = []
+    for _ in range(n_samples):
+        idx = np.sort(rng.choice(len(matrix), size=sample_size, replace=False))
+        if len(np.unique(labels[idx])) > 1:
+            scores.append(silhouette_score(matrix[idx], labels[idx]))
+    if not scores:
+        raise ValueError("Every silhouette sample fell into a single cluster")
+
+    scores = np.asarray(scores)
+    mean = float(scores.mean())
+    half_width = 0.0
+    if len(scores) > 1:
+        half_width = float(student_t.ppf((1 + confidence) / 2, len(scores) - 1)
+                           * scores.std(ddof=1) / np.sqrt(len(scores)))
+    return {"Clustering-Silhouette": mean,
+            "Clustering-Silhouette-CI-Low": mean - half_width,
+            "Clustering-Silhouette-CI-High": mean + half_width,
+            "Clustering-Silhouette-Std": float(scores.std(ddof=1)) if len(scores) > 1 else 0.0,
+            "Clustering-Samples": len(scores),
+            "Clustering-Sample-Size": sample_size,
+            "Clusters": n_clusters}
@@ -1,9 +1,10 @@
 import numpy as np
-import cupy as cp
-from cupyx.scipy.sparse import csr_matrix as cp_csr_matrix
-from scipy.sparse import load_npz, save_npz
+from scipy.sparse import csr_matrix
 from scipy.sparse.linalg import svds
+from sklearn.utils.extmath import randomized_svd
 import json
+import os
+import argparse
 import time
 from pathlib import Path
 import logging
@@ -12,25 +13,65 @@ from colorama import Fore, Style, init
 import sys
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+from threadpoolctl import threadpool_limits
+
+from array_backend import ArrayBackend
+from artifact_cache import ArtifactCache
+from sparse_io import load_csr, save_csr
 import re
 from indicnlp.tokenize import indic_tokenize  # For Hindi tokenization
 
 # Initialize colorama
 init()
 
+# Reducer owned by each scheduler worker process (set by _init_reduction_worker)
+_WORKER_REDUCER = None
+
+def _init_reduction_worker(reducer_kwargs: Dict, blas_threads: int) -> None:
+    """Worker initializer: cap BLAS threads and build one reducer per process."""
+    global _WORKER_REDUCER
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(blas_threads)
+    threadpool_limits(limits=blas_threads, user_api="blas")
+    # Forked workers inherit the parent's handlers; start from a clean logger
+    logging.getLogger('HindiMatrixReducer').handlers.clear()
+    _WORKER_REDUCER = HindiMatrixReducer(**reducer_kwargs)
+
+def _run_reduction_job(job: Dict) -> Tuple[Dict, Optional[Dict]]:
+    """Worker: one (window, normalization) job."""
+    return _WORKER_REDUCER.reduction_job(**job)
+
 class HindiMatrixReducer:
     """Class for normalization and dimensionality reduction of Hindi language matrices."""
+
+    SVD_SOLVERS = ("arpack", "randomized", "lobpcg")
     
-    def __init__(self, log_dir: str = "logs"):
+    def __init__(self,
+                 log_dir: str = "logs",
+                 backend: str = "auto",
+                 ppmi_alpha: Optional[float] = None,
+                 ppmi_shift: float = 1.0):
         self.setup_logging(log_dir)
-        self._check_gpu()
+        # Kept so scheduler workers can rebuild an identically configured reducer
+        self.log_dir = log_dir
+        self.backend_name = backend
+        # Context-distribution smoothing exponent (e.g. 0.75) and shift k for PPMI
+        self.ppmi_alpha = ppmi_alpha
+        self.ppmi_shift = ppmi_shift
+        # NumPy/SciPy on CPU-only hosts, CuPy when a GPU is available (or requested)
+        self.backend = ArrayBackend(backend)
+        self.xp = self.backend.xp
+        if self.backend.is_gpu:
+            self._check_gpu()
+        else:
+            self.logger.info(f"{Fore.YELLOW}No GPU backend selected, running on CPU (NumPy/SciPy){Style.RESET_ALL}")
         
     def _check_gpu(self) -> None:
         """Check GPU availability and memory."""
         try:
-            mem_info = cp.cuda.runtime.memGetInfo()
-            free_memory = mem_info[0] / 1024**3
-            total_memory = mem_info[1] / 1024**3
+            free_memory, total_memory = self.backend.memory_info()
             self.logger.info(f"{Fore.GREEN}GPU Memory: {free_memory:.2f}GB free / {total_memory:.2f}GB total{Style.RESET_ALL}")
         except Exception as e:
             self.logger.error(f"{Fore.RED}GPU check failed: {str(e)}{Style.RESET_ALL}")
@@ -59,39 +100,65 @@ class HindiMatrixReducer:
         self.logger.addHandler(fh)
         self.logger.addHandler(ch)
 
-    def apply_normalization(self, matrix: cp_csr_matrix, method: str) -> cp_csr_matrix:
+    def sparse_ppmi(self,
+                    matrix: csr_matrix,
+                    alpha: Optional[float] = None,
+                    shift: float = 1.0) -> csr_matrix:
+        """PPMI computed only on the stored nonzeros of a co-occurrence matrix.
+
+        PMI(x, y) = log(P(x, y) / (P(x) P_alpha(y))) - log(shift), where the
+        marginals are gathered per nonzero through the CSR row/column indices,
+        so memory stays O(nnz) instead of the dense V x V expected matrix.
+        alpha smooths the context distribution (P_alpha(y) ~ count(y)^alpha)
+        and shift > 1 gives shifted PMI; the defaults reproduce plain PPMI.
+        """
+        xp = self.xp
+        matrix = self.backend.sparse.csr_matrix(matrix)
+        n_rows = matrix.shape[0]
+
+        row_sums = xp.asarray(matrix.sum(axis=1), dtype=xp.float64).ravel()
+        col_sums = xp.asarray(matrix.sum(axis=0), dtype=xp.float64).ravel()
+        total_sum = float(row_sums.sum())
+
+        if alpha is None:
+            context_probs = col_sums / total_sum
+        else:
+            smoothed = col_sums ** alpha
+            context_probs = smoothed / smoothed.sum()
+
+        # Row index of every stored value, recovered from indptr
+        rows = xp.repeat(xp.arange(n_rows), xp.diff(matrix.indptr).astype(xp.int64))
+        joint_probs = matrix.data.astype(xp.float64) / total_sum
+        pmi = xp.log(joint_probs / ((row_sums[rows] / total_sum) * context_probs[matrix.indices]))
+        if shift != 1.0:
+            pmi -= np.log(shift)
+
+        # Convert negative values to 0 for PPMI
+        pmi_matrix = self.backend.sparse.csr_matrix(
+            (xp.maximum(pmi, 0).astype(matrix.dtype), matrix.indices.copy(), matrix.indptr.copy()),
+            shape=matrix.shape)
+        pmi_matrix.eliminate_zeros()
+        return pmi_matrix
+
+    def apply_normalization(self, matrix: csr_matrix, method: str) -> csr_matrix:
         """Apply various normalization techniques to the matrix."""
         try:
             self.logger.info(f"{Fore.CYAN}Applying {method} normalization...{Style.RESET_ALL}")
             
             if method == "ppmi":
-                # Positive Pointwise Mutual Information (PPMI)
-                row_sums = matrix.sum(axis=1)
-                col_sums = matrix.sum(axis=0)
-                total_sum = float(matrix.sum())
-                
-                prob_matrix = matrix.multiply(1 / total_sum)
-                row_probs = row_sums / total_sum
-                col_probs = col_sums / total_sum
-                
-                expected_probs = cp.outer(row_probs, col_probs)
-                pmi_matrix = prob_matrix.multiply(1 / expected_probs)
-                pmi_matrix.data = cp.log(pmi_matrix.data)
-                
-                pmi_matrix.data = cp.maximum(pmi_matrix.data, 0)
-                
-                return pmi_matrix
+                # Positive Pointwise Mutual Information
+                return self.sparse_ppmi(matrix, self.ppmi_alpha, self.ppmi_shift)
                 
             elif method == "tfidf":
                 # Term Frequency-Inverse Document Frequency variant
                 N = matrix.shape[0]
                 
                 binary_matrix = matrix.copy()
-                binary_matrix.data = cp.ones_like(binary_matrix.data)
+                binary_matrix.data = self.xp.ones_like(binary_matrix.data)
                 
-                doc_freq = cp.array(binary_matrix.sum(axis=0)).flatten()
+                doc_freq = self.xp.array(binary_matrix.sum(axis=0)).flatten()
                 
-                idf = cp.log(N / (doc_freq + 1))
+                idf = self.xp.log(N / (doc_freq + 1))
                 
                 normalized = matrix.multiply(idf)
                 
@@ -121,14 +188,104 @@ class HindiMatrixReducer:
             self.logger.error(f"{Fore.RED}Normalization failed: {str(e)}{Style.RESET_ALL}")
             raise
 
-    def reduce_dimensionality(self, matrix: cp_csr_matrix, d: int) -> np.ndarray:
+    def truncated_svd(self,
+                      matrix_cpu: csr_matrix,
+                      d: int,
+                      solver: str = "arpack",
+                      oversampling: int = 10,
+                      power_iterations: int = 4,
+                      seed: int = 42) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Top-d singular triplets of a CPU sparse matrix with the selected solver.
+
+        "arpack" and "lobpcg" go through scipy.sparse.linalg.svds; "randomized"
+        is a range finder with d + oversampling columns refined by
+        power_iterations power iterations. Triplets are returned with singular
+        values in descending order (svds returns them ascending), so the first
+        k columns are the top-k decomposition for any k <= d.
+        """
+        if solver in ("arpack", "lobpcg"):
+            U, Sigma, Vt = svds(matrix_cpu, k=d, solver=solver, random_state=seed)
+        elif solver == "randomized":
+            U, Sigma, Vt = randomized_svd(matrix_cpu, n_components=d,
+                                          n_oversamples=oversampling,
+                                          n_iter=power_iterations,
+                                          random_state=seed)
+        else:
+            raise ValueError(f"Unknown SVD solver: {solver}. Choose from {self.SVD_SOLVERS}")
+        order = np.argsort(Sigma)[::-1]
+        return U[:, order], Sigma[order], Vt[order]
+
+    @staticmethod
+    def reconstruction_error(matrix_cpu: csr_matrix,
+                             U: np.ndarray,
+                             Sigma: np.ndarray,
+                             Vt: np.ndarray) -> float:
+        """Relative Frobenius error ||A - U S Vt|| / ||A|| without densifying A.
+
+        Uses ||A - U S Vt||^2 = ||A||^2 - 2 sum_i s_i u_i.(A v_i) + ||S||^2,
+        which holds for orthonormal U and V.
+        """
+        matrix_norm_sq = float(matrix_cpu.multiply(matrix_cpu).sum())
+        if matrix_norm_sq == 0:
+            return 0.0
+        projected = np.asarray(matrix_cpu @ Vt.T)
+        cross = float(np.sum(Sigma * np.sum(U * projected, axis=0)))
+        residual_sq = matrix_norm_sq - 2 * cross + float(np.sum(Sigma ** 2))
+        return float(np.sqrt(max(residual_sq, 0.0) / matrix_norm_sq))
+
+    def compare_svd_solvers(self,
+                            matrix: csr_matrix,
+                            d: int,
+                            solvers: Optional[List[str]] = None,
+                            oversampling: int = 10,
+                            power_iterations: int = 4,
+                            seed: int = 42,
+                            error_tolerance: float = 0.01) -> Dict:
+        """Time every solver on the same matrix and report reconstruction error.
+
+        The recommended solver is the fastest one whose relative error is within
+        error_tolerance of the best error observed.
+        """
+        matrix_cpu = self.backend.to_host(matrix)
+        report = {}
+        for solver in solvers or self.SVD_SOLVERS:
+            try:
+                start = time.perf_counter()
+                U, Sigma, Vt = self.truncated_svd(matrix_cpu, d, solver, oversampling, power_iterations, seed)
+                wall_time = time.perf_counter() - start
+                error = self.reconstruction_error(matrix_cpu, U, Sigma, Vt)
+                report[solver] = {"wall_time": wall_time, "relative_error": error}
+                self.logger.info(f"{Fore.CYAN}{solver}: {wall_time:.2f}s, relative error {error:.6f}{Style.RESET_ALL}")
+            except Exception as e:
+                self.logger.warning(f"{Fore.YELLOW}Solver {solver} failed: {str(e)}{Style.RESET_ALL}")
+                report[solver] = {"error": str(e)}
+
+        finished = {name: r for name, r in report.items() if "relative_error" in r}
+        if finished:
+            best_error = min(r["relative_error"] for r in finished.values())
+            qualifying = [name for name, r in finished.items()
+                          if r["relative_error"] <= best_error + error_tolerance]
+            recommended = min(qualifying, key=lambda name: finished[name]["wall_time"])
+        else:
+            recommended = None
+        return {"d": d, "solvers": report, "recommended": recommended}
+
+    def reduce_dimensionality(self,
+                              matrix: csr_matrix,
+                              d: int,
+                              solver: str = "arpack",
+                              oversampling: int = 10,
+                              power_iterations: int = 4,
+                              seed: int = 42) -> np.ndarray:
         """Perform dimensionality reduction using truncated SVD."""
         try:
-            self.logger.info(f"{Fore.CYAN}Performing SVD with d={d} dimensions...{Style.RESET_ALL}")
+            self.logger.info(f"{Fore.CYAN}Performing SVD with d={d} dimensions ({solver})...{Style.RESET_ALL}")
             
-            matrix_cpu = matrix.get()
+            # Convert to CPU for SVD (cupy's SVD implementation might be unstable for large sparse matrices)
+            matrix_cpu = self.backend.to_host(matrix)
             
-            U, Sigma, Vt = svds(matrix_cpu, k=d)
+            # Perform truncated SVD
+            U, Sigma, Vt = self.truncated_svd(matrix_cpu, d, solver, oversampling, power_iterations, seed)
             
             embeddings = U * np.sqrt(Sigma.reshape(1, -1))
             
@@ -139,53 +296,214 @@ class HindiMatrixReducer:
             self.logger.error(f"{Fore.RED}SVD failed: {str(e)}{Style.RESET_ALL}")
             raise
 
-    def process_matrices(self, input_dir: str, output_dir: str, d_values: List[int], normalization_methods: List[str]) -> None:
-        """Process matrices using various normalization methods and d-values."""
+    @staticmethod
+    def write_json_atomic(path: Path, data: Dict) -> None:
+        """Write JSON to a temporary file and rename it over path."""
+        tmp_file = path.with_name(path.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, path)
+
+    @staticmethod
+    def embedding_file(output_dir: str, window_size: int, norm_method: str, d: int) -> Path:
+        """Path of the saved embeddings for one (window, normalization, d)."""
+        if norm_method == "row_normalize":
+            return Path(output_dir) / f"hindi_embeddings_w{window_size}_rownormalize_d{d}.npy"
+        return Path(output_dir) / f"hindi_embeddings_w{window_size}_{norm_method}_d{d}.npy"
+
+    def reduction_job(self,
+                      matrix_file: str,
+                      window_size: int,
+                      norm_method: str,
+                      output_dir: str,
+                      d_values: List[int],
+                      svd_solver: str = "arpack",
+                      svd_oversampling: int = 10,
+                      svd_power_iterations: int = 4,
+                      svd_seed: int = 42,
+                      svd_report: bool = False,
+                      normalized_file: Optional[str] = None) -> Tuple[Dict, Optional[Dict]]:
+        """Normalize one window's matrix, decompose it once and save every d.
+        
+        normalized_file, when given, is read as the already-normalized matrix if
+        it exists and is otherwise written with the freshly normalized one.
+        """
+        self.logger.info(f"\n{Fore.CYAN}Window {window_size}: applying {norm_method} normalization...{Style.RESET_ALL}")
+        if normalized_file is not None and Path(normalized_file).exists():
+            normalized_matrix = self.backend.to_device(load_csr(normalized_file))
+        else:
+            matrix = self.backend.to_device(load_csr(matrix_file))
+            normalized_matrix = self.apply_normalization(matrix, norm_method)
+            if normalized_file is not None:
+                save_csr(normalized_file, self.backend.to_host(normalized_matrix))
+        original_shape = normalized_matrix.shape
+        
+        solver_report = None
+        if svd_report:
+            solver_report = self.compare_svd_solvers(
+                normalized_matrix, max(d_values),
+                oversampling=svd_oversampling,
+                power_iterations=svd_power_iterations,
+                seed=svd_seed)
+        
+        # One decomposition at max(d); smaller d are its leading columns
+        max_d = max(d_values)
+        full_embeddings = self.reduce_dimensionality(normalized_matrix, max_d,
+                                                     solver=svd_solver,
+                                                     oversampling=svd_oversampling,
+                                                     power_iterations=svd_power_iterations,
+                                                     seed=svd_seed)
+        
+        results = {}
+        for d in d_values:
+            self.logger.info(f"{Fore.CYAN}Slicing d={d} dimensions from the d={max_d} decomposition...{Style.RESET_ALL}")
+            
+            embeddings = np.ascontiguousarray(full_embeddings[:, :d])
+            
+            output_file = self.embedding_file(output_dir, window_size, norm_method, d)
+            np.save(output_file, embeddings)
+            
+            result_key = f"w{window_size}_{norm_method}_d{d}"
+            results[result_key] = {
+                "window_size": window_size,
+                "normalization": norm_method,
+                "dimensions": d,
+                "original_shape": original_shape,
+                "embedding_shape": embeddings.shape,
+                "svd_solver": svd_solver,
+                "file_path": str(output_file)
+            }
+        return results, solver_report
+
+    def process_matrices(self,
+                         input_dir: str,
+                         output_dir: str,
+                         d_values: List[int],
+                         normalization_methods: List[str],
+                         svd_solver: str = "arpack",
+                         svd_oversampling: int = 10,
+                         svd_power_iterations: int = 4,
+                         svd_seed: int = 42,
+                         svd_report: bool = False,
+                         n_workers: int = 1,
+                         blas_threads: Optional[int] = None,
+                         cache: Optional[ArtifactCache] = None) -> None:
+        """Process matrices using various normalization methods and d-values.
+
+        Every (window, normalization) pair is an independent job. With
+        n_workers > 1 the jobs run on a process pool, each worker limited to
+        blas_threads BLAS threads (default: CPU count / n_workers). Results are
+        merged into hindi_reduction_results.json, which is rewritten atomically
+        after every finished job, so interrupted or partial runs accumulate
+        into the same file.
+        
+        With a cache, jobs whose embeddings were already computed from the same
+        matrix with the same normalization and SVD settings are restored, and
+        normalized matrices are reused across SVD settings.
+        """
         try:
             start_time = time.perf_counter()
             Path(output_dir).mkdir(parents=True, exist_ok=True)
             
-            matrix_files = list(Path(input_dir).glob("hindi_cooc_matrix_w*.npz"))
+            # Largest matrices first so the pool is not left waiting on a straggler
+            matrix_files = sorted(Path(input_dir).glob("hindi_cooc_matrix_w*.npz"),
+                                  key=lambda path: path.stat().st_size, reverse=True)
+            jobs = [{
+                "matrix_file": str(matrix_file),
+                "window_size": int(matrix_file.stem.split('w')[1]),
+                "norm_method": norm_method,
+                "output_dir": output_dir,
+                "d_values": d_values,
+                "svd_solver": svd_solver,
+                "svd_oversampling": svd_oversampling,
+                "svd_power_iterations": svd_power_iterations,
+                "svd_seed": svd_seed,
+                "svd_report": svd_report
+            } for matrix_file in matrix_files for norm_method in normalization_methods]
             
+            results_file = Path(output_dir) / "hindi_reduction_results.json"
             results = {}
-            for matrix_file in tqdm(matrix_files, desc="Processing matrices"):
-                window_size = int(matrix_file.stem.split('w')[1])
-                if(window_size == 6 or window_size == 8 or window_size == 2 or window_size == 4):
-                    continue
-                self.logger.info(f"\n{Fore.CYAN}Processing matrix with window size {window_size}{Style.RESET_ALL}")
-                
-                matrix = cp_csr_matrix(load_npz(matrix_file))
-                original_shape = matrix.shape
-                
-                for norm_method in tqdm(normalization_methods, desc="Normalization methods"):
-                    self.logger.info(f"\n{Fore.CYAN}Applying {norm_method} normalization...{Style.RESET_ALL}")
-                    
-                    normalized_matrix = self.apply_normalization(matrix, norm_method)
+            if results_file.exists():
+                with open(results_file, 'r', encoding='utf-8') as f:
+                    results = json.load(f)
+            report_file = Path(output_dir) / "hindi_svd_solver_report.json"
+            solver_reports = {}
+            
+            # Cache keys per job: the normalized matrix and the full set of embeddings
+            cache_keys = {}
+            if cache is not None:
+                pending = []
+                for job in jobs:
+                    job_id = f"w{job['window_size']}_{job['norm_method']}"
+                    norm_params = {
+                        "norm_method": job["norm_method"],
+                        "ppmi_alpha": self.ppmi_alpha,
+                        "ppmi_shift": self.ppmi_shift
+                    }
+                    svd_params = dict(norm_params,
+                                      d_values=sorted(d_values),
+                                      svd_solver=svd_solver,
+                                      svd_oversampling=svd_oversampling,
+                                      svd_power_iterations=svd_power_iterations,
+                                      svd_seed=svd_seed)
+                    norm_key = cache.key("hindi_normalize", [job["matrix_file"]], norm_params)
+                    reduction_key = cache.key("hindi_reduction", [job["matrix_file"]], svd_params)
+                    embedding_files = [str(self.embedding_file(output_dir, job["window_size"], job["norm_method"], d))
+                                       for d in d_values]
+                    if not svd_report and cache.fetch(reduction_key, embedding_files):
+                        self.logger.info(f"{Fore.GREEN}{job_id} restored from cache{Style.RESET_ALL}")
+                        results.update(cache.meta(reduction_key))
+                        self.write_json_atomic(results_file, results)
+                        continue
                     
-                    for d in tqdm(d_values, desc="Dimensionality reduction"):
-                        self.logger.info(f"\n{Fore.CYAN}Reducing to d={d} dimensions...{Style.RESET_ALL}")
-                        
-                        embeddings = self.reduce_dimensionality(normalized_matrix, d)
-                        
-                        if norm_method == "row_normalize":
-                            output_file = Path(output_dir) / f"hindi_embeddings_w{window_size}_rownormalize_d{d}.npy"
-                        else:
-                            output_file = Path(output_dir) / f"hindi_embeddings_w{window_size}_{norm_method}_d{d}.npy"
-                        np.save(output_file, embeddings)
-                        
-                        result_key = f"w{window_size}_{norm_method}_d{d}"
-                        results[result_key] = {
-                            "window_size": window_size,
-                            "normalization": norm_method,
-                            "dimensions": d,
-                            "original_shape": original_shape,
-                            "embedding_shape": embeddings.shape,
-                            "file_path": str(output_file)
-                        }
-            
-            results_file = Path(output_dir) / "hindi_reduction_results_10.json"
-            with open(results_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+                    normalized_file = Path(output_dir) / f".normalized_{job_id}.npz"
+                    normalized_file.unlink(missing_ok=True)
+                    cache_keys[job_id] = (norm_key, reduction_key, cache.fetch(norm_key, [str(normalized_file)]))
+                    job["normalized_file"] = str(normalized_file)
+                    pending.append(job)
+                jobs = pending
+            
+            def record(job: Dict, job_results: Dict, solver_report: Optional[Dict]) -> None:
+                results.update(job_results)
+                self.write_json_atomic(results_file, results)
+                if solver_report is not None:
+                    solver_reports[f"w{job['window_size']}_{job['norm_method']}"] = solver_report
+                    self.write_json_atomic(report_file, solver_reports)
+                if cache is not None:
+                    norm_key, reduction_key, normalized_cached = cache_keys[f"w{job['window_size']}_{job['norm_method']}"]
+                    if normalized_cached:
+                        Path(job["normalized_file"]).unlink(missing_ok=True)
+                    else:
+                        cache.store(norm_key, [job["normalized_file"]], stage="hindi_normalize", move=True)
+                    cache.store(reduction_key, [entry["file_path"] for entry in job_results.values()],
+                                stage="hindi_reduction", meta=job_results)
+            
+            if n_workers == 1:
+                for job in tqdm(jobs, desc="Reduction jobs"):
+                    record(job, *self.reduction_job(**job))
+            else:
+                if blas_threads is None:
+                    blas_threads = max(1, (os.cpu_count() or 1) // n_workers)
+                self.logger.info(f"{Fore.CYAN}Running {len(jobs)} jobs on {n_workers} workers, "
+                                 f"{blas_threads} BLAS threads each{Style.RESET_ALL}")
+                reducer_kwargs = {
+                    "log_dir": self.log_dir,
+                    "backend": self.backend_name,
+                    "ppmi_alpha": self.ppmi_alpha,
+                    "ppmi_shift": self.ppmi_shift
+                }
+                # CUDA contexts do not survive fork
+                context = multiprocessing.get_context("spawn") if self.backend.is_gpu else None
+                with ProcessPoolExecutor(max_workers=n_workers,
+                                         mp_context=context,
+                                         initializer=_init_reduction_worker,
+                                         initargs=(reducer_kwargs, blas_threads)) as pool:
+                    futures = {pool.submit(_run_reduction_job, job): job for job in jobs}
+                    for future in tqdm(as_completed(futures), total=len(futures), desc="Reduction jobs"):
+                        record(futures[future], *future.result())
+            
+            if svd_report:
+                self.logger.info(f"{Fore.GREEN}SVD solver report saved to {report_file}{Style.RESET_ALL}")
             
             processing_time = time.perf_counter() - start_time
             self.logger.info(f"\n{Fore.GREEN}All processing completed in {processing_time:.2f} seconds{Style.RESET_ALL}")
@@ -195,13 +513,25 @@ class HindiMatrixReducer:
             raise
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Normalize and reduce Hindi co-occurrence matrices")
+    parser.add_argument("--cache-dir", default="./processed_data/.artifact_cache",
+                        help="Content-addressed artifact cache directory")
+    parser.add_argument("--cache-budget-gb", type=float, default=20.0,
+                        help="Disk budget for the cache; least recently used entries are evicted")
+    parser.add_argument("--force", action="store_true",
+                        help="Ignore cached outputs and recompute")
+    args = parser.parse_args()
+    
     try:
+        cache = ArtifactCache(args.cache_dir, budget_gb=args.cache_budget_gb, force=args.force)
         reducer = HindiMatrixReducer("logs")
         reducer.process_matrices(
             input_dir="./processed_data/hindi_cooccurrence_matrices",
             output_dir="./processed_data/hindi_embeddings",
             d_values=[50, 100, 200, 300],
-            normalization_methods=["ppmi", "tfidf", "row_normalize"]
+            normalization_methods=["ppmi", "tfidf", "row_normalize"],
+            n_workers=max(1, (os.cpu_count() or 1) // 4),
+            cache=cache
         )
         print(f"{Fore.GREEN}All matrices processed successfully{Style.RESET_ALL}")
         
@@ -11,8 +11,6 @@ import matplotlib.pyplot as plt
 from tqdm import tqdm
 from colorama import Fore, Style, init
 import torch
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -21,6 +19,10 @@ from gensim.scripts.glove2word2vec import glove2word2vec
 import fasttext
 import fasttext.util
 
+from embedding_metrics import (evaluate_analogies as analogy_metrics, evaluate_clustering as clustering_metrics,
+                               evaluate_similarity as similarity_metrics,
+                               resolve_similarity_pairs, unit_rows)
+
 # Initialize colorama
 init(autoreset=True)
 
@@ -154,60 +156,37 @@ class HindiNeuralEmbeddingEvaluator:
             self.logger.error(f"{Fore.RED}Failed to load Hindi evaluation datasets: {str(e)}{Style.RESET_ALL}")
             sys.exit(1)
 
-    def evaluate_hindi_analogies(self, embeddings: np.ndarray, vocab: dict,
-                                 analogies: list) -> dict:
-        """Evaluate Hindi word analogies with cultural and linguistic considerations"""
-        correct = 0
-        total = 0
-        skipped = 0
-        embeddings_tensor = torch.tensor(embeddings, device=self.device)
-        
-        for a, b, c, d in analogies:
-            try:
-                if a in vocab and b in vocab and c in vocab and d in vocab:
-                    vec_a = embeddings_tensor[vocab[a]]
-                    vec_b = embeddings_tensor[vocab[b]]
-                    vec_c = embeddings_tensor[vocab[c]]
-                    expected = vec_b - vec_a + vec_c
-                    
-                    similarities = torch.nn.functional.cosine_similarity(
-                        expected.unsqueeze(0),
-                        embeddings_tensor
-                    )
-                    
-                    # Exclude source words from the search
-                    similarities[vocab[a]] = -1
-                    similarities[vocab[b]] = -1
-                    similarities[vocab[c]] = -1
-                    
-                    pred_idx = similarities.argmax().item()
-                    if pred_idx == vocab[d]:
-                        correct += 1
-                    total += 1
-                else:
-                    skipped += 1
-            except Exception as e:
-                self.logger.warning(f"Error processing analogy {(a, b, c, d)}: {str(e)}")
-                skipped += 1
-                
-        accuracy = correct / total if total > 0 else 0
-        coverage = total / (total + skipped) if (total + skipped) > 0 else 0
+    def evaluate_hindi_analogies(self, embeddings, vocab: dict,
+                                 analogies: list, method: str = "3cosadd", top_k: int = 1) -> dict:
+        """Evaluate Hindi word analogies with cultural and linguistic considerations.
         
-        return {
-            "Analogy-Accuracy": accuracy,
-            "Analogy-Coverage": coverage,
-            "Analogy-Total": total,
-            "Analogy-Skipped": skipped
-        }
+        All covered questions are scored in one batched pass with source words
+        excluded; method is 3cosadd or 3cosmul. Questions with a word outside
+        the vocabulary count as skipped.
+        """
+        results = analogy_metrics(embeddings, vocab, analogies, method=method, top_k=top_k, device=self.device)
+        if results["Analogy-Skipped"]:
+            self.logger.warning(f"Skipped {results['Analogy-Skipped']} analogies with out-of-vocabulary words")
+        return results
     
-    def evaluate_clustering(self, embeddings: np.ndarray, n_clusters: int = 10) -> dict:
-        """Perform a dummy clustering evaluation using KMeans and compute silhouette score"""
+    def evaluate_hindi_similarity(self, embeddings: np.ndarray, vocab: dict, wordsim: pd.DataFrame) -> dict:
+        """Spearman correlation and coverage on the Hindi WordSim-353 pairs"""
+        resolved = resolve_similarity_pairs(wordsim, vocab, ("word1", "word2", "similarity"))
+        results = similarity_metrics(embeddings, resolved, "WordSim")
+        self.logger.info(f"WordSim Spearman: {results['WordSim-Correlation']:.4f} "
+                         f"(coverage {results['WordSim-Coverage']:.1%})")
+        return results
+    
+    def evaluate_clustering(self, embeddings: np.ndarray, n_clusters: int = 10,
+                            sample_size: int = 10000, n_samples: int = 5) -> dict:
+        """Cluster with MiniBatchKMeans and average the silhouette score over sampled subsets"""
         try:
-            kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-            labels = kmeans.fit_predict(embeddings)
-            silhouette = silhouette_score(embeddings, labels)
-            self.logger.info(f"Clustering silhouette score: {silhouette:.4f}")
-            return {"Clustering-Silhouette": silhouette}
+            results = clustering_metrics(embeddings, n_clusters=n_clusters,
+                                         sample_size=sample_size, n_samples=n_samples)
+            self.logger.info(f"Clustering silhouette score: {results['Clustering-Silhouette']:.4f} "
+                             f"(95% CI {results['Clustering-Silhouette-CI-Low']:.4f}-"
+                             f"{results['Clustering-Silhouette-CI-High']:.4f})")
+            return results
         except Exception as e:
             self.logger.error(f"Clustering evaluation error: {str(e)}")
             return {"Clustering-Silhouette": None}
@@ -248,12 +227,15 @@ class HindiNeuralEmbeddingEvaluator:
             embeddings, vocab = self.load_hindi_embeddings(model_path, model_type)
             datasets = self.load_hindi_evaluation_datasets()
             
-            # Evaluate analogies
-            analogy_results = self.evaluate_hindi_analogies(
-                embeddings,
-                vocab,
-                datasets['hindi_analogies']
-            )
+            # Evaluate analogies (both objectives on one normalized copy)
+            unit = unit_rows(embeddings, self.device)
+            analogy_results = self.evaluate_hindi_analogies(unit, vocab, datasets['hindi_analogies'])
+            cosmul_results = self.evaluate_hindi_analogies(unit, vocab, datasets['hindi_analogies'],
+                                                           method="3cosmul")
+            del unit
+            
+            # Evaluate word similarity
+            similarity_results = self.evaluate_hindi_similarity(embeddings, vocab, datasets['hindi_wordsim'])
             
             # Evaluate clustering
             clustering_results = self.evaluate_clustering(embeddings, n_clusters=10)
@@ -263,9 +245,14 @@ class HindiNeuralEmbeddingEvaluator:
                 "Model-Type": model_type,
                 "Dimensions": embeddings.shape[1],
                 "Vocabulary-Size": len(vocab),
+                "WordSim-Correlation": similarity_results["WordSim-Correlation"],
+                "WordSim-Coverage": similarity_results["WordSim-Coverage"],
                 "Analogy-Accuracy": analogy_results["Analogy-Accuracy"],
+                "Analogy-3CosMul-Accuracy": cosmul_results["Analogy-Accuracy"],
                 "Analogy-Coverage": analogy_results["Analogy-Coverage"],
-                "Clustering-Silhouette": clustering_results["Clustering-Silhouette"]
+                "Clustering-Silhouette": clustering_results["Clustering-Silhouette"],
+                "Clustering-Silhouette-CI-Low": clustering_results.get("Clustering-Silhouette-CI-Low"),
+                "Clustering-Silhouette-CI-High": clustering_results.get("Clustering-Silhouette-CI-High")
             }
             
             # Save results
@@ -1,21 +1,132 @@
 import re
 import time
 import sys
-from typing import List, Optional, Dict, Any
+import argparse
+from typing import List, Optional, Dict, Any, Set, Tuple
 from pathlib import Path
 import pickle
+import json
+import io
+import os
+import random
 import logging
+from collections import Counter
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
 import stanza
-import cudf
 import torch
 from tqdm import tqdm
 from colorama import Fore, Style, init
 
+from array_backend import ArrayBackend
+from artifact_cache import ArtifactCache
+from columnar_corpus import ColumnarCorpus
+
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
 
+def _stanza_tokenize(nlp: Any, sentences: List[str]) -> List[Optional[List[List[str]]]]:
+    """Word lists per Stanza sentence for each input, in input order.
+    
+    The whole list goes through Stanza as one batch of Documents. If the batch
+    fails it is retried sentence by sentence, and only the sentences that
+    still fail come back as None.
+    """
+    try:
+        docs = nlp.bulk_process([stanza.Document([], text=sentence) for sentence in sentences])
+        return [[[word.text for word in sent.words] for sent in doc.sentences] for doc in docs]
+    except Exception:
+        results = []
+        for sentence in sentences:
+            try:
+                doc = nlp(sentence)
+                results.append([[word.text for word in sent.words] for sent in doc.sentences])
+            except Exception:
+                results.append(None)
+        return results
+
+# Stanza pipeline owned by each CPU worker process (set by _init_stanza_worker)
+_WORKER_NLP = None
+
+def _init_stanza_worker(torch_threads: int) -> None:
+    """Worker initializer: one CPU Stanza pipeline per process."""
+    global _WORKER_NLP
+    torch.set_num_threads(torch_threads)
+    _WORKER_NLP = stanza.Pipeline('hi', processors='tokenize', tokenize_no_ssplit=False,
+                                  verbose=False, use_gpu=False)
+
+def _stanza_tokenize_in_worker(sentences: List[str]) -> List[Optional[List[List[str]]]]:
+    """Worker: tokenize one batch with the process-local pipeline."""
+    return _stanza_tokenize(_WORKER_NLP, sentences)
+
+def _sequential_clean(text: str, patterns: Dict[str, re.Pattern], preserved_tokens: Set[str]) -> str:
+    """Reference cleaning: one pass per pattern, in dictionary order."""
+    for pattern_name, pattern in patterns.items():
+        if pattern_name == 'number_with_units':
+            matches = pattern.findall(text)
+            preserved_tokens.update(matches)
+            for match in matches:
+                text = text.replace(match, f"__{match}__")
+        elif pattern_name == 'mixed_phrase':
+            matches = pattern.findall(text)
+            preserved_tokens.update(matches)
+        else:
+            text = pattern.sub('', text)
+    return text
+
+# Above this many number matches one re.sub pass replaces the per-match str.replace
+_REPLACE_LIMIT = 4
+
+def _wrap_number(match: re.Match) -> str:
+    return f"__{match.group()}__"
+
+# mixed_phrase needs a Latin letter; texts without one skip that findall
+_LATIN_LETTER = re.compile(r'[a-zA-Z]')
+
+def _fused_clean(texts: List[str], patterns: Dict[str, re.Pattern]) -> Tuple[List[str], Set[str]]:
+    """Clean texts with the same rules as _sequential_clean in fewer passes.
+    
+    Texts with many numbers with units wrap them in __..__ in one re.sub
+    callback pass instead of a str.replace of the whole text per match, which
+    is quadratic in the number of matches. That equals the sequential result
+    whenever the matches are distinct and none contains another; otherwise
+    str.replace also rewrites the repeated occurrences, so those texts fall
+    back to _sequential_clean. Passes that cannot match (no "(" for
+    parenthetical, no Latin letter for mixed_phrase) are skipped. Output
+    text and preserved tokens are identical to the sequential rules.
+    """
+    leading_special = patterns['leading_special']
+    number_with_units = patterns['number_with_units']
+    parenthetical = patterns['parenthetical']
+    mixed_phrase = patterns['mixed_phrase']
+    sentence_end = patterns['sentence_end']
+    
+    cleaned_texts = []
+    preserved_tokens = set()
+    for text in texts:
+        text = leading_special.sub('', text)
+        
+        matches = number_with_units.findall(text)
+        if len(matches) > 1 and (len(set(matches)) < len(matches) or
+                                 any(a != b and a in b for a in matches for b in matches)):
+            cleaned_texts.append(_sequential_clean(text, patterns, preserved_tokens))
+            continue
+        if len(matches) > _REPLACE_LIMIT:
+            text = number_with_units.sub(_wrap_number, text)
+        else:
+            # A few C-level replaces beat a Python callback per match
+            for match in matches:
+                text = text.replace(match, f"__{match}__")
+        preserved_tokens.update(matches)
+        
+        if '(' in text:
+            text = parenthetical.sub('', text)
+        if _LATIN_LETTER.search(text):
+            preserved_tokens.update(mixed_phrase.findall(text))
+        cleaned_texts.append(sentence_end.sub('', text))
+    return cleaned_texts, preserved_tokens
+
 class EnhancedHindiGPUTokenizer:
     """Enhanced GPU-accelerated Hindi tokenizer with comprehensive logging and progress tracking."""
     
@@ -25,22 +136,36 @@ class EnhancedHindiGPUTokenizer:
                  remove_punctuation: bool = True,
                  remove_numbers: bool = True,
                  min_token_length: int = 2,
-                 debug_mode: bool = False):
+                 debug_mode: bool = False,
+                 backend: str = "auto",
+                 n_workers: int = 1,
+                 regex_tokenizer: bool = False):
         
         self.remove_foreign = remove_foreign
         self.remove_punctuation = remove_punctuation
         self.remove_numbers = remove_numbers
         self.min_token_length = min_token_length
         self.debug_mode = debug_mode
+        # CPU worker processes for Stanza on GPU-less hosts
+        self.n_workers = n_workers
+        # Regex/Unicode tokenization instead of the Stanza neural pipeline
+        self.regex_tokenizer = regex_tokenizer
         
         # Initialize logging
         if log_file is None:
             log_file = f"hindi_tokenizer_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         self._setup_logging(log_file)
         
-        # Initialize components
+        # Initialize components (cuDF on GPU hosts, pandas on CPU-only hosts)
+        self.backend = ArrayBackend(backend)
         self._setup_device()
-        self._setup_stanza()
+        if self.regex_tokenizer:
+            self.nlp = None
+            self.logger.info("Regex tokenizer selected, skipping Stanza")
+        else:
+            self._setup_stanza()
+        self.stop_words = set(['का', 'की', 'के', 'में', 'से', 'को', 'पर', 'ने', 'एक', 'और'])
+        self.logger.debug(f"Initialized {len(self.stop_words)} stop words")
         self._compile_regex_patterns()
         
         self.stats: Dict[str, Any] = {
@@ -99,7 +224,8 @@ class EnhancedHindiGPUTokenizer:
     
     def _setup_device(self) -> None:
         """Setup and log GPU/CPU device information."""
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        use_cuda = self.backend.is_gpu and torch.cuda.is_available()
+        self.device = torch.device('cuda' if use_cuda else 'cpu')
         device_info = f"Using device: {self.device}"
         if self.device.type == 'cuda':
             device_info += f" ({torch.cuda.get_device_name(0)})"
@@ -119,6 +245,12 @@ class EnhancedHindiGPUTokenizer:
                 'sentence_end': re.compile(r'([।!?])\s*')
             }
             
+            # Regex tokenizer: Devanagari/word runs (matras and ZWJ/ZWNJ included),
+            # danda, or any other single non-space punctuation character
+            self.token_pattern = re.compile(
+                r'[\u0900-\u0963\u0966-\u097F\u200c\u200d\w]+|[\u0964\u0965]|[^\s\w\u0900-\u097F]'
+            )
+            
             self.logger.debug("Successfully compiled all regex patterns")
             
         except Exception as e:
@@ -146,48 +278,46 @@ class EnhancedHindiGPUTokenizer:
             
             self.logger.info(f"Stanza initialization completed in {setup_time:.2f} seconds")
             
-            # Initialize stop words
-            self.stop_words = set(['का', 'की', 'के', 'में', 'से', 'को', 'पर', 'ने', 'एक', 'और'])
-            self.logger.debug(f"Initialized {len(self.stop_words)} stop words")
-            
         except Exception as e:
             self.logger.critical(f"Failed to initialize Stanza: {str(e)}")
             raise
     
-    def clean_text_gpu(self, text_series) -> any:
-        """Enhanced GPU-accelerated text cleaning with detailed logging."""
+    def clean_text_gpu(self, text_series, chunk_size: int = 10000) -> any:
+        """Enhanced GPU-accelerated text cleaning with detailed logging.
+        
+        Texts are cleaned by _fused_clean; with n_workers > 1 they are split
+        into chunks of chunk_size and cleaned on a process pool.
+        """
         start_time = time.perf_counter()
         self.logger.info("Starting GPU text cleaning...")
         
         try:
             # Convert to pandas for complex regex operations
-            texts = text_series.to_pandas()
-            total_texts = len(texts)
+            texts = self.backend.to_pandas(text_series).tolist()
+            
+            if self.debug_mode:
+                for text in texts[:5]:
+                    self.logger.debug(f"Original text: {text}")
             
             cleaned_texts = []
             preserved_tokens = set()
-            
-            for idx, text in enumerate(tqdm(texts, desc=f"{Fore.CYAN}Cleaning texts{Style.RESET_ALL}")):
-                if self.debug_mode and idx < 5:
-                    self.logger.debug(f"Original text: {text}")
-                
-                # Clean text with pattern matching
-                for pattern_name, pattern in self.patterns.items():
-                    if pattern_name == 'number_with_units':
-                        matches = pattern.findall(text)
-                        preserved_tokens.update(matches)
-                        for match in matches:
-                            text = text.replace(match, f"__{match}__")
-                    elif pattern_name == 'mixed_phrase':
-                        matches = pattern.findall(text)
-                        preserved_tokens.update(matches)
-                    else:
-                        text = pattern.sub('', text)
-                
-                if self.debug_mode and idx < 5:
+            chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+            if self.n_workers > 1 and len(chunks) > 1:
+                with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                    results = pool.map(_fused_clean, chunks, [self.patterns] * len(chunks))
+                    for chunk_texts, chunk_preserved in tqdm(results, total=len(chunks),
+                                                             desc=f"{Fore.CYAN}Cleaning texts{Style.RESET_ALL}"):
+                        cleaned_texts.extend(chunk_texts)
+                        preserved_tokens.update(chunk_preserved)
+            else:
+                for chunk in tqdm(chunks, desc=f"{Fore.CYAN}Cleaning texts{Style.RESET_ALL}"):
+                    chunk_texts, chunk_preserved = _fused_clean(chunk, self.patterns)
+                    cleaned_texts.extend(chunk_texts)
+                    preserved_tokens.update(chunk_preserved)
+            
+            if self.debug_mode:
+                for text in cleaned_texts[:5]:
                     self.logger.debug(f"Cleaned text: {text}")
-                
-                cleaned_texts.append(text)
             
             # Update statistics
             self.stats["preserved_tokens"].update(preserved_tokens)
@@ -199,50 +329,155 @@ class EnhancedHindiGPUTokenizer:
             self.logger.info(f"Text cleaning completed in {processing_time:.2f} seconds")
             self.logger.info(f"Preserved {len(preserved_tokens)} unique tokens")
             
-            return cudf.Series(cleaned_texts)
+            return self.backend.series(cleaned_texts)
             
         except Exception as e:
             self.logger.error(f"Text cleaning failed: {str(e)}")
             self.log_error_context(e)
             raise
     
+    def regex_tokenize(self, sentences: List[str]) -> List[List[List[str]]]:
+        """Stanza-shaped word lists from regex splitting alone.
+        
+        Sentences are split after danda / ! / ? with the sentence_end pattern
+        and each piece is split into words and punctuation by token_pattern.
+        """
+        results = []
+        for sentence in sentences:
+            pieces = self.patterns['sentence_end'].split(sentence)
+            # split() keeps the captured terminator as its own piece; glue it back
+            sents = [pieces[i] + (pieces[i + 1] if i + 1 < len(pieces) else '')
+                     for i in range(0, len(pieces), 2)]
+            results.append([self.token_pattern.findall(sent) for sent in sents if sent.strip()])
+        return results
+    
+    def agreement_report(self,
+                         sentences: List[str],
+                         sample_size: int = 1000,
+                         seed: int = 42,
+                         output_file: Optional[str] = None) -> Dict[str, Any]:
+        """Compare regex and Stanza tokenization on a random sample.
+        
+        Reports the share of sentences with identical filtered token lists,
+        token-level precision/recall/F1 of the regex output against Stanza
+        (multiset overlap per sentence) and the throughput of both backends.
+        The regex pass takes milliseconds, so it is timed as the fastest of
+        three runs; a single scheduler hiccup would otherwise swing the
+        speedup by an order of magnitude.
+        """
+        sample = random.Random(seed).sample(sentences, min(sample_size, len(sentences)))
+        nlp = self.nlp
+        if nlp is None:
+            nlp = stanza.Pipeline('hi', processors='tokenize', tokenize_no_ssplit=False,
+                                  verbose=False, use_gpu=self.device.type == 'cuda')
+        
+        def filtered(sentence_words: Optional[List[List[str]]]) -> Optional[List[str]]:
+            if sentence_words is None:
+                return None
+            return [token for sent_tokens in sentence_words for token in self.filter_tokens(sent_tokens)]
+        
+        start = time.perf_counter()
+        stanza_tokens = [filtered(words) for words in _stanza_tokenize(nlp, sample)]
+        stanza_time = time.perf_counter() - start
+        regex_time = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            regex_tokens = [filtered(words) for words in self.regex_tokenize(sample)]
+            regex_time = min(regex_time, time.perf_counter() - start)
+        
+        exact = overlap = n_regex = n_stanza = compared = 0
+        disagreements = []
+        for sentence, reference, candidate in zip(sample, stanza_tokens, regex_tokens):
+            if reference is None:
+                continue
+            compared += 1
+            exact += reference == candidate
+            overlap += sum((Counter(reference) & Counter(candidate)).values())
+            n_regex += len(candidate)
+            n_stanza += len(reference)
+            if reference != candidate and len(disagreements) < 20:
+                disagreements.append({"sentence": sentence, "stanza": reference, "regex": candidate})
+        
+        precision = overlap / n_regex if n_regex else 0.0
+        recall = overlap / n_stanza if n_stanza else 0.0
+        report = {
+            "sample_size": len(sample),
+            "compared_sentences": compared,
+            "exact_sentence_agreement": exact / compared if compared else 0.0,
+            "token_precision": precision,
+            "token_recall": recall,
+            "token_f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+            "stanza_sentences_per_sec": len(sample) / stanza_time if stanza_time > 0 else 0.0,
+            "regex_sentences_per_sec": len(sample) / regex_time if regex_time > 0 else 0.0,
+            "speedup": stanza_time / regex_time if regex_time > 0 else 0.0,
+            "disagreements": disagreements
+        }
+        self.logger.info(f"Regex vs Stanza: {report['exact_sentence_agreement']:.1%} identical sentences, "
+                         f"token F1 {report['token_f1']:.4f}, {report['speedup']:.1f}x faster")
+        
+        if output_file is not None:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        return report
+    
     def tokenize_batch(self, sentences: List[str], batch_size: int = 1000) -> List[List[str]]:
-        """Enhanced batch tokenization with progress tracking and error handling."""
+        """Enhanced batch tokenization with progress tracking and error handling.
+        
+        Each batch is handed to Stanza as one list of Documents instead of one
+        call per sentence. With n_workers > 1 on a CPU device the batches are
+        spread over worker processes, each with its own Stanza pipeline.
+        Results keep input order; a sentence that fails on its own is logged,
+        counted and dropped as before. With regex_tokenizer the batches go
+        through regex_tokenize instead of Stanza.
+        """
         start_time = time.perf_counter()
         self.logger.info(f"Starting batch tokenization with size {batch_size}")
         
         try:
             tokenized_sentences = []
             total_tokens = 0
-            
-            for i in tqdm(range(0, len(sentences), batch_size),
-                         desc=f"{Fore.CYAN}Tokenizing batches{Style.RESET_ALL}"):
-                batch = sentences[i:i + batch_size]
-                batch_start_time = time.perf_counter()
-                
-                for sentence in batch:
-                    try:
-                        # Tokenize with Stanza
-                        doc = self.nlp(sentence)
+            batches = [sentences[i:i + batch_size] for i in range(0, len(sentences), batch_size)]
+            
+            pool = None
+            if self.regex_tokenizer:
+                batch_results = (self.regex_tokenize(batch) for batch in batches)
+            elif self.n_workers > 1 and self.device.type == 'cpu':
+                torch_threads = max(1, torch.get_num_threads() // self.n_workers)
+                pool = ProcessPoolExecutor(max_workers=self.n_workers,
+                                           initializer=_init_stanza_worker,
+                                           initargs=(torch_threads,))
+                batch_results = pool.map(_stanza_tokenize_in_worker, batches)
+            else:
+                if self.n_workers > 1:
+                    self.logger.warning("n_workers > 1 is only used on CPU; tokenizing on the GPU in-process")
+                batch_results = (_stanza_tokenize(self.nlp, batch) for batch in batches)
+            
+            try:
+                for batch, results in tqdm(zip(batches, batch_results), total=len(batches),
+                                           desc=f"{Fore.CYAN}Tokenizing batches{Style.RESET_ALL}"):
+                    batch_start_time = time.perf_counter()
+                    
+                    for sentence, sentence_words in zip(batch, results):
+                        if sentence_words is None:
+                            self.logger.warning(f"Failed to tokenize sentence: {sentence[:100]}...")
+                            self.stats["failed_tokens"] += 1
+                            continue
                         
-                        # Extract and filter tokens
+                        # Filter tokens of every Stanza sentence
                         tokens = []
-                        for sent in doc.sentences:
-                            sent_tokens = [word.text for word in sent.words]
+                        for sent_tokens in sentence_words:
                             filtered = self.filter_tokens(sent_tokens)
                             tokens.extend(filtered)
                             total_tokens += len(filtered)
                         
                         tokenized_sentences.append(tokens)
-                        
-                    except Exception as e:
-                        self.logger.warning(f"Failed to tokenize sentence: {sentence[:100]}...")
-                        self.stats["failed_tokens"] += 1
-                        continue
-                
-                batch_time = time.perf_counter() - batch_start_time
-                if self.debug_mode:
-                    self.logger.debug(f"Batch processed in {batch_time:.2f} seconds")
+                    
+                    batch_time = time.perf_counter() - batch_start_time
+                    if self.debug_mode:
+                        self.logger.debug(f"Batch processed in {batch_time:.2f} seconds")
+            finally:
+                if pool is not None:
+                    pool.shutdown()
             
             processing_time = time.perf_counter() - start_time
             self.stats["processing_time"] += processing_time
@@ -278,11 +513,109 @@ class EnhancedHindiGPUTokenizer:
             pickle.dump(self.stats, f)
         self.logger.info(f"Statistics saved to {stats_file}")
     
+    def process_corpus_incremental(self,
+                                   input_file: str,
+                                   output_dir: str,
+                                   batch_size: int = 1000) -> Dict[str, Any]:
+        """Tokenize only the lines appended to input_file since the previous call.
+        
+        hindi_tokenized_corpus.ingest.json in output_dir records how many bytes
+        of the raw corpus were already tokenized. The complete lines after that
+        point are cleaned and tokenized like process_corpus and saved as the
+        columnar corpus output_dir/hindi_tokenized_delta_NNNNN/, which
+        HindiCooccurrenceMatrixBuilder.process_incremental adds to the matrices.
+        A trailing line without a newline is left for the next call.
+        """
+        start_time = time.perf_counter()
+        self.logger.info(f"Starting incremental processing: {input_file}")
+        
+        try:
+            output_path = Path(output_dir)
+            output_path.mkdir(parents=True, exist_ok=True)
+            state_file = output_path / "hindi_tokenized_corpus.ingest.json"
+            state = {
+                "input_file": str(Path(input_file).resolve()),
+                "settings": self.cache_params(),
+                "bytes_done": 0,
+                "deltas": 0,
+                "total_sentences": 0
+            }
+            if state_file.exists():
+                with open(state_file, 'r') as f:
+                    saved = json.load(f)
+                if any(saved.get(field) != state[field] for field in ("input_file", "settings")):
+                    raise ValueError(f"{state_file} was written for another corpus or tokenizer settings")
+                state = saved
+            
+            with open(input_file, 'rb') as f:
+                f.seek(state["bytes_done"])
+                new_bytes = f.read()
+            new_bytes = new_bytes[:new_bytes.rfind(b"\n") + 1]
+            
+            tokenized_sentences = []
+            delta_dir = None
+            if new_bytes:
+                self.logger.info(f"Loading {len(new_bytes) / 1024**2:.1f}MB of new text...")
+                df = self.backend.read_csv(io.BytesIO(new_bytes), header=None, names=["sentence"])
+                self.logger.info(f"Loaded {len(df)} new sentences")
+                df["clean"] = self.clean_text_gpu(df["sentence"])
+                sentences = self.backend.to_pandas(df["clean"]).tolist()
+                tokenized_sentences = self.tokenize_batch(sentences, batch_size)
+                
+                delta_dir = output_path / f"hindi_tokenized_delta_{state['deltas']:05d}"
+                ColumnarCorpus.from_sentences(tokenized_sentences).save(delta_dir)
+                state["bytes_done"] += len(new_bytes)
+                state["deltas"] += 1
+                state["total_sentences"] += len(tokenized_sentences)
+                tmp_file = state_file.with_name(state_file.name + ".tmp")
+                with open(tmp_file, 'w') as f:
+                    json.dump(state, f, indent=2)
+                os.replace(tmp_file, state_file)
+                self.logger.info(f"Results saved to {delta_dir}")
+            else:
+                self.logger.info("No new sentences")
+            
+            total_sentences = len(tokenized_sentences)
+            total_tokens = sum(len(sent) for sent in tokenized_sentences)
+            self.stats.update({
+                "total_sentences": total_sentences,
+                "total_tokens": total_tokens,
+                "avg_tokens_per_sentence": total_tokens / total_sentences if total_sentences > 0 else 0,
+                "total_processing_time": time.perf_counter() - start_time
+            })
+            return {
+                "delta_dir": str(delta_dir) if delta_dir else None,
+                "stats": self.stats
+            }
+            
+        except Exception as e:
+            self.logger.error("Incremental corpus processing failed")
+            self.log_error_context(e)
+            raise
+    
+    def cache_params(self) -> Dict[str, Any]:
+        """Settings that determine the tokenized output (part of the cache key)."""
+        return {
+            "remove_foreign": self.remove_foreign,
+            "remove_punctuation": self.remove_punctuation,
+            "remove_numbers": self.remove_numbers,
+            "min_token_length": self.min_token_length,
+            "regex_tokenizer": self.regex_tokenizer
+        }
+    
     def process_corpus(self, 
                       input_file: str, 
                       output_dir: str,
-                      batch_size: int = 1000) -> Dict[str, Any]:
-        """Process entire corpus with comprehensive logging and error handling."""
+                      batch_size: int = 1000,
+                      cache: Optional[ArtifactCache] = None) -> Dict[str, Any]:
+        """Process entire corpus with comprehensive logging and error handling.
+        
+        The tokens are saved as a columnar corpus in
+        output_dir/hindi_tokenized_corpus/ (vocabulary table, uint32 token ids,
+        int64 sentence offsets), which the co-occurrence builder memory-maps.
+        With a cache, a corpus already tokenized with the same settings is
+        restored from the cache instead of being re-tokenized.
+        """
         start_time = time.perf_counter()
         self.logger.info(f"Starting corpus processing: {input_file}")
         
@@ -290,10 +623,25 @@ class EnhancedHindiGPUTokenizer:
             # Create output directory
             output_path = Path(output_dir)
             output_path.mkdir(parents=True, exist_ok=True)
+            output_file = output_path / "hindi_tokenized_corpus"
+            stats_file = output_path / "hindi_corpus_stats.pkl"
+            outputs = ColumnarCorpus.files(output_file) + [str(stats_file)]
+            
+            if cache is not None:
+                cache_key = cache.key("hindi_tokenize", [input_file], self.cache_params())
+                if cache.fetch(cache_key, outputs):
+                    self.logger.info(f"Tokenized corpus restored from cache ({cache_key[:12]})")
+                    tokenized_sentences = ColumnarCorpus.load(output_file).to_sentences()
+                    with open(stats_file, 'rb') as f:
+                        self.stats = pickle.load(f)
+                    return {
+                        "tokenized_sentences": tokenized_sentences,
+                        "stats": self.stats
+                    }
             
             # Load corpus
             self.logger.info("Loading corpus...")
-            df = cudf.read_csv(input_file, header=None, names=["sentence"])
+            df = self.backend.read_csv(input_file, header=None, names=["sentence"])
             self.logger.info(f"Loaded {len(df)} sentences")
             
             # Process text
@@ -301,7 +649,7 @@ class EnhancedHindiGPUTokenizer:
             df["clean"] = self.clean_text_gpu(df["sentence"])
             
             # Tokenize
-            sentences = df["clean"].to_pandas().tolist()
+            sentences = self.backend.to_pandas(df["clean"]).tolist()
             tokenized_sentences = self.tokenize_batch(sentences, batch_size)
             
             # Calculate statistics
@@ -318,11 +666,11 @@ class EnhancedHindiGPUTokenizer:
             })
             
             # Save results
-            output_file = output_path / "hindi_tokenized_corpus.pkl"
-            with open(output_file, 'wb') as f:
-                pickle.dump(tokenized_sentences, f)
+            ColumnarCorpus.from_sentences(tokenized_sentences).save(output_file)
             
             self.save_stats(output_path)
+            if cache is not None:
+                cache.store(cache_key, outputs, stage="hindi_tokenize")
             
             self.logger.info(f"Processing completed in {self.stats['total_processing_time']:.2f} seconds")
             self.logger.info(f"Results saved to {output_file}")
@@ -354,26 +702,69 @@ class EnhancedHindiGPUTokenizer:
 
 if __name__ == "__main__":
     try:
-        # Parse command line arguments (could be enhanced with argparse)
-        input_file = sys.argv[1] if len(sys.argv) > 1 else "./dataset/raw/hin_news_2022_300K-sentences.txt"
-        output_dir = sys.argv[2] if len(sys.argv) > 2 else "./processed_data"
-        debug_mode = "--debug" in sys.argv
+        # Parse command line arguments
+        parser = argparse.ArgumentParser(description="Tokenize the Hindi corpus")
+        parser.add_argument("input_file", nargs="?", default="./dataset/raw/hin_news_2022_300K-sentences.txt")
+        parser.add_argument("output_dir", nargs="?", default="./processed_data")
+        parser.add_argument("--debug", action="store_true")
+        parser.add_argument("--workers", type=int, default=1,
+                            help="Stanza worker processes when running on CPU")
+        parser.add_argument("--regex", action="store_true",
+                            help="Regex tokenizer instead of the Stanza pipeline")
+        parser.add_argument("--cache-dir", default="./processed_data/.artifact_cache",
+                            help="Content-addressed artifact cache directory")
+        parser.add_argument("--cache-budget-gb", type=float, default=20.0,
+                            help="Disk budget for the cache; least recently used entries are evicted")
+        parser.add_argument("--force", action="store_true",
+                            help="Ignore cached outputs and recompute")
+        parser.add_argument("--incremental", action="store_true",
+                            help="Tokenize only lines appended since the last run into hindi_tokenized_delta_NNNNN/")
+        parser.add_argument("--agreement-report", type=int, default=None, metavar="SAMPLE_SIZE",
+                            help="Compare regex and Stanza tokenization on this many cleaned sentences "
+                                 "and write hindi_tokenizer_agreement.json instead of processing the corpus")
+        args = parser.parse_args()
+        input_file = args.input_file
+        output_dir = args.output_dir
+        debug_mode = args.debug
+        cache = ArtifactCache(args.cache_dir, budget_gb=args.cache_budget_gb, force=args.force)
         
         # Initialize tokenizer
         tokenizer = EnhancedHindiGPUTokenizer(
             debug_mode=debug_mode,
+            n_workers=args.workers,
+            regex_tokenizer=args.regex,
             remove_foreign=True,
             remove_punctuation=True,
             remove_numbers=True,
             min_token_length=2
         )
         
+        if args.agreement_report is not None:
+            df = tokenizer.backend.read_csv(input_file, header=None, names=["sentence"])
+            sentences = tokenizer.backend.to_pandas(tokenizer.clean_text_gpu(df["sentence"])).tolist()
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            report = tokenizer.agreement_report(sentences, sample_size=args.agreement_report,
+                                                output_file=str(Path(output_dir) / "hindi_tokenizer_agreement.json"))
+            print(f"\n{Fore.GREEN}Regex vs Stanza Agreement{Style.RESET_ALL}")
+            print(f"Identical Sentences: {report['exact_sentence_agreement']:.1%}")
+            print(f"Token F1: {report['token_f1']:.4f}")
+            print(f"Speedup: {report['speedup']:.1f}x")
+            sys.exit(0)
+        
         # Process corpus
-        results = tokenizer.process_corpus(
-            input_file=input_file,
-            output_dir=output_dir,
-            batch_size=1000
-        )
+        if args.incremental:
+            results = tokenizer.process_corpus_incremental(
+                input_file=input_file,
+                output_dir=output_dir,
+                batch_size=1000
+            )
+        else:
+            results = tokenizer.process_corpus(
+                input_file=input_file,
+                output_dir=output_dir,
+                batch_size=1000,
+                cache=cache
+            )
         
         # Print summary
         print(f"\n{Fore.GREEN}Processing Summary{Style.RESET_ALL}")
@@ -0,0 +1,247 @@
+import itertools
+import json
+import os
+import re
+from collections import Counter
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import torch
+from tqdm import tqdm
+
+# Lines parsed per chunk; every chunk is converted with one numpy call
+CHUNK_LINES = 20000
+
+# Field separator: runs of spaces or tabs, but not Unicode spaces such as
+# U+00A0, which occur inside some GloVe tokens
+ASCII_WHITESPACE = ' \t\r\n\f\v'
+FIELD_SEP = re.compile(f'[{re.escape(ASCII_WHITESPACE)}]+')
+
+
+def cache_paths(embedding_file: str) -> Tuple[str, str]:
+    """Binary matrix and vocabulary sidecar cached next to a text embedding file"""
+    return f"{embedding_file}.npy", f"{embedding_file}.vocab.json"
+
+
+def _read_header(first_line: str) -> Optional[Tuple[int, int]]:
+    """(count, dim) from a word2vec-style 'count dim' first line, else None"""
+    parts = first_line.split()
+    if len(parts) == 2:
+        try:
+            return int(parts[0]), int(parts[1])
+        except ValueError:
+            return None
+    return None
+
+
+def _parse_chunk(lines: List[str], dim: int) -> Tuple[List[str], np.ndarray, int]:
+    """Words, a len(words) x dim float32 block and the number of skipped
+    lines for one chunk of lines.
+
+    The numeric fields of the whole chunk are joined and converted by a
+    single np.fromstring call. If the field count does not work out (a
+    word containing spaces, as in GloVe 840B, or a malformed line), the
+    chunk is re-parsed line by line, taking the last dim fields of each
+    line as the vector and skipping lines that are too short or whose
+    vector does not parse.
+    """
+    lines = [line.strip(ASCII_WHITESPACE) for line in lines]
+    lines = [line for line in lines if line]
+    # str.split is faster but also breaks on Unicode spaces, so it is only
+    # used on pure-ASCII lines
+    heads = [line.split(None, 1) if line.isascii() else FIELD_SEP.split(line, 1) for line in lines]
+    if all(len(head) == 2 for head in heads):
+        try:
+            values = np.fromstring(' '.join(head[1] for head in heads), dtype=np.float32, sep=' ')
+        except ValueError:
+            values = None
+        if values is not None and values.size == len(heads) * dim:
+            return [head[0] for head in heads], values.reshape(len(heads), dim), 0
+
+    words, rows = [], []
+    for line in lines:
+        parts = FIELD_SEP.split(line)
+        if len(parts) <= dim:
+            continue
+        try:
+            row = np.array(parts[-dim:], dtype=np.float32)
+        except ValueError:
+            continue
+        words.append(' '.join(parts[:-dim]))
+        rows.append(row)
+    if not rows:
+        return [], np.empty((0, dim), dtype=np.float32), len(lines)
+    return words, np.stack(rows), len(lines) - len(words)
+
+
+def _infer_dim(lines: List[str]) -> int:
+    """Vector size of a header-less file: the most common field count minus the word"""
+    field_counts = Counter(len(FIELD_SEP.split(line.strip(ASCII_WHITESPACE)))
+                           for line in lines if line.strip(ASCII_WHITESPACE))
+    if not field_counts:
+        raise ValueError("Embedding file has no vectors")
+    return field_counts.most_common(1)[0][0] - 1
+
+
+def read_text_embeddings(embedding_file: str, max_vocab: Optional[int] = None) -> Tuple[np.ndarray, List[str], bool]:
+    """Parse a GloVe / word2vec text file into one float32 matrix.
+
+    A 'count dim' first line is used to size the matrix and skipped;
+    without one the row count is estimated from the file size. The matrix
+    is preallocated and only grown if the estimate falls short. Returns
+    the matrix, its words in file order and whether the whole file was
+    read (False when max_vocab stopped it early). Fields may be separated
+    by any run of spaces or tabs. Without a header the vector size is the
+    most common field count of the first chunk; lines that do not yield a
+    dim-sized vector are skipped and their count is reported.
+    """
+    file_size = os.path.getsize(embedding_file)
+    with open(embedding_file, 'r', encoding='utf-8') as f:
+        first_line = f.readline()
+        header = _read_header(first_line)
+        pending = [] if header else [first_line]
+        pending += list(itertools.islice(f, CHUNK_LINES))
+        if header:
+            capacity, dim = header
+        else:
+            dim = _infer_dim(pending)
+            sample_bytes = sum(len(line.encode('utf-8')) for line in pending) or 1
+            capacity = int(file_size * len(pending) / sample_bytes * 1.05) + 1
+        if max_vocab is not None:
+            capacity = min(capacity, max_vocab)
+
+        matrix = np.empty((capacity, dim), dtype=np.float32)
+        words = []
+        complete = True
+        skipped = 0
+        with tqdm(total=capacity, desc=f"Loading {os.path.basename(embedding_file)}", unit="words") as progress:
+            while pending:
+                chunk_words, block, chunk_skipped = _parse_chunk(pending, dim)
+                skipped += chunk_skipped
+                if max_vocab is not None and len(words) + len(chunk_words) >= max_vocab:
+                    keep = max_vocab - len(words)
+                    chunk_words, block = chunk_words[:keep], block[:keep]
+                    complete = False
+                if len(words) + len(chunk_words) > len(matrix):
+                    grown = np.empty((max(2 * len(matrix), len(words) + len(chunk_words)), dim), dtype=np.float32)
+                    grown[:len(words)] = matrix[:len(words)]
+                    matrix = grown
+                matrix[len(words):len(words) + len(chunk_words)] = block
+                words += chunk_words
+                progress.update(len(chunk_words))
+                if not complete:
+                    break
+                pending = list(itertools.islice(f, CHUNK_LINES))
+    if skipped:
+        print(f"Skipped {skipped} malformed lines in {embedding_file}")
+    return matrix[:len(words)], words, complete
+
+
+def _load_cache(embedding_file: str, max_vocab: Optional[int]) -> Optional[Tuple[np.ndarray, List[str]]]:
+    matrix_file, vocab_file = cache_paths(embedding_file)
+    if not (os.path.exists(matrix_file) and os.path.exists(vocab_file)):
+        return None
+    try:
+        with open(vocab_file, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        stat = os.stat(embedding_file)
+        if meta["source_size"] != stat.st_size or meta["source_mtime_ns"] != stat.st_mtime_ns:
+            return None
+        words = meta["words"]
+        if not meta["complete"] and (max_vocab is None or max_vocab > len(words)):
+            return None
+        # Copy-on-write mapping: pages are read on first touch and the array is
+        # writable, so torch.from_numpy can wrap it without a copy
+        matrix = np.load(matrix_file, mmap_mode='c')
+    except (OSError, ValueError, KeyError):
+        # Unreadable or half-written cache: fall back to parsing the text
+        return None
+    if len(matrix) != len(words):
+        return None
+    if max_vocab is not None:
+        matrix, words = matrix[:max_vocab], words[:max_vocab]
+    return matrix, words
+
+
+def _save_cache(embedding_file: str, matrix: np.ndarray, words: List[str], complete: bool) -> None:
+    matrix_file, vocab_file = cache_paths(embedding_file)
+    stat = os.stat(embedding_file)
+    meta = {
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "complete": complete,
+        "words": words
+    }
+    # Matrix first, sidecar last: a sidecar only ever describes a finished matrix
+    with open(matrix_file + ".tmp", 'wb') as f:
+        np.save(f, matrix)
+    os.replace(matrix_file + ".tmp", matrix_file)
+    with open(vocab_file + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(vocab_file + ".tmp", vocab_file)
+
+
+def load_embedding_matrix(embedding_file: str,
+                          max_vocab: Optional[int] = None,
+                          cache: bool = True) -> Tuple[np.ndarray, Dict[str, int]]:
+    """(V x dim float32 matrix, word -> row index) for a text embedding file.
+
+    The first load parses the text and writes <file>.npy plus a
+    <file>.vocab.json sidecar; later loads memory-map the .npy instead.
+    The sidecar records the source file's size and mtime, so editing the
+    text file invalidates the cache. Duplicate words keep their last row,
+    as the per-word dict loader did.
+    """
+    cached = _load_cache(embedding_file, max_vocab) if cache else None
+    if cached is not None:
+        matrix, words = cached
+    else:
+        matrix, words, complete = read_text_embeddings(embedding_file, max_vocab)
+        if cache:
+            try:
+                _save_cache(embedding_file, matrix, words, complete)
+            except OSError as e:
+                print(f"Could not cache {embedding_file} as .npy: {e}")
+    return matrix, {word: idx for idx, word in enumerate(words)}
+
+
+class EmbeddingTable(Mapping):
+    """Read-only word -> tensor mapping over one V x dim matrix.
+
+    Rows are looked up on access, so opening a cached 400K-word table
+    does not create 400K tensor objects up front. matrix and vocab are
+    exposed for code that wants to work on the whole table at once.
+    """
+
+    def __init__(self, matrix: torch.Tensor, vocab: Dict[str, int]):
+        self.matrix = matrix
+        self.vocab = vocab
+
+    def __getitem__(self, word: str) -> torch.Tensor:
+        return self.matrix[self.vocab[word]]
+
+    def __contains__(self, word) -> bool:
+        return word in self.vocab
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.vocab)
+
+    def __len__(self) -> int:
+        return len(self.vocab)
+
+
+def load_embedding_table(embedding_file: str,
+                         max_vocab: Optional[int] = None,
+                         device=None,
+                         cache: bool = True) -> EmbeddingTable:
+    """EmbeddingTable for a text embedding file, moved to device in a single copy.
+
+    One allocation holds the whole vocabulary rather than one tensor per
+    word; on the CPU a cached matrix stays memory-mapped.
+    """
+    matrix, vocab = load_embedding_matrix(embedding_file, max_vocab, cache)
+    matrix = torch.from_numpy(matrix)
+    if device is not None:
+        matrix = matrix.to(device)
+    return EmbeddingTable(matrix, vocab)
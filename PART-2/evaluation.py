@@ -8,6 +8,7 @@ import matplotlib.pyplot as plt
 from sklearn.manifold import TSNE
 import random
 import numpy as np
+from embedding_io import load_embedding_table
 
 def get_device(device_arg=None):
     if device_arg:
@@ -18,51 +19,15 @@ def load_embeddings(embedding_file, max_vocab=None, device=None):
     """
     Loads embeddings from a file.
     If the file ends with '.pt', it's loaded as a Torch binary file.
-    Otherwise, it's assumed to be a text file.
+    Otherwise, it's assumed to be a text file, parsed once into a single
+    float32 matrix (cached as .npy next to it) and returned as a mapping
+    word -> tensor (rows of that matrix).
     """
     if embedding_file.endswith('.pt'):
         embeddings = torch.load(embedding_file, map_location=device)
         return embeddings
 
-    embeddings = {}
-    total = None
-    try:
-        with open(embedding_file, 'r', encoding='utf-8') as f:
-            total = sum(1 for _ in f)
-    except Exception:
-        total = None
-
-    with open(embedding_file, 'r', encoding='utf-8') as f:
-        first_line = f.readline().strip().split()
-        header_skipped = False
-        if len(first_line) == 2:
-            try:
-                int(first_line[0])
-                int(first_line[1])
-                header_skipped = True
-            except ValueError:
-                header_skipped = False
-        if not header_skipped:
-            if len(first_line) >= 2:
-                word = first_line[0]
-                vec = torch.tensor([float(x) for x in first_line[1:]], dtype=torch.float32)
-                if device is not None:
-                    vec = vec.to(device)
-                embeddings[word] = vec
-
-        adjusted_total = (total - 1) if header_skipped and total is not None else total
-        for line in tqdm(f, total=adjusted_total, desc=f"Loading {os.path.basename(embedding_file)}"):
-            parts = line.strip().split()
-            if len(parts) < 2:
-                continue
-            word = parts[0]
-            vec = torch.tensor([float(x) for x in parts[1:]], dtype=torch.float32)
-            if device is not None:
-                vec = vec.to(device)
-            embeddings[word] = vec
-            if max_vocab is not None and len(embeddings) >= max_vocab:
-                break
-    return embeddings
+    return load_embedding_table(embedding_file, max_vocab=max_vocab, device=device)
 
 def load_bilingual_dictionary(dict_file):
     """